@@ -7,7 +7,19 @@ from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.models.models import User, UserRole, AuditLog
+from app.models.models import Exam, User, UserRole, AuditLog
+from app.services.ai_analyzer import analyze_exam
+from app.services.analysis_jobs import analysis_pool, queue_depth
+from app.services.audit_log import audit_log
+from app.services.exam_catalog import exam_catalog
+from app.services.face_index import face_index
+from app.services.face_pool import face_pool
+from app.services.frame_pipeline import frame_pipeline
+from app.services.live_feed import live_feed
+from app.services.security import PasswordPoolBusy, password_pool, password_pool_busy
+from app.services.session_resolver import session_resolver
+from app.services.signaling import signaling_hub
+from app.services.violation_writer import violation_writer
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -26,13 +38,8 @@ def _normalize_role(role_value: str | None) -> UserRole:
 
 
 def _add_audit_log(db: Session, action: str, user_id: int | None = None, details: Dict[str, Any] | None = None) -> None:
-    db.add(
-        AuditLog(
-            user_id=user_id,
-            action=action,
-            details=details or {},
-        )
-    )
+    # Admin actions are security-critical: the event commits with the change itself
+    audit_log.record(action, user_id=user_id, details=details, db=db)
 
 
 @router.get("/users")
@@ -65,16 +72,20 @@ def create_user(payload: Dict[str, Any] = Body(...), db: Session = Depends(get_d
     password = payload.get("password") or "demo_password"
     role = _normalize_role(payload.get("role"))
 
+    try:
+        hashed_password = password_pool.hash_blocking(password)
+    except PasswordPoolBusy:
+        raise password_pool_busy("Password hashing is busy, retry shortly")
+
     user = User(
         email=email,
         full_name=full_name,
-        hashed_password=password,
+        hashed_password=hashed_password,
         role=role,
         is_active=True,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
 
     _add_audit_log(
         db,
@@ -101,8 +112,6 @@ def toggle_user_status(user_id: int, db: Session = Depends(get_db)) -> Dict[str,
 
     user.is_active = not user.is_active
     db.add(user)
-    db.commit()
-    db.refresh(user)
 
     _add_audit_log(
         db,
@@ -133,7 +142,7 @@ def delete_user(user_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
         user_id=user.id,
         details={"email": user.email, "role": user.role.value},
     )
-    db.commit()
+    db.flush()
     db.delete(user)
     db.commit()
     return {"status": "deleted", "id": user_id}
@@ -180,3 +189,28 @@ def server_status() -> Dict[str, Any]:
         "net_recv_mb": round(net.bytes_recv / (1024 ** 2), 2),
         "timestamp": datetime.now().isoformat(),
     }
+
+
+@router.post("/exams/{exam_id}/reanalyze")
+def reanalyze_exam(exam_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Recompute verdicts for all finished sessions of an exam."""
+    if not db.query(Exam.id).filter(Exam.id == exam_id).first():
+        raise HTTPException(status_code=404, detail="Exam not found")
+    return analyze_exam(db, exam_id)
+
+
+@router.get("/metrics")
+def service_metrics(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    return {
+        "violation_writer": violation_writer.stats(),
+        "audit_log": audit_log.stats(),
+        "face_pool": face_pool.stats(),
+        "password_pool": password_pool.stats(),
+        "face_index": face_index.stats(),
+        "frame_pipeline": frame_pipeline.stats(),
+        "analysis": {**analysis_pool.stats(), "queue": queue_depth(db)},
+        "signaling": signaling_hub.stats(),
+        "live_feed": live_feed.stats(),
+        "session_resolver": session_resolver.stats(),
+        "exam_cache": exam_catalog.stats(),
+    }
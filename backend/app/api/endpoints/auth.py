@@ -1,13 +1,21 @@
 # app/api/endpoints/auth.py
 """Authentication endpoints."""
-from typing import Any
+import asyncio
+import time
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, EmailStr
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.models.models import User, AuditLog
+from app.models.models import User
+from app.services.audit_log import audit_log
+from app.services.security import (
+    SESSION_MAX_AGE, PasswordPoolBusy, TokenUser, create_access_token,
+    get_current_user, needs_rehash, password_pool, password_pool_busy,
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -24,36 +32,61 @@ class LoginResponse(BaseModel):
     email: str
     full_name: str | None
     role: str
+    access_token: str
+    token_type: str
+    expires_in: int
+
+
+class TokenResponse(BaseModel):
+    """Refreshed access token."""
+    access_token: str
+    token_type: str
+    expires_in: int
 
 
 def _log_auth_event(
-    db: Session,
     user_id: int | None,
     action: str,
     details: dict[str, Any],
 ) -> None:
-    """Log authentication events to audit log."""
-    db.add(AuditLog(user_id=user_id, action=action, details=details))
+    """Log authentication events to audit log (batched, off the request path)."""
+    audit_log.record(action, user_id=user_id, details=details)
+
+
+def _find_user(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _upgrade_password(db: Session, user: User, password: str) -> None:
+    """Replace a legacy plaintext (or weaker) password with a current hash."""
+    try:
+        user.hashed_password = password_pool.hash_blocking(password)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Password rehash failed for user {user.id}: {e}")
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse:
-    """Authenticate user and return user info.
-    
-    Note: In production, use proper password hashing (bcrypt/argon2).
+async def login(payload: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse:
+    """Authenticate a user and issue a short-lived signed access token.
+
+    The bcrypt check runs on a bounded thread pool; when it is saturated the
+    login is rejected with 503 so clients back off instead of piling up.
     """
-    user = db.query(User).filter(User.email == payload.email).first()
+    user = await run_in_threadpool(_find_user, db, payload.email)
+
+    try:
+        valid = await password_pool.verify(payload.password, user.hashed_password if user else None)
+    except (PasswordPoolBusy, asyncio.TimeoutError):
+        raise password_pool_busy("Too many login attempts, retry shortly")
 
-    # TODO: Replace plain password comparison with proper hash verification
-    # Example: if not verify_password(payload.password, user.hashed_password):
-    if not user or user.hashed_password != payload.password:
+    if not user or not valid:
         _log_auth_event(
-            db,
             user_id=user.id if user else None,
             action="auth.failed",
             details={"email": payload.email},
         )
-        db.commit()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -65,17 +98,36 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse
             detail="Account is disabled",
         )
 
+    if needs_rehash(user.hashed_password):
+        await run_in_threadpool(_upgrade_password, db, user, payload.password)
+
     _log_auth_event(
-        db,
         user_id=user.id,
         action="auth.login",
         details={"email": user.email, "role": user.role.value},
     )
-    db.commit()
 
     return LoginResponse(
         id=user.id,
         email=user.email,
         full_name=user.full_name,
         role=user.role.value,
+        **create_access_token(user.id, user.role.value),
     )
+
+
+@router.post("/refresh", response_model=TokenResponse)
+def refresh_token(user: TokenUser = Depends(get_current_user)) -> TokenResponse:
+    """Exchange a still-valid token for a fresh one, up to AUTH_SESSION_MAX_HOURS after login."""
+    if time.time() - user.auth_time > SESSION_MAX_AGE:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session expired, log in again",
+        )
+    return TokenResponse(**create_access_token(user.id, user.role, user.auth_time))
+
+
+@router.get("/me")
+def read_current_user(user: TokenUser = Depends(get_current_user)) -> dict[str, Any]:
+    """Identity from the bearer token (no database access)."""
+    return {"id": user.id, "role": user.role}
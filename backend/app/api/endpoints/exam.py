@@ -1,11 +1,25 @@
 # app/api/endpoints/exam.py
-from fastapi import APIRouter, Depends, BackgroundTasks, Body, HTTPException
-from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.models.models import ExamSession, Exam, User, UserRole, Violation
+from fastapi import APIRouter, Depends, Body, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.datastructures import UploadFile as StarletteUploadFile
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session, noload
+from app.db.database import SessionLocal, get_db
+from app.models.models import ExamSession, Exam, SessionViolationCount, User, UserRole, Violation
 from datetime import datetime
 from app.services.ai_analyzer import ExamAnalyzer
-from typing import List, Dict, Any
+from app.services.analysis_jobs import analysis_pool, enqueue_analysis
+from app.services.exam_catalog import etag_matches, exam_catalog, exam_detail, exam_summaries
+from app.services.live_feed import live_feed
+from app.services.security import PasswordPoolBusy, password_pool, password_pool_busy
+from app.services.session_resolver import session_resolver
+from app.services.student_import import (
+    READERS, STUDENT_IMPORT_CHUNK, detect_format, import_records,
+)
+from typing import List, Dict, Any, Optional, Tuple
+import base64
+import json
 from app.models.models import ExamAssignment
 
 router = APIRouter(prefix="/exams", tags=["exams"])
@@ -26,20 +40,52 @@ def get_user_by_email(email: str, db: Session = Depends(get_db)) -> Dict[str, An
 @router.post("/sessions/{session_id}/finish")
 def finish_exam_session(
     session_id: int,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    session = db.query(ExamSession).filter(ExamSession.id == session_id).first()
+    session = (
+        db.query(ExamSession)
+        .options(noload(ExamSession.violations))
+        .filter(ExamSession.id == session_id)
+        .first()
+    )
     if not session:
         return {"error": "Session not found"}
     
     session.end_time = datetime.now()
     session.verdict = "processing"
+    enqueue_analysis(db, session_id)
     db.commit()
-    
-    background_tasks.add_task(run_analysis_task, db, session_id)
+    analysis_pool.notify()
+    session_resolver.invalidate(session.student_id, session.exam_id)
+    live_feed.session_updated(session)
+
     return {"status": "exam_finished", "message": "Results are being processed"}
 
+@router.get("/sessions/{session_id}/summary")
+def get_session_summary(session_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Live violation totals and provisional verdict for a session."""
+    session = (
+        db.query(ExamSession)
+        .options(noload(ExamSession.violations))
+        .filter(ExamSession.id == session_id)
+        .first()
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    result = ExamAnalyzer(db, session_id).preview()
+    return {
+        "session_id": session.id,
+        "status": session.status,
+        "verdict": session.verdict,
+        "provisional_verdict": result.verdict,
+        "total_violations": result.total_violations,
+        "total_severity": result.total_severity,
+        "type_counts": result.type_counts,
+        "first_violation_at": result.first_violation_at.isoformat() if result.first_violation_at else None,
+        "last_violation_at": result.last_violation_at.isoformat() if result.last_violation_at else None,
+    }
+
 @router.post("/sessions")
 def start_exam_session(
     payload: Dict[str, Any] = Body(...),
@@ -65,6 +111,8 @@ def start_exam_session(
     db.add(session)
     db.commit()
     db.refresh(session)
+    session_resolver.remember(session.student_id, session.exam_id, session.id)
+    live_feed.session_updated(session)
     
     return {
         "id": session.id,
@@ -74,17 +122,7 @@ def start_exam_session(
         "status": session.status
     }
 
-def run_analysis_task(db: Session, session_id: int):
-    try:
-        analyzer = ExamAnalyzer(db, session_id)
-        analyzer.analyze()
-    except Exception as e:
-        print(f"Analysis error: {e}")
-
-
-# Simple exams listing and creation endpoints so frontend can operate.
-@router.get("")
-def list_exams(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
+def _list_exams_payload(db: Session) -> List[Dict[str, Any]]:
     exams = db.query(Exam).all()
     results: List[Dict[str, Any]] = []
     for e in exams:
@@ -101,6 +139,55 @@ def list_exams(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
     return results
 
 
+def _cached_json(request: Request, variant: Any, build) -> Response:
+    """Serve a cached exam listing, answering ``If-None-Match`` with 304."""
+    body, etag = exam_catalog.get(variant, build)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        exam_catalog.not_modified()
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+EXAM_QUESTIONS_MAX_PAGE = 500
+
+
+# Simple exams listing and creation endpoints so frontend can operate.
+@router.get("")
+def list_exams(
+    request: Request,
+    include_questions: bool = False,
+    db: Session = Depends(get_db),
+) -> Response:
+    """Exam summaries (with ``question_count``); questions are fetched per exam.
+
+    ``include_questions=true`` returns the legacy payload with every exam's
+    full question list.
+    """
+    # The session only connects on a cache miss
+    if include_questions:
+        return _cached_json(request, "full", lambda: _list_exams_payload(db))
+    return _cached_json(request, "summary", lambda: exam_summaries(db))
+
+
+@router.get("/{exam_id:int}")
+def get_exam(
+    exam_id: int,
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=EXAM_QUESTIONS_MAX_PAGE),
+    db: Session = Depends(get_db),
+) -> Response:
+    """One exam with its questions, optionally paged with ``offset``/``limit``."""
+    def build() -> Dict[str, Any]:
+        detail = exam_detail(db, exam_id, offset, limit)
+        if detail is None:
+            raise HTTPException(status_code=404, detail="Exam not found")
+        return detail
+
+    return _cached_json(request, ("detail", exam_id, offset, limit), build)
+
+
 @router.post("")
 def create_exam(payload: Dict[str, Any] = Body(...), db: Session = Depends(get_db)) -> Dict[str, Any]:
     title = payload.get("title") or payload.get("name") or "Untitled Exam"
@@ -136,6 +223,7 @@ def create_exam(payload: Dict[str, Any] = Body(...), db: Session = Depends(get_d
     db.add(exam)
     db.commit()
     db.refresh(exam)
+    exam_catalog.bump()
 
     return {
         "id": exam.id,
@@ -163,7 +251,8 @@ def update_exam(exam_id: int, payload: Dict[str, Any] = Body(...), db: Session =
             exam.duration_minutes = int(duration)
 
         # update config fields (description/questions)
-        cfg = exam.config or {}
+        # Copy so the JSON column sees a new value and is written back
+        cfg = dict(exam.config or {})
         if "description" in payload:
             cfg["description"] = payload.get("description", "")
         if "questions" in payload:
@@ -173,6 +262,7 @@ def update_exam(exam_id: int, payload: Dict[str, Any] = Body(...), db: Session =
         db.add(exam)
         db.commit()
         db.refresh(exam)
+        exam_catalog.bump()
 
         return {
             "id": exam.id,
@@ -230,42 +320,100 @@ def assign_exam(exam_id: int, payload: Dict[str, Any] = Body(...), db: Session =
     }
 
 
+ASSIGNMENT_PAGE_SIZE = 500
+ASSIGNMENT_MAX_PAGE_SIZE = 2000
+
+
+def _list_assignment_page(
+    db: Session,
+    response: Response,
+    limit: int,
+    cursor: Optional[int],
+    exam_id: Optional[int] = None,
+    status: Optional[str] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """One keyset page of assignments with student/exam columns joined in.
+
+    Always a single SELECT, however many rows the page holds.
+    """
+    query = (
+        db.query(
+            ExamAssignment.id,
+            ExamAssignment.exam_id,
+            ExamAssignment.student_id,
+            ExamAssignment.assigned_at,
+            ExamAssignment.due_date,
+            ExamAssignment.status,
+            Exam.title,
+            User.email,
+        )
+        .outerjoin(Exam, Exam.id == ExamAssignment.exam_id)
+        .outerjoin(User, User.id == ExamAssignment.student_id)
+    )
+    if exam_id is not None:
+        query = query.filter(ExamAssignment.exam_id == exam_id)
+    if status:
+        query = query.filter(ExamAssignment.status == status)
+    if due_from:
+        query = query.filter(ExamAssignment.due_date >= due_from)
+    if due_to:
+        query = query.filter(ExamAssignment.due_date < due_to)
+    if cursor is not None:
+        query = query.filter(ExamAssignment.id > cursor)
+
+    rows = query.order_by(ExamAssignment.id).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+
+    return [
+        {
+            "id": row.id,
+            "exam_id": row.exam_id,
+            "exam_title": row.title,
+            "student_id": row.student_id,
+            "student_email": row.email,
+            "assigned_at": row.assigned_at.isoformat() if row.assigned_at else None,
+            "due_date": row.due_date.isoformat() if row.due_date else None,
+            "status": row.status,
+        }
+        for row in rows
+    ]
+
+
 @router.get("/assignments")
-def list_assignments(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
-    assignments = db.query(ExamAssignment).all()
-    out: List[Dict[str, Any]] = []
-    for a in assignments:
-        student = db.query(User).filter(User.id == a.student_id).first()
-        exam = db.query(Exam).filter(Exam.id == a.exam_id).first()
-        out.append({
-            "id": a.id,
-            "exam_id": a.exam_id,
-            "exam_title": getattr(exam, 'title', None),
-            "student_id": a.student_id,
-            "student_email": getattr(student, 'email', None),
-            "assigned_at": a.assigned_at.isoformat() if a.assigned_at else None,
-            "due_date": a.due_date.isoformat() if a.due_date else None,
-            "status": a.status,
-        })
-    return out
+def list_assignments(
+    response: Response,
+    limit: int = Query(ASSIGNMENT_PAGE_SIZE, ge=1, le=ASSIGNMENT_MAX_PAGE_SIZE),
+    cursor: Optional[int] = None,
+    status: Optional[str] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+) -> List[Dict[str, Any]]:
+    """List assignments by id, keyset-paginated via the ``X-Next-Cursor`` header."""
+    return _list_assignment_page(
+        db, response, limit, cursor, status=status, due_from=due_from, due_to=due_to
+    )
 
 
 @router.get("/{exam_id}/assignments")
-def list_assignments_for_exam(exam_id: int, db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
-    assignments = db.query(ExamAssignment).filter(ExamAssignment.exam_id == exam_id).all()
-    out: List[Dict[str, Any]] = []
-    for a in assignments:
-        student = db.query(User).filter(User.id == a.student_id).first()
-        out.append({
-            "id": a.id,
-            "exam_id": a.exam_id,
-            "student_id": a.student_id,
-            "student_email": getattr(student, 'email', None),
-            "assigned_at": a.assigned_at.isoformat() if a.assigned_at else None,
-            "due_date": a.due_date.isoformat() if a.due_date else None,
-            "status": a.status,
-        })
-    return out
+def list_assignments_for_exam(
+    exam_id: int,
+    response: Response,
+    limit: int = Query(ASSIGNMENT_PAGE_SIZE, ge=1, le=ASSIGNMENT_MAX_PAGE_SIZE),
+    cursor: Optional[int] = None,
+    status: Optional[str] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+) -> List[Dict[str, Any]]:
+    return _list_assignment_page(
+        db, response, limit, cursor,
+        exam_id=exam_id, status=status, due_from=due_from, due_to=due_to,
+    )
 
 
 @router.delete("/assignments/{assignment_id}")
@@ -317,36 +465,6 @@ def update_assignment(assignment_id: int, payload: Dict[str, Any] = Body(...), d
 def get_all_students(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
     """Get all students for teacher dashboard."""
     students = db.query(User).filter(User.role == UserRole.STUDENT).all()
-    if not students:
-        seed = [
-            {
-                "email": "s.chen@university.edu",
-                "full_name": "Сара Чен",
-                "hashed_password": "demo_password",
-            },
-            {
-                "email": "m.johnson@university.edu",
-                "full_name": "Маркус Джонсон",
-                "hashed_password": "demo_password",
-            },
-            {
-                "email": "a.petrov@university.edu",
-                "full_name": "Алексей Петров",
-                "hashed_password": "demo_password",
-            },
-        ]
-        for s in seed:
-            exists = db.query(User).filter(User.email == s["email"]).first()
-            if not exists:
-                db.add(User(
-                    email=s["email"],
-                    full_name=s["full_name"],
-                    hashed_password=s["hashed_password"],
-                    role=UserRole.STUDENT,
-                    is_active=True
-                ))
-        db.commit()
-        students = db.query(User).filter(User.role == UserRole.STUDENT).all()
     results = []
     for student in students:
         results.append({
@@ -362,7 +480,7 @@ def get_all_students(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
 
 @router.post("/dashboard/students")
 def create_student(payload: Dict[str, Any] = Body(...), db: Session = Depends(get_db)) -> Dict[str, Any]:
-    """Create a new student (demo: stores password as-is)."""
+    """Create a new student."""
     email = payload.get("email")
     full_name = payload.get("full_name") or payload.get("name")
     password = payload.get("password") or "demo_password"
@@ -374,10 +492,15 @@ def create_student(payload: Dict[str, Any] = Body(...), db: Session = Depends(ge
     if existing:
         raise HTTPException(status_code=409, detail="User already exists")
 
+    try:
+        hashed_password = password_pool.hash_blocking(password)
+    except PasswordPoolBusy:
+        raise password_pool_busy("Password hashing is busy, retry shortly")
+
     user = User(
         email=email,
         full_name=full_name,
-        hashed_password=password,
+        hashed_password=hashed_password,
         role=UserRole.STUDENT,
         is_active=True
     )
@@ -411,89 +534,196 @@ def delete_student(student_id: int, db: Session = Depends(get_db)) -> Dict[str,
 def import_students(payload: Dict[str, Any] = Body(...), db: Session = Depends(get_db)) -> Dict[str, Any]:
     """Bulk import students. Expects {students: [{email, full_name, password}]}"""
     students = payload.get("students") or []
-    created = 0
-    skipped = 0
-
-    for s in students:
-        email = s.get("email")
-        full_name = s.get("full_name") or s.get("name")
-        password = s.get("password") or "demo_password"
-        if not email:
-            skipped += 1
-            continue
-        exists = db.query(User).filter(User.email == email).first()
-        if exists:
-            skipped += 1
-            continue
-        db.add(User(
-            email=email,
-            full_name=full_name,
-            hashed_password=password,
-            role=UserRole.STUDENT,
-            is_active=True
-        ))
-        created += 1
+    records = (
+        (index, s, None) if isinstance(s, dict) else (index, None, "expected an object")
+        for index, s in enumerate(students, start=1)
+    )
+    result: Dict[str, Any] = {}
+    for result in import_records(db, records):
+        pass
+    result.pop("type", None)
+    if "retry_after" in result:
+        raise password_pool_busy(result)
+    return result
 
-    db.commit()
-    return {"created": created, "skipped": skipped}
+
+@router.post("/dashboard/students/import/stream")
+async def import_students_stream(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    chunk_size: int = Query(STUDENT_IMPORT_CHUNK, ge=1, le=10000),
+):
+    """Import a CSV or NDJSON registry uploaded as multipart ``file``.
+
+    The upload is parsed as a stream and written in chunks, each with its own
+    commit. The response is NDJSON: a ``progress`` line per chunk and a final
+    ``done`` line with created/skipped/error counts and sample errors.
+    """
+    form = await request.form()
+    upload = form.get("file")
+    if not isinstance(upload, StarletteUploadFile):
+        await form.close()
+        raise HTTPException(status_code=400, detail="file is required")
+    kind = format or detect_format(upload.filename, upload.content_type)
+    if kind is None:
+        await form.close()
+        raise HTTPException(status_code=400, detail="Unknown format; pass format=csv|ndjson")
+
+    def lines():
+        # Runs in the threadpool after the request scope (and its session) closed
+        db = SessionLocal()
+        try:
+            for event in import_records(db, READERS[kind](upload.file), chunk_size):
+                yield json.dumps(event) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        lines(), media_type="application/x-ndjson", background=BackgroundTask(form.close)
+    )
+
+
+DASHBOARD_PAGE_SIZE = 100
+DASHBOARD_MAX_PAGE_SIZE = 500
+
+
+def _encode_cursor(start_time: Optional[datetime], session_id: int) -> str:
+    raw = json.dumps([start_time.isoformat() if start_time else None, session_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        start_time, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (datetime.fromisoformat(start_time) if start_time else None), int(session_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _serialize_violation(v: Violation) -> Dict[str, Any]:
+    return {
+        "id": v.id,
+        "type": v.type,
+        "timestamp": v.timestamp.isoformat() if v.timestamp else None,
+        "severity_score": v.severity_score,
+        "confidence": v.confidence,
+        "video_proof_url": v.video_proof_url,
+        "video_duration": v.video_duration
+    }
 
 
 @router.get("/dashboard/sessions")
-def get_all_exam_sessions(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
-    """Get all exam sessions for monitoring."""
-    sessions = db.query(ExamSession).all()
-    if not sessions:
-        return []
+def get_all_exam_sessions(
+    response: Response,
+    limit: int = Query(DASHBOARD_PAGE_SIZE, ge=1, le=DASHBOARD_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    exam_id: Optional[int] = None,
+    status: Optional[str] = None,
+    verdict: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    summary: bool = False,
+    db: Session = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """Get exam sessions for monitoring, newest first.
+
+    Keyset-paginated on (start_time, id): pass the ``X-Next-Cursor`` response
+    header back as ``cursor`` to fetch the next page. With ``summary=true``
+    sessions carry only violation counts/severity (one GROUP BY), and details
+    are fetched per session from ``/dashboard/sessions/{id}/violations``.
+    """
+    query = (
+        db.query(ExamSession, User.full_name, User.email, Exam.title)
+        .outerjoin(User, User.id == ExamSession.student_id)
+        .outerjoin(Exam, Exam.id == ExamSession.exam_id)
+        .options(noload(ExamSession.violations))
+    )
+    if exam_id is not None:
+        query = query.filter(ExamSession.exam_id == exam_id)
+    if status:
+        query = query.filter(ExamSession.status == status)
+    if verdict:
+        query = query.filter(ExamSession.verdict == verdict)
+    if date_from:
+        query = query.filter(ExamSession.start_time >= date_from)
+    if date_to:
+        query = query.filter(ExamSession.start_time < date_to)
+    if cursor:
+        cursor_time, cursor_id = _decode_cursor(cursor)
+        query = query.filter(or_(
+            ExamSession.start_time < cursor_time,
+            and_(ExamSession.start_time == cursor_time, ExamSession.id < cursor_id),
+        ))
 
-    session_ids = [s.id for s in sessions]
-    student_ids = list({s.student_id for s in sessions if s.student_id is not None})
-    exam_ids = list({s.exam_id for s in sessions if s.exam_id is not None})
+    rows = (
+        query.order_by(ExamSession.start_time.desc(), ExamSession.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last.start_time, last.id)
+    if not rows:
+        return []
 
-    students = {
-        u.id: u for u in db.query(User).filter(User.id.in_(student_ids)).all()
-    } if student_ids else {}
-    exams = {
-        e.id: e for e in db.query(Exam).filter(Exam.id.in_(exam_ids)).all()
-    } if exam_ids else {}
+    session_ids = [session.id for session, _, _, _ in rows]
+    totals = {
+        sid: (count or 0, severity or 0)
+        for sid, count, severity in (
+            db.query(
+                SessionViolationCount.session_id,
+                func.sum(SessionViolationCount.count),
+                func.sum(SessionViolationCount.total_severity),
+            )
+            .filter(SessionViolationCount.session_id.in_(session_ids))
+            .group_by(SessionViolationCount.session_id)
+            .all()
+        )
+    }
 
-    violations_by_session: Dict[int, List[Violation]] = {sid: [] for sid in session_ids}
-    for v in db.query(Violation).filter(Violation.session_id.in_(session_ids)).all():
-        violations_by_session.setdefault(v.session_id, []).append(v)
+    violations_by_session: Dict[int, List[Violation]] = {}
+    if not summary:
+        for v in db.query(Violation).filter(Violation.session_id.in_(session_ids)).all():
+            violations_by_session.setdefault(v.session_id, []).append(v)
 
     results = []
-    for session in sessions:
-        student = students.get(session.student_id)
-        exam = exams.get(session.exam_id)
-        violations = violations_by_session.get(session.id, [])
-
-        results.append({
+    for session, student_name, student_email, exam_title in rows:
+        count, severity = totals.get(session.id, (0, 0))
+        item = {
             "id": session.id,
             "exam_id": session.exam_id,
-            "exam_title": exam.title if exam else f"Exam {session.exam_id}",
+            "exam_title": exam_title or f"Exam {session.exam_id}",
             "student_id": session.student_id,
-            "student_name": student.full_name if student else f"Student {session.student_id}",
-            "student_email": student.email if student else "",
+            "student_name": student_name or f"Student {session.student_id}",
+            "student_email": student_email or "",
             "start_time": session.start_time.isoformat() if session.start_time else None,
             "end_time": session.end_time.isoformat() if session.end_time else None,
             "status": session.status,
             "verdict": session.verdict,
-            "violations_count": len(violations),
-            "violations": [
-                {
-                    "id": v.id,
-                    "type": v.type,
-                    "timestamp": v.timestamp.isoformat() if v.timestamp else None,
-                    "severity_score": v.severity_score,
-                    "confidence": v.confidence,
-                    "video_proof_url": v.video_proof_url,
-                    "video_duration": v.video_duration
-                }
-                for v in violations
+            "violations_count": int(count),
+            "total_severity": int(severity),
+        }
+        if not summary:
+            item["violations"] = [
+                _serialize_violation(v) for v in violations_by_session.get(session.id, [])
             ]
-        })
+        results.append(item)
     return results
 
 
+@router.get("/dashboard/sessions/{session_id}/violations")
+def get_session_violations(session_id: int, db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
+    """Violation details for one session (used with the summary listing)."""
+    violations = (
+        db.query(Violation)
+        .filter(Violation.session_id == session_id)
+        .order_by(Violation.timestamp, Violation.id)
+        .all()
+    )
+    return [_serialize_violation(v) for v in violations]
+
+
 @router.get("/dashboard/sessions/{student_id}")
 def get_student_sessions(student_id: int, db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
     """Get exam sessions for a specific student."""
@@ -1,78 +1,54 @@
 # app/api/endpoints/proctoring.py
-from fastapi import APIRouter, Depends, Form, HTTPException, Body, Request, WebSocket, WebSocketDisconnect, UploadFile, File
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Form, HTTPException, Body, Request, WebSocket, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.orm import Session, undefer
 from app.db.database import get_db
-from app.models.models import Violation, ExamSession, StudentProfile, User, Exam
+from app.models.models import Violation, ExamSession, StudentProfile, User
 from app.core.config import settings
-from typing import Dict, Any, Set
+from app.services.violations import bulk_insert_violations, calculate_severity
+from app.services.violation_writer import violation_writer
+from app.services.face_embeddings import (
+    bytes_to_image, decode_embedding, has_current_embedding, store_profile_embedding,
+)
+from app.services.face_index import face_index
+from app.services.face_pool import FacePoolBusy, FacePoolTimeout, face_pool
+from app.services.frame_pipeline import FRAME_MAX_BYTES, frame_pipeline
+from app.services.profile_photos import (
+    decode_photo, load_profile_photo, photo_urls, remove_profile_photo, store_profile_photo,
+)
+from app.services.http_client import get_http_client
+from app.services.live_feed import live_feed
+from app.services.session_resolver import session_resolver
+from app.services.signaling import signaling_hub
+from app.services.storage import build_public_url, ensure_bucket, get_minio_client, presigned_get_url
+from app.services.video import (
+    EVIDENCE_PART_SIZE, ProbingReader, WebmDurationProbe, get_video_duration, stream_size,
+)
+from typing import Dict, Any, List, Optional
 from datetime import datetime
-import base64
-import cv2
 import numpy as np
-import face_recognition
-from minio import Minio
 from minio.error import S3Error
+from urllib.parse import unquote, urlparse
 from uuid import uuid4
-import io
-import tempfile
-import subprocess
+import httpx
 
 router = APIRouter(prefix="/proctoring", tags=["proctoring"])
 
-def get_video_duration(video_bytes: bytes) -> float:
-    """Get video duration using ffprobe"""
-    try:
-        with tempfile.NamedTemporaryFile(suffix='.webm', delete=True) as tmp:
-            tmp.write(video_bytes)
-            tmp.flush()
-            result = subprocess.run(
-                ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                 '-of', 'default=noprint_wrappers=1:nokey=1', tmp.name],
-                capture_output=True, text=True, timeout=10
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                return float(result.stdout.strip())
-    except Exception as e:
-        print(f"Error getting video duration: {e}")
-    return None
-
-rooms: Dict[str, Set[WebSocket]] = {}
-
-def get_minio_client() -> Minio:
-    return Minio(
-        settings.MINIO_ENDPOINT,
-        access_key=settings.MINIO_ACCESS_KEY,
-        secret_key=settings.MINIO_SECRET_KEY,
-        secure=settings.MINIO_SECURE,
-    )
-
-def ensure_bucket(client: Minio, bucket: str) -> None:
-    found = client.bucket_exists(bucket)
-    if not found:
-        client.make_bucket(bucket)
+@router.websocket("/ws/feed")
+async def violation_feed(websocket: WebSocket, exam_id: Optional[int] = None):
+    """Receive-only push of new violations and session/verdict changes.
 
-def build_public_url(object_name: str) -> str:
-    if settings.MINIO_PUBLIC_URL:
-        return f"{settings.MINIO_PUBLIC_URL.rstrip('/')}/{settings.MINIO_BUCKET}/{object_name}"
-    scheme = "https" if settings.MINIO_SECURE else "http"
-    return f"{scheme}://{settings.MINIO_ENDPOINT}/{settings.MINIO_BUCKET}/{object_name}"
+    Subscribe to one exam with ``?exam_id=``, or to every exam without it.
+    """
+    await websocket.accept()
+    await live_feed.serve(websocket, exam_id)
 
 @router.websocket("/ws/stream/{room_id}")
 async def stream_signaling(websocket: WebSocket, room_id: str):
     await websocket.accept()
-    room = rooms.setdefault(room_id, set())
-    room.add(websocket)
-    try:
-        while True:
-            data = await websocket.receive_text()
-            for conn in list(room):
-                if conn is not websocket:
-                    await conn.send_text(data)
-    except WebSocketDisconnect:
-        room.remove(websocket)
-        if not room:
-            rooms.pop(room_id, None)
+    await signaling_hub.serve(room_id, websocket)
 
 @router.post("/report-violation")
 async def report_violation(
@@ -102,25 +78,115 @@ async def report_violation(
         student_id = None
         exam_id = None
 
-    session_id = resolve_session_id(db, session_id, student_id, exam_id)
+    session_id = await run_in_threadpool(resolve_session_id, db, session_id, student_id, exam_id)
 
     if session_id is None or violation_type is None or timestamp is None or confidence is None:
         raise HTTPException(status_code=400, detail="Missing required fields")
-    session = db.query(ExamSession).filter(ExamSession.id == session_id).first()
+    session = await run_in_threadpool(db.query(ExamSession.id).filter(ExamSession.id == session_id).first)
     if not session:
         raise HTTPException(status_code=403, detail="Invalid session")
 
-    violation = Violation(
-        session_id=session.id,
-        type=violation_type,
-        confidence=confidence,
-        severity_score=calculate_severity(violation_type)
-    )
-    db.add(violation)
+    violation_id = await violation_writer.submit({
+        "session_id": session.id,
+        "type": violation_type,
+        "confidence": confidence,
+        "severity_score": calculate_severity(violation_type),
+    })
+
+    return {"status": "received", "violation_id": violation_id}
+
+
+MAX_VIOLATION_BATCH = 1000
+
+
+@router.post("/report-violations")
+def report_violations(
+    payload: Dict[str, Any] = Body(...),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Report many violation events (for one or many sessions) in one request.
+
+    Expects {violations: [{session_id | student_id[, exam_id], violation_type,
+    timestamp, confidence}]}. Items are validated independently; valid items
+    are written with one multi-row insert and one commit. A plain ``def``:
+    the lookups and the write are blocking, so FastAPI runs it in the
+    threadpool instead of on the event loop.
+    """
+    items = payload.get("violations")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="violations must be a list")
+    if len(items) > MAX_VIOLATION_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_VIOLATION_BATCH} violations per batch")
+
+    results: List[Dict[str, Any]] = [{"index": i} for i in range(len(items))]
+    pending: List[tuple] = []
+    resolved: Dict[tuple, Any] = {}
+
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[i]["error"] = "Invalid item"
+            continue
+        violation_type = item.get("violation_type")
+        timestamp = item.get("timestamp")
+        confidence = item.get("confidence")
+        if violation_type is None or timestamp is None or confidence is None:
+            results[i]["error"] = "Missing required fields"
+            continue
+        try:
+            confidence = float(confidence)
+        except (TypeError, ValueError):
+            results[i]["error"] = "Invalid confidence"
+            continue
+
+        # Resolve student-only items once per (student, exam) pair
+        key = (item.get("session_id"), item.get("student_id"), item.get("exam_id"))
+        if key not in resolved:
+            resolved[key] = resolve_session_id(db, *key)
+        session_id = resolved[key]
+        if isinstance(session_id, str) and session_id.isdigit():
+            session_id = int(session_id)
+        if not isinstance(session_id, int):
+            results[i]["error"] = "Missing required fields"
+            continue
+
+        pending.append((i, {
+            "session_id": session_id,
+            "type": violation_type,
+            "timestamp": parse_timestamp(timestamp),
+            "confidence": confidence,
+            "severity_score": calculate_severity(violation_type),
+        }))
+
+    session_ids = {row["session_id"] for _, row in pending}
+    valid_ids = {
+        sid for (sid,) in db.query(ExamSession.id).filter(ExamSession.id.in_(session_ids)).all()
+    } if session_ids else set()
+
+    rows = []
+    indices = []
+    for i, row in pending:
+        if row["session_id"] not in valid_ids:
+            results[i]["error"] = "Invalid session"
+            continue
+        rows.append(row)
+        indices.append(i)
+
+    violation_ids = bulk_insert_violations(db, rows)
     db.commit()
-    db.refresh(violation)
+    try:
+        live_feed.violations_committed(db, rows, violation_ids)
+    except Exception as e:
+        # The rows are committed; failing here would make the client retry them
+        print(f"Live feed publish failed: {e}")
+    for i, violation_id in zip(indices, violation_ids):
+        results[i]["violation_id"] = violation_id
 
-    return {"status": "received", "violation_id": violation.id}
+    return {
+        "status": "received",
+        "received": len(items),
+        "inserted": len(violation_ids),
+        "results": results,
+    }
 
 
 @router.post("/report-violation-evidence")
@@ -134,47 +200,81 @@ async def report_violation_evidence(
     confidence: float = Form(None),
     db: Session = Depends(get_db),
 ):
-    session_id = resolve_session_id(db, session_id, student_id, exam_id)
+    session_id = await run_in_threadpool(resolve_session_id, db, session_id, student_id, exam_id)
     if session_id is None or violation_type is None or timestamp is None or confidence is None:
         raise HTTPException(status_code=400, detail="Missing required fields")
-    session = db.query(ExamSession).filter(ExamSession.id == session_id).first()
+    session = await run_in_threadpool(db.query(ExamSession.id).filter(ExamSession.id == session_id).first)
     if not session:
         raise HTTPException(status_code=403, detail="Invalid session")
 
     client = get_minio_client()
     try:
-        ensure_bucket(client, settings.MINIO_BUCKET)
+        await run_in_threadpool(ensure_bucket, client, settings.MINIO_BUCKET)
     except S3Error:
         raise HTTPException(status_code=500, detail="MinIO bucket error")
 
-    contents = await file.read()
-    
-    # Get video duration
-    video_duration = get_video_duration(contents)
-    
+    # Stream the spooled upload to MinIO in parts, parsing the WebM
+    # timestamps on the way through instead of buffering the whole clip
+    probe = WebmDurationProbe()
     object_name = f"violations/{session_id}/{uuid4().hex}.webm"
-    client.put_object(
+    await run_in_threadpool(
+        client.put_object,
         settings.MINIO_BUCKET,
         object_name,
-        io.BytesIO(contents),
-        length=len(contents),
+        ProbingReader(file.file, probe),
+        length=stream_size(file.file),
+        part_size=EVIDENCE_PART_SIZE,
         content_type=file.content_type or "video/webm",
     )
     public_url = build_public_url(object_name)
 
-    violation = Violation(
-        session_id=session.id,
-        type=violation_type,
-        confidence=confidence,
-        severity_score=calculate_severity(violation_type),
-        video_proof_url=public_url,
-        video_duration=video_duration,
-    )
-    db.add(violation)
-    db.commit()
-    db.refresh(violation)
+    video_duration = probe.duration
+    if video_duration is None:
+        video_duration = await run_in_threadpool(get_video_duration, file.file)
+
+    violation_id = await violation_writer.submit({
+        "session_id": session.id,
+        "type": violation_type,
+        "confidence": confidence,
+        "severity_score": calculate_severity(violation_type),
+        "video_proof_url": public_url,
+        "video_duration": video_duration,
+    })
+
+    return {"status": "received", "violation_id": violation_id, "video_url": public_url, "video_duration": video_duration}
+
+
+@router.post("/frames")
+async def submit_frame(
+    file: UploadFile = File(...),
+    session_id: int = Form(None),
+    student_id: int = Form(None),
+    exam_id: int = Form(None),
+    timestamp: str = Form(None),
+    db: Session = Depends(get_db),
+):
+    """Queue a sampled webcam frame for server-side face/gaze analysis.
+
+    Frames are analyzed asynchronously; resulting violations show up on the
+    live feed like client-reported ones.
+    """
+    session_id = await run_in_threadpool(resolve_session_id, db, session_id, student_id, exam_id)
+    if session_id is None:
+        raise HTTPException(status_code=400, detail="Missing required fields")
+    session = await run_in_threadpool(db.query(ExamSession.id, ExamSession.student_id).filter(
+        ExamSession.id == session_id, ExamSession.status == "active"
+    ).first)
+    if not session:
+        raise HTTPException(status_code=403, detail="Invalid session")
 
-    return {"status": "received", "violation_id": violation.id, "video_url": public_url, "video_duration": video_duration}
+    data = await file.read(FRAME_MAX_BYTES + 1)
+    if len(data) > FRAME_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Frame too large")
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty frame")
+
+    queued = frame_pipeline.submit(session.id, session.student_id, data, parse_timestamp(timestamp))
+    return {"status": "queued" if queued else "dropped", "session_id": session.id}
 
 @router.post("/student/{student_id}/photo")
 def upload_student_photo(
@@ -193,25 +293,52 @@ def upload_student_photo(
     if not student:
         return {"error": "Student not found"}
     
+    try:
+        data = decode_photo(photo_data)
+        image = bytes_to_image(data)
+    except Exception:
+        return {"error": "photo is not a valid image"}
+
+    client = get_minio_client()
+    try:
+        ensure_bucket(client, settings.MINIO_BUCKET)
+        photo_path, thumbnail_path = store_profile_photo(client, student_id, data, image)
+    except S3Error:
+        raise HTTPException(status_code=500, detail="MinIO bucket error")
+
     # Find or create student profile
     profile = db.query(StudentProfile).filter(StudentProfile.student_id == student_id).first()
+    previous = (profile.photo_path, profile.thumbnail_path) if profile else (None, None)
     
     if not profile:
-        profile = StudentProfile(student_id=student_id, photo_base64=photo_data, is_verified=True)
+        profile = StudentProfile(student_id=student_id, is_verified=True)
         db.add(profile)
     else:
-        profile.photo_base64 = photo_data
         profile.is_verified = True
         profile.updated_at = datetime.now()
+    profile.photo_path = photo_path
+    profile.thumbnail_path = thumbnail_path
+    profile.photo_base64 = None
+
+    # Encode the reference face once so verification only encodes the exam photo
+    try:
+        store_profile_embedding(profile, face_pool.encode_blocking(data))
+    except Exception as e:
+        print(f"Error computing face embedding: {e}")
+        profile.face_embedding = None
+        profile.face_embedding_photo_hash = None
     
     db.commit()
     db.refresh(profile)
+    remove_profile_photo(client, *previous)
+    face_index.schedule_rebuild()
     
     return {
         "status": "success",
         "message": "Photo uploaded successfully",
         "student_id": student_id,
-        "has_photo": True
+        "has_photo": True,
+        **photo_urls(profile),
     }
 
 @router.get("/student/{student_id}/photo-status")
@@ -222,7 +349,9 @@ def check_student_photo(
     """Check if student has uploaded a photo for identification."""
     profile = db.query(StudentProfile).filter(StudentProfile.student_id == student_id).first()
     
-    has_photo = profile is not None and profile.photo_base64 is not None
+    has_photo = profile is not None and (
+        profile.photo_path is not None or profile.photo_base64 is not None
+    )
     
     return {
         "student_id": student_id,
@@ -242,28 +371,13 @@ def get_student_profile(
 
     profile = db.query(StudentProfile).filter(StudentProfile.student_id == student_id).first()
 
-    photo_base64 = None
-    if profile and profile.photo_base64:
-        raw = profile.photo_base64
-        if isinstance(raw, str):
-            if raw.startswith("data:"):
-                photo_base64 = raw
-            else:
-                # Best-effort MIME detection for common image types
-                mime = "image/jpeg"
-                if raw.startswith("iVBOR"):
-                    mime = "image/png"
-                elif raw.startswith("R0lG"):
-                    mime = "image/gif"
-                photo_base64 = f"data:{mime};base64,{raw}"
-
     return {
         "id": user.id,
         "email": user.email,
         "full_name": user.full_name,
         "role": user.role.value,
         "is_active": user.is_active,
-        "photo_base64": photo_base64,
+        **photo_urls(profile),
         "is_verified": profile.is_verified if profile else False,
     }
 
@@ -273,16 +387,25 @@ def verify_student_photo(
     payload: Dict[str, Any] = Body(...),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
-    """Compare exam photo with stored profile photo for identity verification."""
+    """Compare exam photo with stored profile photo for identity verification.
+
+    Sync on purpose: the profile load/store is blocking database work, so it
+    runs in the threadpool and waits on the face pool from there.
+    """
     exam_photo = payload.get("exam_photo")  # Base64 encoded image from exam start
     
     if not exam_photo:
         return {"error": "exam_photo is required"}
     
     # Get stored profile photo
-    profile = db.query(StudentProfile).filter(StudentProfile.student_id == student_id).first()
+    profile = (
+        db.query(StudentProfile)
+        .options(undefer(StudentProfile.face_embedding))
+        .filter(StudentProfile.student_id == student_id)
+        .first()
+    )
     
-    if not profile or not profile.photo_base64:
+    if not profile or not (profile.photo_path or profile.photo_base64):
         return {
             "verified": False,
             "confidence": 0.0,
@@ -290,32 +413,32 @@ def verify_student_photo(
         }
     
     try:
-        # Convert base64 photos to images
-        profile_image = base64_to_image(profile.photo_base64)
-        exam_image = base64_to_image(exam_photo)
-        
-        # Extract face encodings
-        profile_faces = face_recognition.face_encodings(profile_image)
-        exam_faces = face_recognition.face_encodings(exam_image)
+        # Stored embedding of the profile photo (computed here only for legacy rows)
+        if has_current_embedding(profile):
+            profile_encoding = decode_embedding(profile.face_embedding)
+        else:
+            profile_data = load_profile_photo(get_minio_client(), profile)
+            profile_encoding = face_pool.encode_blocking(profile_data)
+            store_profile_embedding(profile, profile_encoding)
+            db.commit()
+            face_index.schedule_rebuild()
         
-        if not profile_faces:
+        if profile_encoding is None:
             return {
                 "verified": False,
                 "confidence": 0.0,
                 "message": "No face detected in profile photo"
             }
         
-        if not exam_faces:
+        exam_encoding = face_pool.encode_blocking(decode_photo(exam_photo))
+        
+        if exam_encoding is None:
             return {
                 "verified": False,
                 "confidence": 0.0,
                 "message": "No face detected in exam photo"
             }
         
-        # Compare faces (use first face from each photo)
-        profile_encoding = profile_faces[0]
-        exam_encoding = exam_faces[0]
-        
         # Calculate distance between encodings (0 = identical, 1 = very different)
         distance = np.linalg.norm(profile_encoding - exam_encoding)
         
@@ -335,6 +458,10 @@ def verify_student_photo(
             "message": "Photo verification successful" if verified else "Photo does not match profile"
         }
     
+    except FacePoolBusy:
+        raise HTTPException(status_code=503, detail="Face verification is busy, retry shortly")
+    except FacePoolTimeout:
+        raise HTTPException(status_code=503, detail="Face verification timed out, retry shortly")
     except Exception as e:
         return {
             "verified": False,
@@ -342,19 +469,17 @@ def verify_student_photo(
             "message": f"Error during photo comparison: {str(e)}"
         }
 
-def calculate_severity(v_type: str) -> int:
-    mapping = {
-        "gaze_away": 1,
-        "tab_switch": 2,
-        "voice_detected": 3,
-        "face_missing": 4,
-        "multiple_faces": 5,
-        "face_substitution": 5,
-        "phone_detected": 4,
-        "book_detected": 3,
-        "laptop_detected": 3,
-    }
-    return mapping.get(v_type, 1)
+def parse_timestamp(value: Any) -> datetime:
+    """Parse a client ISO timestamp, falling back to the current time."""
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone().replace(tzinfo=None)
+            return parsed
+        except ValueError:
+            pass
+    return datetime.now()
 
 def resolve_session_id(
     db: Session,
@@ -362,57 +487,36 @@ def resolve_session_id(
     student_id: Any,
     exam_id: Any,
 ) -> int:
+    """Session id for a report, resolving student-only reports (blocking)."""
     if session_id in ("", 0, "0"):
         session_id = None
     if isinstance(session_id, str) and session_id.isdigit():
         session_id = int(session_id)
 
     if session_id is None and student_id is not None:
-        session = (
-            db.query(ExamSession)
-            .filter(ExamSession.student_id == student_id)
-            .order_by(ExamSession.start_time.desc())
-            .first()
-        )
-        if not session:
-            exam = None
-            if exam_id is not None:
-                exam = db.query(Exam).filter(Exam.id == exam_id).first()
-            if not exam:
-                exam = db.query(Exam).first()
-            session = ExamSession(exam_id=exam.id if exam else None, student_id=student_id, status="active")
-            db.add(session)
-            db.commit()
-            db.refresh(session)
-        if session:
-            session_id = session.id
+        if isinstance(student_id, str) and student_id.isdigit():
+            student_id = int(student_id)
+        if isinstance(exam_id, str) and exam_id.isdigit():
+            exam_id = int(exam_id)
+        session_id = session_resolver.resolve(db, student_id, exam_id or None)
     return session_id
 
-def base64_to_image(base64_str: str) -> np.ndarray:
-    """Convert base64 encoded image to numpy array."""
-    # Remove data URL prefix if present
-    if "," in base64_str:
-        base64_str = base64_str.split(",")[1]
-    
-    # Decode base64
-    image_data = base64.b64decode(base64_str)
-    
-    # Convert to numpy array
-    nparr = np.frombuffer(image_data, np.uint8)
-    
-    # Decode image
-    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-    
-    # Convert BGR to RGB for face_recognition
-    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    
-    return image
+# Request headers forwarded to MinIO so seeking and revalidation work
+_PROXY_REQUEST_HEADERS = ("range", "if-range", "if-none-match", "if-modified-since")
+_PROXY_RESPONSE_HEADERS = (
+    "content-type", "content-length", "content-range", "accept-ranges",
+    "etag", "last-modified", "cache-control",
+)
+
 
 @router.get("/video-proxy")
-async def video_proxy(url: str):
-    """Proxy video requests to MinIO with CORS headers"""
-    import httpx
-    
+async def video_proxy(url: str, request: Request, redirect: bool = False):
+    """Proxy video requests to MinIO with CORS headers.
+
+    Streams the object through with Range support (206 partial content), so
+    seeking in the player fetches only the requested bytes. With
+    ``redirect=true`` the client is sent to a presigned MinIO URL instead.
+    """
     # Validate that URL is from our MinIO
     allowed_hosts = [
         "http://localhost:9000",
@@ -426,24 +530,50 @@ async def video_proxy(url: str):
     # Convert localhost URL to internal minio URL for Docker network
     internal_url = url.replace("http://localhost:9000", "http://minio:9000")
     internal_url = internal_url.replace("http://127.0.0.1:9000", "http://minio:9000")
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(internal_url, timeout=30.0)
-            
-            headers = {
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, HEAD, OPTIONS",
-                "Access-Control-Allow-Headers": "*",
-                "Content-Type": response.headers.get("Content-Type", "video/webm"),
-                "Content-Length": response.headers.get("Content-Length", "0"),
-                "Accept-Ranges": "bytes",
-            }
-            
-            return StreamingResponse(
-                iter([response.content]),
-                headers=headers,
-                media_type=response.headers.get("Content-Type", "video/webm")
-            )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error proxying video: {str(e)}")
+
+    if redirect:
+        bucket_prefix = f"/{settings.MINIO_BUCKET}/"
+        path = urlparse(internal_url).path
+        if not path.startswith(bucket_prefix):
+            raise HTTPException(status_code=400, detail="Invalid URL")
+        signed = await run_in_threadpool(presigned_get_url, unquote(path[len(bucket_prefix):]))
+        return RedirectResponse(signed, status_code=307)
+
+    client = get_http_client()
+    upstream_headers = {
+        name: request.headers[name] for name in _PROXY_REQUEST_HEADERS if name in request.headers
+    }
+    try:
+        upstream = await client.send(
+            client.build_request("GET", internal_url, headers=upstream_headers),
+            stream=True,
+        )
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Error proxying video: {str(e)}")
+
+    if upstream.status_code >= 400 and upstream.status_code != 416:
+        await upstream.aclose()
+        raise HTTPException(status_code=upstream.status_code, detail="Error proxying video")
+
+    headers = {
+        "Access-Control-Allow-Origin": "*",
+        "Access-Control-Allow-Methods": "GET, HEAD, OPTIONS",
+        "Access-Control-Allow-Headers": "*",
+        "Access-Control-Expose-Headers": "Content-Length, Content-Range, Accept-Ranges, ETag",
+        "Accept-Ranges": "bytes",
+    }
+    for name in _PROXY_RESPONSE_HEADERS:
+        if name in upstream.headers:
+            headers[name] = upstream.headers[name]
+
+    if upstream.status_code == 304:
+        await upstream.aclose()
+        return Response(status_code=304, headers=headers)
+
+    return StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        headers=headers,
+        media_type=upstream.headers.get("Content-Type", "video/webm"),
+        background=BackgroundTask(upstream.aclose),
+    )
@@ -0,0 +1,164 @@
+# app/cli.py
+"""Operational commands.
+
+Usage:
+    python -m app.cli migrate [--revision REV] [--check]
+    python -m app.cli seed-demo
+    python -m app.cli migrate-profile-photos [--batch-size 100]
+    python -m app.cli reconcile-violation-counts [--session-id ID ...] [--fix]
+    python -m app.cli analysis-worker [--workers N]
+    python -m app.cli reanalyze-exam EXAM_ID [--batch-size 1000]
+    python -m app.cli build-face-index
+"""
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from app.core.config import settings
+from app.db.database import get_db_context
+
+
+def migrate(args: argparse.Namespace) -> int:
+    from app.db.schema import current_revision, head_revision, migrate as run_migrations
+
+    if args.check:
+        current, head = current_revision(), head_revision()
+        print(json.dumps({"current": current, "head": head}))
+        return 0 if current == head else 1
+    print(json.dumps(run_migrations(args.revision)))
+    return 0
+
+
+def seed_demo(args: argparse.Namespace) -> int:
+    from app.db.seed import seed_demo_users
+
+    with get_db_context() as db:
+        result = seed_demo_users(db)
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+def migrate_profile_photos(args: argparse.Namespace) -> int:
+    from app.services.profile_photos import migrate_inline_photos
+    from app.services.storage import ensure_bucket, get_minio_client
+
+    client = get_minio_client()
+    ensure_bucket(client, settings.MINIO_BUCKET)
+    with get_db_context() as db:
+        result = migrate_inline_photos(db, client, batch_size=args.batch_size)
+    print(json.dumps(result))
+    return 0 if not result["failed"] else 1
+
+
+def reconcile_violation_counts(args: argparse.Namespace) -> int:
+    from app.services.violations import reconcile_aggregates
+
+    with get_db_context() as db:
+        result = reconcile_aggregates(
+            db, session_ids=args.session_id, fix=args.fix, batch_size=args.batch_size
+        )
+    print(json.dumps(result))
+    return 0 if args.fix or not result["mismatched"] else 1
+
+
+def analysis_worker(args: argparse.Namespace) -> int:
+    import signal
+
+    from app.services.analysis_jobs import ANALYSIS_WORKERS, AnalysisWorkerPool
+
+    pool = AnalysisWorkerPool(workers=args.workers or ANALYSIS_WORKERS)
+    pool.start()
+    # Finish in-flight jobs on SIGTERM/SIGINT; unclaimed jobs stay queued
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: pool.request_stop())
+    pool.join()
+    pool.stop()
+    return 0
+
+
+def reanalyze_exam(args: argparse.Namespace) -> int:
+    from app.services.ai_analyzer import analyze_exam
+
+    with get_db_context() as db:
+        result = analyze_exam(db, args.exam_id, batch_size=args.batch_size)
+    print(json.dumps(result))
+    return 0
+
+
+def build_face_index(args: argparse.Namespace) -> int:
+    from app.services.face_index import face_index
+
+    with get_db_context() as db:
+        size = face_index.build(db)
+    print(json.dumps({"size": size, "directory": face_index.directory}))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    schema = commands.add_parser(
+        "migrate",
+        help="Apply database migrations (adopts databases created before migrations existed)",
+    )
+    schema.add_argument("--revision", default="head")
+    schema.add_argument(
+        "--check", action="store_true",
+        help="Only report whether the database is at the latest revision",
+    )
+    schema.set_defaults(func=migrate)
+
+    seed = commands.add_parser(
+        "seed-demo",
+        help="Create the demo teacher and student accounts (development only)",
+    )
+    seed.set_defaults(func=seed_demo)
+
+    photos = commands.add_parser(
+        "migrate-profile-photos",
+        help="Move inline base64 profile photos into object storage",
+    )
+    photos.add_argument("--batch-size", type=int, default=100)
+    photos.set_defaults(func=migrate_profile_photos)
+
+    reconcile = commands.add_parser(
+        "reconcile-violation-counts",
+        help="Recompute per-session violation aggregates from raw rows and compare",
+    )
+    reconcile.add_argument("--session-id", type=int, action="append")
+    reconcile.add_argument("--batch-size", type=int, default=500)
+    reconcile.add_argument(
+        "--fix", action="store_true",
+        help="Replace mismatching aggregates (also backfills sessions created before aggregates existed)",
+    )
+    reconcile.set_defaults(func=reconcile_violation_counts)
+
+    worker = commands.add_parser(
+        "analysis-worker",
+        help="Run a standalone pool draining the analysis job queue",
+    )
+    worker.add_argument("--workers", type=int, help="Defaults to ANALYSIS_WORKERS")
+    worker.set_defaults(func=analysis_worker)
+
+    reanalyze = commands.add_parser(
+        "reanalyze-exam",
+        help="Recompute verdicts for every finished session of an exam",
+    )
+    reanalyze.add_argument("exam_id", type=int)
+    reanalyze.add_argument("--batch-size", type=int, default=1000)
+    reanalyze.set_defaults(func=reanalyze_exam)
+
+    index = commands.add_parser(
+        "build-face-index",
+        help="Rebuild the roster face index from stored profile embeddings",
+    )
+    index.set_defaults(func=build_face_index)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# app/db/schema.py
+"""Schema migrations, run once per deploy instead of in every worker."""
+import os
+from typing import Any, Dict, List, Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.database import engine
+from app.models.models import Base
+from app.services.violations import backfill_missing_aggregates
+
+# Revision matching the schema the old startup create_all produced. Legacy
+# databases are adopted against the current models, so adopt them before a
+# later revision changes those models.
+BASELINE_REVISION = "0001"
+
+_ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "alembic.ini")
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    config = Config(_ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def current_revision(bind: Engine = engine) -> Optional[str]:
+    with bind.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+
+def head_revision() -> Optional[str]:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def _adopt_legacy_schema(conn: Connection) -> Dict[str, Any]:
+    """Bring a database created by ``create_all`` up to the baseline revision.
+
+    ``create_all`` only ever created missing tables, so columns and indexes
+    added to existing tables later (the student profile photo/embedding
+    columns, composite indexes) may be absent. Those are added here; nothing
+    is altered or dropped. Violation aggregates are then built for sessions
+    recorded before ``session_violation_counts`` existed, since counts and
+    verdicts are read only from that table.
+    """
+    inspector = inspect(conn)
+    quote = conn.dialect.identifier_preparer.quote
+    existing_tables = set(inspector.get_table_names())
+    added: Dict[str, Any] = {"tables": [], "columns": [], "indexes": []}
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            table.create(conn)
+            added["tables"].append(table.name)
+            continue
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in columns:
+                if not column.nullable:
+                    raise RuntimeError(f"Cannot add NOT NULL column {table.name}.{column.name}; migrate by hand")
+                ddl = column.type.compile(dialect=conn.dialect)
+                conn.exec_driver_sql(f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {ddl} NULL")
+                added["columns"].append(f"{table.name}.{column.name}")
+        indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(conn)
+                added["indexes"].append(index.name)
+    added["aggregate_rows"] = backfill_missing_aggregates(conn)
+    return added
+
+
+def migrate(revision: str = "head", bind: Engine = engine) -> Dict[str, Any]:
+    """Upgrade the database to ``revision``.
+
+    A database that has tables but no Alembic version is assumed to come
+    from the pre-migration startup code: it is adopted (see
+    ``_adopt_legacy_schema``) and stamped at the baseline before upgrading.
+    """
+    adopted: Optional[Dict[str, Any]] = None
+    with bind.begin() as conn:
+        before = MigrationContext.configure(conn).get_current_revision()
+        if before is None and inspect(conn).has_table("users"):
+            adopted = _adopt_legacy_schema(conn)
+            command.stamp(alembic_config(conn), BASELINE_REVISION)
+            before = BASELINE_REVISION
+        command.upgrade(alembic_config(conn), revision)
+        after = MigrationContext.configure(conn).get_current_revision()
+    return {"from": before, "to": after, "adopted": adopted}
@@ -0,0 +1,43 @@
+# app/db/seed.py
+"""Demo accounts for local development; never run automatically."""
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models.models import User, UserRole
+from app.services.security import hash_password
+
+
+DEMO_PASSWORD = "password123"
+DEMO_STUDENT_PASSWORD = "demo_password"
+
+_DEMO_USERS = (
+    ("teacher@university.edu", "Demo Teacher", UserRole.TEACHER, DEMO_PASSWORD),
+    ("student@university.edu", "Demo Student", UserRole.STUDENT, DEMO_PASSWORD),
+    ("s.chen@university.edu", "Сара Чен", UserRole.STUDENT, DEMO_STUDENT_PASSWORD),
+    ("m.johnson@university.edu", "Маркус Джонсон", UserRole.STUDENT, DEMO_STUDENT_PASSWORD),
+    ("a.petrov@university.edu", "Алексей Петров", UserRole.STUDENT, DEMO_STUDENT_PASSWORD),
+)
+
+
+def seed_demo_users(db: Session) -> Dict[str, List[str]]:
+    """Create the demo teacher and students that do not exist yet (idempotent)."""
+    emails = [email for email, _, _, _ in _DEMO_USERS]
+    existing = {email for (email,) in db.query(User.email).filter(User.email.in_(emails)).all()}
+    hashes: Dict[str, str] = {}
+    created = []
+    for email, full_name, role, password in _DEMO_USERS:
+        if email in existing:
+            continue
+        if password not in hashes:
+            hashes[password] = hash_password(password)
+        db.add(User(
+            email=email,
+            hashed_password=hashes[password],
+            full_name=full_name,
+            role=role,
+            is_active=True,
+        ))
+        created.append(email)
+    db.commit()
+    return {"created": created, "existing": sorted(existing)}
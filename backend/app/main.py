@@ -2,86 +2,69 @@ from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.db.database import get_db, engine, SessionLocal
-from app.models.models import Base, User, UserRole
+from app.db.database import get_db, engine
 from app.api.routes import api_router
-
-
-def _ensure_student_profile_photo_column() -> None:
-    """Ensure MySQL schema contains photo storage columns for student profiles."""
-    try:
-        with engine.begin() as conn:
-            # Check for photo_base64 column
-            result = conn.execute(
-                text(
-                    """
-                    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_SCHEMA = DATABASE()
-                      AND TABLE_NAME = 'student_profiles'
-                      AND COLUMN_NAME = 'photo_base64'
-                    """
-                )
-            )
-            if not result.scalar():
-                conn.execute(text("ALTER TABLE student_profiles ADD COLUMN photo_base64 JSON NULL"))
-
-            # Check for photo_path column
-            result = conn.execute(
-                text(
-                    """
-                    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_SCHEMA = DATABASE()
-                      AND TABLE_NAME = 'student_profiles'
-                      AND COLUMN_NAME = 'photo_path'
-                    """
-                )
-            )
-            if not result.scalar():
-                conn.execute(text("ALTER TABLE student_profiles ADD COLUMN photo_path VARCHAR(512) NULL"))
-    except SQLAlchemyError:
-        # Ignore schema fix errors; database may be read-only
-        pass
-
-
-def _seed_demo_users() -> None:
-    """Seed demo users for development if none exist."""
-    db = SessionLocal()
+from app.services.analysis_jobs import analysis_pool
+from app.services.audit_log import audit_log
+from app.services.face_index import face_index
+from app.services.face_pool import face_pool
+from app.services.frame_pipeline import frame_pipeline
+from app.services.http_client import close_http_client
+from app.services.live_feed import live_feed
+from app.services.security import password_pool
+from app.services.signaling import signaling_hub
+from app.services.storage import close_storage, init_storage
+from app.services.violation_writer import violation_writer
+from app.services.violations import check_autoinc_lock_mode
+
+
+def _check_autoinc_lock_mode() -> None:
     try:
-        if not db.query(User).filter(User.role == UserRole.TEACHER).first():
-            db.add(User(
-                email="teacher@university.edu",
-                hashed_password="password123",
-                full_name="Demo Teacher",
-                role=UserRole.TEACHER,
-            ))
-        if not db.query(User).filter(User.role == UserRole.STUDENT).first():
-            db.add(User(
-                email="student@university.edu",
-                hashed_password="password123",
-                full_name="Demo Student",
-                role=UserRole.STUDENT,
-            ))
-        db.commit()
-    except SQLAlchemyError:
-        db.rollback()
-    finally:
-        db.close()
+        with engine.connect() as conn:
+            check_autoinc_lock_mode(conn)
+    except SQLAlchemyError as e:
+        # Checked again on the first violation batch
+        print(f"Auto-increment lock mode check failed: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Application lifespan manager for startup/shutdown events."""
+    """Application lifespan manager for startup/shutdown events.
+
+    Startup only prepares what serving needs. Schema changes and demo data
+    are separate one-off commands (``python -m app.cli migrate`` /
+    ``seed-demo``) so restarting many workers never races on DDL.
+    """
     # Startup
-    Base.metadata.create_all(bind=engine)
-    _ensure_student_profile_photo_column()
-    _seed_demo_users()
+    await run_in_threadpool(init_storage)
+    await run_in_threadpool(_check_autoinc_lock_mode)
+    face_index.ensure_built()
+    await violation_writer.start()
+    audit_log.start()
+    face_pool.start()
+    analysis_pool.start()
+    await signaling_hub.start()
+    await live_feed.start()
+    await frame_pipeline.start()
     yield
-    # Shutdown: cleanup resources if needed
+    # Shutdown: flush buffered writes before closing the pool
+    await signaling_hub.stop()
+    await frame_pipeline.stop()
+    await violation_writer.stop()
+    await run_in_threadpool(audit_log.stop)
+    await run_in_threadpool(analysis_pool.stop)
+    await live_feed.stop()
+    face_index.stop()
+    face_pool.shutdown()
+    password_pool.shutdown()
+    await close_http_client()
+    close_storage()
     engine.dispose()
 
 
@@ -98,6 +81,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include API routes
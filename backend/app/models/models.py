@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import List, Optional
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, Enum, Float, ForeignKey, Index, Integer, JSON, String, Text
+    Boolean, Column, DateTime, Enum, Float, ForeignKey, Index, Integer, JSON, LargeBinary, String, Text
 )
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -68,7 +68,16 @@ class StudentProfile(Base):
         Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True, index=True, nullable=False
     )
     photo_path: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
-    photo_base64: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    thumbnail_path: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    # Legacy inline photo; new uploads live in object storage (see photo_path)
+    photo_base64: Mapped[Optional[dict]] = mapped_column(
+        JSON(none_as_null=True), nullable=True, deferred=True
+    )
+    # float32 face encoding of the profile photo (empty if no face was found)
+    face_embedding: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary, nullable=True, deferred=True
+    )
+    face_embedding_photo_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -109,6 +118,8 @@ class ExamSession(Base):
     __tablename__ = "exam_sessions"
     __table_args__ = (
         Index("ix_exam_sessions_status_start", "status", "start_time"),
+        Index("ix_exam_sessions_start_id", "start_time", "id"),
+        Index("ix_exam_sessions_exam_start", "exam_id", "start_time"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -161,6 +172,45 @@ class Violation(Base):
     session: Mapped["ExamSession"] = relationship("ExamSession", back_populates="violations")
 
 
+class SessionViolationCount(Base):
+    """Running violation totals per session and type.
+
+    Maintained alongside every violation insert so the session verdict is
+    available without scanning ``violations``.
+    """
+    __tablename__ = "session_violation_counts"
+
+    session_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("exam_sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+    type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_severity: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    first_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class AnalysisJob(Base):
+    """Queued post-exam analysis for a session (one row per session)."""
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        Index("ix_analysis_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    session_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("exam_sessions.id", ondelete="CASCADE"), unique=True, nullable=False
+    )
+    status: Mapped[str] = mapped_column(String(20), default="pending")  # pending, running, done, failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
 class AuditLog(Base):
     """Audit log for tracking system events."""
     __tablename__ = "audit_logs"
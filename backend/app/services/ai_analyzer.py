@@ -1,12 +1,17 @@
 # app/services/ai_analyzer.py
 """AI-powered exam session analysis service."""
-from collections import Counter
+import time
+from collections import Counter, defaultdict
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime
+from typing import Dict, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Session, noload
 
-from app.models.models import ExamSession, Violation
+from app.models.models import ExamSession, SessionViolationCount
+from app.services.live_feed import live_feed
+from app.services.violations import session_aggregates, summarize_counts
 
 
 # Verdict thresholds (configurable per exam in future)
@@ -22,6 +27,19 @@ class AnalysisResult:
     total_severity: int
     violation_types: list[str]
     type_counts: dict[str, int]
+    first_violation_at: Optional[datetime] = None
+    last_violation_at: Optional[datetime] = None
+
+
+def verdict_for(total_severity: int) -> str:
+    """Map accumulated severity to a verdict."""
+    if total_severity == 0:
+        return "clean"
+    if total_severity <= SUSPICIOUS_THRESHOLD:
+        return "suspicious"
+    if total_severity <= VIOLATION_THRESHOLD:
+        return "warning"
+    return "violation"
 
 
 class ExamAnalyzer:
@@ -31,57 +49,122 @@ class ExamAnalyzer:
         self.db = db
         self.session_id = session_id
 
+    def preview(self) -> AnalysisResult:
+        """Provisional verdict from the running aggregates, without saving."""
+        totals = session_aggregates(self.db, self.session_id)
+        return AnalysisResult(
+            verdict=verdict_for(totals["total_severity"]),
+            total_violations=totals["total_violations"],
+            total_severity=totals["total_severity"],
+            violation_types=list(totals["type_counts"]),
+            type_counts=totals["type_counts"],
+            first_violation_at=totals["first_violation_at"],
+            last_violation_at=totals["last_violation_at"],
+        )
+
     def analyze(self) -> Optional[AnalysisResult]:
         """Analyze exam session violations and generate final verdict.
-        
+
+        Reads the per-type aggregates maintained on insert, so the cost does
+        not grow with the number of reported violations.
+
         Returns:
             AnalysisResult if session found, None otherwise.
         """
         session = (
             self.db.query(ExamSession)
+            .options(noload(ExamSession.violations))
             .filter(ExamSession.id == self.session_id)
             .first()
         )
         if not session:
             return None
 
-        violations = (
-            self.db.query(Violation)
-            .filter(Violation.session_id == self.session_id)
-            .all()
-        )
-
-        # Calculate metrics
-        total_severity = sum(v.severity_score or 0 for v in violations)
-        violation_types = [v.type for v in violations]
-        type_counts = dict(Counter(violation_types))
-
-        # Determine verdict based on severity
-        if total_severity == 0:
-            verdict = "clean"
-        elif total_severity <= SUSPICIOUS_THRESHOLD:
-            verdict = "suspicious"
-        elif total_severity <= VIOLATION_THRESHOLD:
-            verdict = "warning"
-        else:
-            verdict = "violation"
+        result = self.preview()
 
         # Update session
-        session.verdict = verdict
-        session.ai_summary = {
-            "total_violations": len(violations),
-            "total_severity": total_severity,
-            "violation_types": list(set(violation_types)),
-            "type_counts": type_counts,
-            "analysis_version": "1.0",
-        }
+        session.verdict = result.verdict
+        session.ai_summary = summary_payload(result)
 
         self.db.commit()
 
-        return AnalysisResult(
-            verdict=verdict,
-            total_violations=len(violations),
-            total_severity=total_severity,
-            violation_types=list(set(violation_types)),
-            type_counts=type_counts,
+        return result
+
+
+def summary_payload(result: AnalysisResult) -> dict:
+    """``ExamSession.ai_summary`` contents for an analysis result."""
+    return {
+        "total_violations": result.total_violations,
+        "total_severity": result.total_severity,
+        "violation_types": result.violation_types,
+        "type_counts": result.type_counts,
+        "first_violation_at": result.first_violation_at.isoformat() if result.first_violation_at else None,
+        "last_violation_at": result.last_violation_at.isoformat() if result.last_violation_at else None,
+        "analysis_version": "1.1",
+    }
+
+
+def analyze_exam(db: Session, exam_id: int, batch_size: int = 1000) -> dict:
+    """Re-run verdicts for every finished session of an exam.
+
+    One aggregate query reads per-type totals for all sessions (outer-joined
+    so sessions without violations are included), and verdicts are written
+    back with executemany UPDATEs of ``batch_size`` rows.
+
+    Returns:
+        Session count, verdict distribution and throughput.
+    """
+    started = time.perf_counter()
+    rows = (
+        db.query(
+            ExamSession.id,
+            SessionViolationCount.type,
+            SessionViolationCount.count,
+            SessionViolationCount.total_severity,
+            SessionViolationCount.first_at,
+            SessionViolationCount.last_at,
+        )
+        .outerjoin(SessionViolationCount, SessionViolationCount.session_id == ExamSession.id)
+        .filter(ExamSession.exam_id == exam_id, ExamSession.end_time.isnot(None))
+        .all()
+    )
+
+    by_session: Dict[int, list] = defaultdict(list)
+    for session_id, vtype, count, severity, first_at, last_at in rows:
+        counts = by_session[session_id]
+        if vtype is not None:
+            counts.append(SessionViolationCount(
+                type=vtype, count=count, total_severity=severity,
+                first_at=first_at, last_at=last_at,
+            ))
+
+    updates = []
+    verdicts: Counter = Counter()
+    for session_id, counts in by_session.items():
+        totals = summarize_counts(counts)
+        result = AnalysisResult(
+            verdict=verdict_for(totals["total_severity"]),
+            total_violations=totals["total_violations"],
+            total_severity=totals["total_severity"],
+            violation_types=list(totals["type_counts"]),
+            type_counts=totals["type_counts"],
+            first_violation_at=totals["first_violation_at"],
+            last_violation_at=totals["last_violation_at"],
         )
+        verdicts[result.verdict] += 1
+        updates.append({"id": session_id, "verdict": result.verdict, "ai_summary": summary_payload(result)})
+
+    for start in range(0, len(updates), batch_size):
+        db.execute(update(ExamSession), updates[start:start + batch_size])
+    db.commit()
+    # Dashboards refetch the exam instead of receiving one event per session
+    live_feed.publish(exam_id, {"type": "exam_reanalyzed", "exam_id": exam_id})
+
+    elapsed = time.perf_counter() - started
+    return {
+        "exam_id": exam_id,
+        "sessions": len(updates),
+        "verdicts": dict(verdicts),
+        "elapsed_s": round(elapsed, 3),
+        "sessions_per_sec": round(len(updates) / elapsed, 1) if elapsed > 0 else None,
+    }
@@ -0,0 +1,270 @@
+# app/services/analysis_jobs.py
+"""Durable queue and worker pool for post-exam session analysis."""
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, noload
+
+from app.db.database import SessionLocal
+from app.models.models import AnalysisJob, ExamSession
+from app.services.ai_analyzer import ExamAnalyzer
+from app.services.live_feed import live_feed
+
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "4"))
+ANALYSIS_POLL_INTERVAL = float(os.getenv("ANALYSIS_POLL_INTERVAL", "1"))
+ANALYSIS_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_MAX_ATTEMPTS", "5"))
+ANALYSIS_RETRY_BASE = float(os.getenv("ANALYSIS_RETRY_BASE", "2"))
+ANALYSIS_RETRY_MAX = float(os.getenv("ANALYSIS_RETRY_MAX", "300"))
+# Running jobs whose worker has been silent this long are claimed again
+ANALYSIS_LEASE_SECONDS = float(os.getenv("ANALYSIS_LEASE_SECONDS", "300"))
+
+
+def enqueue_analysis(db: Session, session_id: int) -> None:
+    """Queue (or re-queue) analysis for a session.
+
+    The job row is written in the caller's transaction, so it commits or
+    rolls back together with the session update that triggered it.
+    """
+    job = db.query(AnalysisJob).filter(AnalysisJob.session_id == session_id).first()
+    if job is None:
+        try:
+            with db.begin_nested():
+                db.add(AnalysisJob(session_id=session_id, run_after=datetime.now()))
+            return
+        except IntegrityError:
+            # Another request queued it first; fall through and reset that row
+            job = db.query(AnalysisJob).filter(AnalysisJob.session_id == session_id).one()
+    job.status = "pending"
+    job.attempts = 0
+    job.run_after = datetime.now()
+    job.locked_at = None
+    job.locked_by = None
+    job.last_error = None
+    job.finished_at = None
+
+
+def claim_jobs(db: Session, limit: int, worker_id: str) -> List[int]:
+    """Atomically claim up to ``limit`` due jobs and return their ids.
+
+    Uses ``FOR UPDATE SKIP LOCKED`` so several API processes or dedicated
+    workers can poll the same table without handing out a job twice.
+    """
+    now = datetime.now()
+    jobs = (
+        db.query(AnalysisJob)
+        .filter(or_(
+            and_(AnalysisJob.status == "pending", AnalysisJob.run_after <= now),
+            and_(
+                AnalysisJob.status == "running",
+                AnalysisJob.locked_at < now - timedelta(seconds=ANALYSIS_LEASE_SECONDS),
+            ),
+        ))
+        .order_by(AnalysisJob.run_after, AnalysisJob.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for job in jobs:
+        job.status = "running"
+        job.attempts += 1
+        job.locked_at = now
+        job.locked_by = worker_id
+    db.commit()
+    return [job.id for job in jobs]
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff in seconds after ``attempts`` failed runs."""
+    return min(ANALYSIS_RETRY_BASE * 2 ** max(attempts - 1, 0), ANALYSIS_RETRY_MAX)
+
+
+def run_job(job_id: int) -> bool:
+    """Run one claimed job with its own database session.
+
+    Returns True when the analysis completed.
+    """
+    db = SessionLocal()
+    try:
+        job = db.get(AnalysisJob, job_id)
+        if job is None or job.status != "running":
+            return False
+        try:
+            result = ExamAnalyzer(db, job.session_id).analyze()
+        except Exception as e:
+            db.rollback()
+            print(f"Analysis error for session {job.session_id}: {e}")
+            job = db.get(AnalysisJob, job_id)
+            job.last_error = str(e)[:2000]
+            job.locked_at = None
+            job.locked_by = None
+            if job.attempts >= ANALYSIS_MAX_ATTEMPTS:
+                job.status = "failed"
+                job.finished_at = datetime.now()
+                db.query(ExamSession).filter(ExamSession.id == job.session_id).update(
+                    {ExamSession.verdict: "error"}, synchronize_session=False
+                )
+            else:
+                job.status = "pending"
+                job.run_after = datetime.now() + timedelta(seconds=retry_delay(job.attempts))
+            db.commit()
+            if job.status == "failed":
+                _publish_session(db, job.session_id)
+            return False
+
+        job.status = "done"
+        job.finished_at = datetime.now()
+        job.locked_at = None
+        job.last_error = None
+        db.commit()
+        if result is not None:
+            _publish_session(db, job.session_id, {
+                "total_violations": result.total_violations,
+                "total_severity": result.total_severity,
+            })
+        return True
+    finally:
+        db.close()
+
+
+def _publish_session(db: Session, session_id: int, summary: Optional[Dict[str, Any]] = None) -> None:
+    try:
+        session = (
+            db.query(ExamSession)
+            .options(noload(ExamSession.violations))
+            .filter(ExamSession.id == session_id)
+            .first()
+        )
+        if session is not None:
+            live_feed.session_updated(session, summary)
+    except Exception as e:
+        print(f"Live feed publish failed: {e}")
+
+
+def queue_depth(db: Session) -> Dict[str, int]:
+    return {
+        status: count
+        for status, count in db.query(AnalysisJob.status, func.count(AnalysisJob.id))
+        .group_by(AnalysisJob.status)
+        .all()
+    }
+
+
+class AnalysisWorkerPool:
+    """Polls ``analysis_jobs`` and runs claimed jobs on a thread pool.
+
+    A dispatcher thread claims only as many jobs as there are idle workers,
+    so a burst of finished sessions is drained ``workers`` at a time and
+    unclaimed jobs stay available to other processes. ``notify`` wakes the
+    dispatcher immediately after a local enqueue.
+    """
+
+    def __init__(
+        self,
+        workers: int = ANALYSIS_WORKERS,
+        poll_interval: float = ANALYSIS_POLL_INTERVAL,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+
+    def start(self) -> None:
+        if self.workers <= 0 or self._dispatcher is not None:
+            return
+        self._stopping.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="analysis"
+        )
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="analysis-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+
+    def request_stop(self) -> None:
+        """Stop claiming new jobs; safe to call from a signal handler."""
+        self._stopping.set()
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stop claiming and wait for running jobs to finish."""
+        dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is None:
+            return
+        self.request_stop()
+        dispatcher.join()
+        executor, self._executor = self._executor, None
+        executor.shutdown(wait=True)
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def join(self) -> None:
+        """Block until the dispatcher exits (for the standalone worker)."""
+        dispatcher = self._dispatcher
+        if dispatcher is not None:
+            dispatcher.join()
+
+    def _dispatch(self) -> None:
+        while not self._stopping.is_set():
+            with self._lock:
+                free = self.workers - self._in_flight
+            claimed: List[int] = []
+            if free > 0:
+                db = SessionLocal()
+                try:
+                    claimed = claim_jobs(db, free, self.worker_id)
+                except Exception as e:
+                    db.rollback()
+                    print(f"Analysis job claim failed: {e}")
+                finally:
+                    db.close()
+            for job_id in claimed:
+                with self._lock:
+                    self._in_flight += 1
+                self._executor.submit(self._run, job_id)
+            # A full batch means more work is likely waiting; poll again at once
+            if claimed and len(claimed) == free:
+                continue
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _run(self, job_id: int) -> None:
+        ok = False
+        try:
+            ok = run_job(job_id)
+        except Exception as e:
+            print(f"Analysis job {job_id} crashed: {e}")
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+            self._wake.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._dispatcher is not None,
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed_runs": self._failed,
+        }
+
+
+analysis_pool = AnalysisWorkerPool()
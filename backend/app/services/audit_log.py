@@ -0,0 +1,208 @@
+# app/services/audit_log.py
+"""Batched, off-request-path writer for audit log events."""
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.models import AuditLog
+
+
+AUDIT_FLUSH_MAX_ROWS = int(os.getenv("AUDIT_FLUSH_MAX_ROWS", "500"))
+AUDIT_FLUSH_MAX_DELAY = float(os.getenv("AUDIT_FLUSH_MAX_DELAY_MS", "200")) / 1000
+# Events beyond this are dropped (and counted) rather than buffered without
+# bound or written on the caller's thread, which may be the event loop
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+# Write every event inline with its own commit (tests, scripts)
+AUDIT_SYNCHRONOUS = os.getenv("AUDIT_LOG_SYNC", "").lower() in ("1", "true", "yes")
+
+_STOP = object()
+
+
+class AuditLogWriter:
+    """Queue audit events and insert them in batches from a background thread.
+
+    ``record`` never touches the database on the hot path: the event is
+    timestamped and queued, and the writer thread inserts whatever has
+    accumulated with one multi-row INSERT and one commit. ``stop`` drains
+    the queue before returning, so nothing buffered is lost on a clean
+    shutdown.
+
+    Security-critical actions pass the caller's session instead; the row is
+    then added to that transaction and commits atomically with the change
+    it describes. Events are written inline only when the writer is not
+    running (CLI processes, ``AUDIT_LOG_SYNC``); when its queue is full they
+    are dropped and counted in ``overflow``, since ``record`` is called from
+    async handlers that must not block on the database.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_rows: int = AUDIT_FLUSH_MAX_ROWS,
+        max_delay: float = AUDIT_FLUSH_MAX_DELAY,
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        synchronous: bool = AUDIT_SYNCHRONOUS,
+    ):
+        self.session_factory = session_factory
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.synchronous = synchronous
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._flushes = 0
+        self._rows_written = 0
+        self._inline = 0
+        self._errors = 0
+        self._dropped = 0
+        self._overflow = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.synchronous or self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="audit-log", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write everything still queued, then stop the writer thread."""
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        # Events that raced the shutdown
+        self._drain()
+
+    def record(
+        self,
+        action: str,
+        user_id: Optional[int] = None,
+        details: Optional[Dict[str, Any]] = None,
+        db: Optional[Session] = None,
+    ) -> None:
+        """Log an event.
+
+        With ``db`` the row joins the caller's transaction (the caller
+        commits); otherwise it is queued for the next batch.
+        """
+        row = {
+            "user_id": user_id,
+            "action": action,
+            "details": details or {},
+            "created_at": datetime.now(),
+        }
+        if db is not None:
+            db.add(AuditLog(**row))
+            return
+        if self.running:
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                self._overflow += 1
+                if self._overflow == 1 or self._overflow % 1000 == 0:
+                    print(f"Audit log queue full, {self._overflow} event(s) dropped so far")
+            return
+        self._inline += 1
+        try:
+            self._write([row])
+        except Exception as e:
+            print(f"Audit log write failed: {e}")
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+        # Anything enqueued after the stop marker still gets written
+        self._drain()
+
+    def _drain(self) -> None:
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        for start in range(0, len(leftover), self.max_rows):
+            self._flush(leftover[start:start + self.max_rows])
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self._write(batch)
+        except Exception as e:
+            self._errors += 1
+            print(f"Audit log batch failed, retrying rows individually: {e}")
+            # One bad row (e.g. a user deleted meanwhile) must not lose the rest
+            for row in batch:
+                try:
+                    self._write([row])
+                except Exception as row_error:
+                    self._dropped += 1
+                    print(f"Audit log event dropped ({row['action']}): {row_error}")
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            db.execute(insert(AuditLog), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._flushes += 1
+        self._rows_written += len(rows)
+        self._last_flush_ms = elapsed_ms
+        self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "synchronous": self.synchronous,
+            "queue_depth": self._queue.qsize(),
+            "flushes": self._flushes,
+            "rows_written": self._rows_written,
+            "inline": self._inline,
+            "errors": self._errors,
+            "dropped": self._dropped,
+            "overflow": self._overflow,
+            "last_flush_ms": round(self._last_flush_ms, 2),
+            "max_flush_ms": round(self._max_flush_ms, 2),
+            "avg_batch_size": round(self._rows_written / self._flushes, 2) if self._flushes else 0.0,
+        }
+
+
+audit_log = AuditLogWriter()
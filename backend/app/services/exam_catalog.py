@@ -0,0 +1,197 @@
+# app/services/exam_catalog.py
+"""In-process cache of serialized exam listings with strong ETags."""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.models import Exam
+
+
+# Bounds staleness when another worker process changed an exam
+EXAM_CACHE_TTL = float(os.getenv("EXAM_CACHE_TTL", "60"))
+EXAM_CACHE_SIZE = int(os.getenv("EXAM_CACHE_SIZE", "1000"))
+
+
+def _question_count(dialect: str):
+    """SQL expression for the length of ``config.questions``, evaluated in the database."""
+    if dialect == "mysql":
+        count = func.json_length(Exam.config, "$.questions")
+    elif dialect == "sqlite":
+        count = func.json_array_length(Exam.config, "$.questions")
+    else:
+        count = func.json_array_length(Exam.config["questions"])
+    return func.coalesce(count, 0)
+
+
+def _iso(value: Optional[Any]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def exam_summaries(db: Session) -> List[Dict[str, Any]]:
+    """Exam list without question bodies; the JSON is inspected server-side."""
+    rows = db.query(
+        Exam.id,
+        Exam.title,
+        Exam.duration_minutes,
+        Exam.created_by_id,
+        Exam.created_at,
+        Exam.config["description"].as_string(),
+        _question_count(db.get_bind().dialect.name),
+    ).order_by(Exam.id).all()
+    return [
+        {
+            "id": exam_id,
+            "title": title,
+            "description": description or "",
+            "duration_minutes": duration or 60,
+            "created_by": created_by,
+            "created_at": _iso(created_at),
+            "question_count": int(count or 0),
+        }
+        for exam_id, title, duration, created_by, created_at, description, count in rows
+    ]
+
+
+def exam_detail(db: Session, exam_id: int, offset: int = 0, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """One exam with its questions, optionally a ``[offset, offset + limit)`` page of them."""
+    exam = db.query(Exam).filter(Exam.id == exam_id).first()
+    if exam is None:
+        return None
+    cfg = exam.config or {}
+    questions = cfg.get("questions", []) or []
+    end = len(questions) if limit is None else offset + limit
+    return {
+        "id": exam.id,
+        "title": exam.title,
+        "description": cfg.get("description", "") or "",
+        "duration_minutes": exam.duration_minutes or 60,
+        "created_by": exam.created_by_id,
+        "created_at": _iso(exam.created_at),
+        "question_count": len(questions),
+        "offset": offset,
+        "questions": questions[offset:end],
+    }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+class ExamCatalogCache:
+    """Serialized listing bodies keyed by (variant, exam version).
+
+    Writers call ``bump`` after committing an exam change, which makes every
+    cached body unreachable; the next read of a key rebuilds it once while
+    concurrent readers of that key wait for the result. Builds of different
+    keys run in parallel, so a slow full listing never holds up an
+    unrelated exam's detail. Bodies are stored as encoded JSON along
+    with a strong ETag derived from their bytes, so a hit costs neither a
+    query nor serialization, and identical data yields the same ETag in
+    every worker.
+    """
+
+    def __init__(self, ttl: float = EXAM_CACHE_TTL, maxsize: int = EXAM_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._version = 0
+        self._entries: "OrderedDict[Tuple[Hashable, int], Tuple[bytes, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Single-flight lock per cache key being built
+        self._building: Dict[Tuple[Hashable, int], threading.Lock] = {}
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> None:
+        """Invalidate all cached listings after an exam was created or changed."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def _lookup(self, key: Tuple[Hashable, int]) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            body, etag, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body, etag
+
+    def get(self, variant: Hashable, build: Callable[[], Any]) -> Tuple[bytes, str]:
+        """Cached ``(body, etag)`` for ``variant``, building it on a miss.
+
+        ``build`` may raise (e.g. HTTPException for a missing exam); nothing
+        is cached then.
+        """
+        key = (variant, self._version)
+        cached = self._lookup(key)
+        if cached is not None:
+            self._hits += 1
+            return cached
+
+        with self._lock:
+            build_lock = self._building.setdefault(key, threading.Lock())
+        with build_lock:
+            try:
+                cached = self._lookup(key)
+                if cached is not None:
+                    self._hits += 1
+                    return cached
+                self._misses += 1
+                body = json.dumps(build(), separators=(",", ":")).encode()
+                etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+                with self._lock:
+                    # A bump during the build leaves this under a stale version
+                    self._entries[key] = (body, etag, time.monotonic() + self.ttl)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                return body, etag
+            finally:
+                with self._lock:
+                    if self._building.get(key) is build_lock:
+                        del self._building[key]
+
+    def not_modified(self) -> None:
+        self._not_modified += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "version": self._version,
+            "entries": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "not_modified": self._not_modified,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+exam_catalog = ExamCatalogCache()
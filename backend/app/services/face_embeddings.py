@@ -0,0 +1,97 @@
+# app/services/face_embeddings.py
+"""Face embedding helpers for student identity verification."""
+import base64
+import hashlib
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from app.models.models import StudentProfile
+
+
+EMBEDDING_DIM = 128
+EMBEDDING_DTYPE = np.float32
+
+
+def bytes_to_image(image_data: bytes) -> np.ndarray:
+    """Decode encoded image bytes (JPEG/PNG/...) to an RGB numpy array."""
+    # Convert to numpy array
+    nparr = np.frombuffer(image_data, np.uint8)
+
+    # Decode image
+    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+    # Convert BGR to RGB for face_recognition
+    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    return image
+
+
+def base64_to_image(base64_str: str) -> np.ndarray:
+    """Convert base64 encoded image to numpy array."""
+    # Remove data URL prefix if present
+    if "," in base64_str:
+        base64_str = base64_str.split(",")[1]
+
+    return bytes_to_image(base64.b64decode(base64_str))
+
+
+def photo_fingerprint(photo: str) -> str:
+    """Stable hash of a stored photo, used to tie an embedding to its source."""
+    return hashlib.sha256(photo.encode("utf-8")).hexdigest()
+
+
+def profile_photo_ref(profile: StudentProfile) -> Optional[str]:
+    """The value identifying the profile's current photo.
+
+    Object names are unique per upload, so the storage path versions the
+    photo; legacy rows fall back to the inline base64 payload.
+    """
+    return profile.photo_path or profile.photo_base64
+
+
+def compute_embedding(image: np.ndarray) -> Optional[np.ndarray]:
+    """Return the 128-d encoding of the first face in ``image``, if any.
+
+    CPU-bound; API handlers should go through ``app.services.face_pool``.
+    """
+    # Imported lazily so only face pool workers load the dlib models
+    import face_recognition
+
+    faces = face_recognition.face_encodings(image)
+    if not faces:
+        return None
+    return np.asarray(faces[0], dtype=EMBEDDING_DTYPE)
+
+
+def encode_embedding(embedding: Optional[np.ndarray]) -> bytes:
+    """Serialize an embedding to float32 bytes (empty when no face was found)."""
+    if embedding is None:
+        return b""
+    return np.asarray(embedding, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def decode_embedding(data: Optional[bytes]) -> Optional[np.ndarray]:
+    """Inverse of ``encode_embedding``."""
+    if not data:
+        return None
+    return np.frombuffer(data, dtype=EMBEDDING_DTYPE)
+
+
+def has_current_embedding(profile: StudentProfile) -> bool:
+    """Whether the stored embedding was computed from the profile's current photo."""
+    ref = profile_photo_ref(profile)
+    return bool(ref) and (
+        profile.face_embedding is not None
+        and profile.face_embedding_photo_hash == photo_fingerprint(ref)
+    )
+
+
+def store_profile_embedding(profile: StudentProfile, embedding: Optional[np.ndarray]) -> None:
+    """Store the embedding of the profile's current photo.
+
+    The caller is responsible for committing.
+    """
+    profile.face_embedding = encode_embedding(embedding)
+    profile.face_embedding_photo_hash = photo_fingerprint(profile_photo_ref(profile))
@@ -0,0 +1,304 @@
+# app/services/face_index.py
+"""Roster-wide (1:N) face matching over all enrolled students' embeddings."""
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.models import StudentProfile
+from app.services.face_embeddings import EMBEDDING_DIM, EMBEDDING_DTYPE
+
+
+# Shared by all worker processes on the host; files are memory-mapped read-only.
+# Each host keeps its own copy; see FACE_INDEX_SYNC_INTERVAL.
+FACE_INDEX_DIR = os.getenv("FACE_INDEX_DIR", "/tmp/face_index")
+# How often a process checks for a newer index written by another process
+FACE_INDEX_REFRESH = float(os.getenv("FACE_INDEX_REFRESH", "5"))
+# How often a process compares the on-disk index with the database, so hosts
+# that did not receive a photo upload still rebuild; 0 disables the check
+FACE_INDEX_SYNC_INTERVAL = float(os.getenv("FACE_INDEX_SYNC_INTERVAL", "30"))
+# Debounce for rebuilds after profile photo changes
+FACE_INDEX_REBUILD_DELAY = float(os.getenv("FACE_INDEX_REBUILD_DELAY", "5"))
+# Same-person threshold used by the 1:1 verification
+FACE_MATCH_THRESHOLD = float(os.getenv("FACE_MATCH_THRESHOLD", "0.6"))
+# Stricter bound for claiming a frame is *another* enrolled student
+FACE_SUBSTITUTION_THRESHOLD = float(os.getenv("FACE_SUBSTITUTION_THRESHOLD", "0.5"))
+
+_MANIFEST = "current.json"
+_EMBEDDING_BYTES = EMBEDDING_DIM * np.dtype(EMBEDDING_DTYPE).itemsize
+
+
+class _Snapshot:
+    """One immutable index version: sorted student ids and their vectors."""
+
+    def __init__(self, version: str, ids: np.ndarray, vectors: np.ndarray):
+        self.version = version
+        self.ids = ids
+        self.vectors = vectors
+        # |x|^2 per row, so distances need only one matrix product per query batch
+        self.sq_norms = np.einsum("ij,ij->i", vectors, vectors)
+
+
+class FaceIndex:
+    """Float32 embedding matrix with vectorized nearest-neighbour search.
+
+    ``build`` writes the matrix and the matching student ids as ``.npy``
+    files under a fresh version and then atomically swaps a small manifest,
+    so readers never see a half-written index. Every process memory-maps
+    the current version read-only; the pages live once in the OS page cache
+    however many API workers search it.
+
+    Uploads only trigger a rebuild on the host that handled them, so the
+    manifest also records the database state the index was built from
+    (``source_version``: embedding count and latest profile update). Each
+    process re-checks it every ``FACE_INDEX_SYNC_INTERVAL`` and rebuilds
+    when the database has moved on, which brings other hosts up to date.
+    """
+
+    def __init__(self, directory: str = FACE_INDEX_DIR, refresh: float = FACE_INDEX_REFRESH):
+        self.directory = directory
+        self.refresh = refresh
+        self._snapshot: Optional[_Snapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._sync_timer: Optional[threading.Timer] = None
+        self._syncing = False
+        self._builds = 0
+        self._searches = 0
+        self._queries = 0
+        self._substitutions = 0
+        self._stale = 0
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def source_version(self, db: Session) -> str:
+        """Fingerprint of the stored embeddings the index is built from."""
+        count, updated = (
+            db.query(func.count(StudentProfile.student_id), func.max(StudentProfile.updated_at))
+            .filter(func.length(StudentProfile.face_embedding) == _EMBEDDING_BYTES)
+            .one()
+        )
+        return f"{count}:{updated.isoformat() if updated else ''}"
+
+    def build(self, db: Session) -> int:
+        """Rewrite the index from stored profile embeddings; returns the row count."""
+        # Read before the rows: a change landing in between leaves the
+        # recorded version behind, which the next sync check picks up
+        source = self.source_version(db)
+        rows = (
+            db.query(StudentProfile.student_id, StudentProfile.face_embedding)
+            .filter(func.length(StudentProfile.face_embedding) == _EMBEDDING_BYTES)
+            .order_by(StudentProfile.student_id)
+            .all()
+        )
+        ids = np.fromiter((student_id for student_id, _ in rows), dtype=np.int64, count=len(rows))
+        vectors = np.frombuffer(
+            b"".join(embedding for _, embedding in rows), dtype=EMBEDDING_DTYPE
+        ).reshape(-1, EMBEDDING_DIM)
+
+        os.makedirs(self.directory, exist_ok=True)
+        version = uuid4().hex
+        np.save(self._path(f"ids-{version}.npy"), ids)
+        np.save(self._path(f"vectors-{version}.npy"), vectors)
+        tmp = self._path(f"{_MANIFEST}.{version}")
+        with open(tmp, "w") as f:
+            json.dump({
+                "version": version,
+                "count": len(ids),
+                "dim": EMBEDDING_DIM,
+                "source_version": source,
+            }, f)
+        os.replace(tmp, self._path(_MANIFEST))
+        self._builds += 1
+        self._prune(keep=version)
+        with self._lock:
+            self._checked_at = 0.0
+        return len(ids)
+
+    def _prune(self, keep: str) -> None:
+        # Mapped files stay readable after unlink; the age check spares
+        # versions another process is still writing
+        cutoff = time.time() - 60
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy") and keep not in name:
+                try:
+                    if os.path.getmtime(self._path(name)) < cutoff:
+                        os.remove(self._path(name))
+                except OSError:
+                    pass
+
+    def ensure_built(self) -> None:
+        """Build the index in the background if no process has written one yet.
+
+        Also starts the periodic check against the database.
+        """
+        if not os.path.exists(self._path(_MANIFEST)):
+            self.schedule_rebuild()
+        with self._lock:
+            self._syncing = FACE_INDEX_SYNC_INTERVAL > 0
+        self._schedule_sync()
+
+    def _schedule_sync(self) -> None:
+        with self._lock:
+            if not self._syncing or self._sync_timer is not None:
+                return
+            self._sync_timer = threading.Timer(FACE_INDEX_SYNC_INTERVAL, self._sync)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+
+    def _manifest(self) -> Dict[str, Any]:
+        with open(self._path(_MANIFEST)) as f:
+            return json.load(f)
+
+    def is_stale(self, db: Session) -> bool:
+        """Whether the on-disk index was built from an older database state."""
+        try:
+            built_from = self._manifest().get("source_version")
+        except (OSError, ValueError):
+            return True
+        return built_from != self.source_version(db)
+
+    def _sync(self) -> None:
+        with self._lock:
+            self._sync_timer = None
+        db = SessionLocal()
+        try:
+            if self.is_stale(db):
+                self._stale += 1
+                self.schedule_rebuild()
+        except Exception as e:
+            print(f"Face index sync check failed: {e}")
+        finally:
+            db.close()
+        self._schedule_sync()
+
+    def schedule_rebuild(self) -> None:
+        """Rebuild shortly, coalescing bursts of profile photo changes."""
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(FACE_INDEX_REBUILD_DELAY, self._rebuild)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _rebuild(self) -> None:
+        with self._lock:
+            self._timer = None
+        db = SessionLocal()
+        try:
+            self.build(db)
+        except Exception as e:
+            print(f"Face index rebuild failed: {e}")
+        finally:
+            db.close()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._syncing = False
+            timers = [self._timer, self._sync_timer]
+            self._timer = self._sync_timer = None
+        for timer in timers:
+            if timer is not None:
+                timer.cancel()
+
+    def _current(self) -> Optional[_Snapshot]:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.refresh:
+                return self._snapshot
+            self._checked_at = now
+            try:
+                version = self._manifest()["version"]
+            except (OSError, ValueError, KeyError):
+                return self._snapshot
+            if self._snapshot is None or self._snapshot.version != version:
+                try:
+                    self._snapshot = _Snapshot(
+                        version,
+                        np.load(self._path(f"ids-{version}.npy"), mmap_mode="r"),
+                        np.load(self._path(f"vectors-{version}.npy"), mmap_mode="r"),
+                    )
+                except (OSError, ValueError) as e:
+                    print(f"Face index load failed: {e}")
+            return self._snapshot
+
+    def nearest(self, embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Closest enrolled student id and distance for each row of ``embeddings``.
+
+        Ids are -1 (distance inf) when the index is empty.
+        """
+        queries = np.asarray(embeddings, dtype=EMBEDDING_DTYPE).reshape(-1, EMBEDDING_DIM)
+        snapshot = self._current()
+        if snapshot is None or not len(snapshot.ids):
+            return np.full(len(queries), -1, dtype=np.int64), np.full(len(queries), np.inf)
+        self._searches += 1
+        self._queries += len(queries)
+        sq = snapshot.sq_norms[None, :] - 2 * queries @ snapshot.vectors.T
+        best = np.argmin(sq, axis=1)
+        rows = np.arange(len(queries))
+        q_norms = np.einsum("ij,ij->i", queries, queries)
+        distances = np.sqrt(np.maximum(sq[rows, best] + q_norms, 0))
+        return snapshot.ids[best], distances
+
+    def distances_to(self, student_ids: List[int], embeddings: np.ndarray) -> np.ndarray:
+        """Distance of each embedding to the given student's enrolled face (inf if none)."""
+        queries = np.asarray(embeddings, dtype=EMBEDDING_DTYPE).reshape(-1, EMBEDDING_DIM)
+        result = np.full(len(queries), np.inf)
+        snapshot = self._current()
+        if snapshot is None or not len(snapshot.ids):
+            return result
+        wanted = np.asarray(student_ids, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(snapshot.ids, wanted), len(snapshot.ids) - 1)
+        found = snapshot.ids[pos] == wanted
+        diffs = snapshot.vectors[pos[found]] - queries[found]
+        result[found] = np.sqrt(np.einsum("ij,ij->i", diffs, diffs))
+        return result
+
+    def find_substitutions(
+        self, student_ids: List[int], embeddings: np.ndarray
+    ) -> List[Optional[Tuple[int, float]]]:
+        """Flag faces that belong to a different enrolled student.
+
+        A face is flagged when it does not match the expected student but is
+        within ``FACE_SUBSTITUTION_THRESHOLD`` of someone else on the roster.
+        Returns ``(matched_student_id, distance)`` per flagged face, else None.
+        """
+        if not student_ids:
+            return []
+        matched, distances = self.nearest(embeddings)
+        expected = self.distances_to(student_ids, embeddings)
+        flagged = (
+            (matched != np.asarray(student_ids))
+            & (matched >= 0)
+            & (distances < FACE_SUBSTITUTION_THRESHOLD)
+            & (expected >= FACE_MATCH_THRESHOLD)
+        )
+        self._substitutions += int(flagged.sum())
+        return [
+            (int(matched[i]), float(distances[i])) if flagged[i] else None
+            for i in range(len(student_ids))
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "size": len(snapshot.ids) if snapshot else 0,
+            "builds": self._builds,
+            "searches": self._searches,
+            "queries": self._queries,
+            "substitutions": self._substitutions,
+            "stale_detected": self._stale,
+        }
+
+
+face_index = FaceIndex()
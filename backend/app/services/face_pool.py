@@ -0,0 +1,144 @@
+# app/services/face_pool.py
+"""Process pool for CPU-bound face recognition work."""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.services.face_embeddings import (
+    bytes_to_image, compute_embedding, decode_embedding, encode_embedding,
+)
+from app.services.frame_analysis import analyze_frames
+
+
+FACE_POOL_WORKERS = int(os.getenv("FACE_POOL_WORKERS", "2"))
+# Jobs allowed in flight (running + waiting) before new ones are rejected
+FACE_POOL_MAX_PENDING = int(os.getenv("FACE_POOL_MAX_PENDING", str(FACE_POOL_WORKERS * 4)))
+FACE_POOL_TIMEOUT = float(os.getenv("FACE_POOL_TIMEOUT", "15"))
+
+
+class FacePoolBusy(Exception):
+    """Raised when the pool queue is full."""
+
+
+class FacePoolTimeout(Exception):
+    """Raised when a job does not finish within the pool timeout."""
+
+
+def _init_worker() -> None:
+    # Importing face_recognition loads the dlib detector and encoder models;
+    # doing it here means each worker process pays that cost exactly once.
+    import face_recognition  # noqa: F401
+
+
+def _encode_photo(data: bytes) -> bytes:
+    return encode_embedding(compute_embedding(bytes_to_image(data)))
+
+
+class FacePool:
+    """Bounded front-end to a ProcessPoolExecutor running face_recognition.
+
+    Keeps dlib work off the API process's threadpool and event loop, uses
+    every configured core, and sheds load with ``FacePoolBusy`` instead of
+    letting requests pile up.
+    """
+
+    def __init__(
+        self,
+        workers: int = FACE_POOL_WORKERS,
+        max_pending: int = FACE_POOL_MAX_PENDING,
+        timeout: float = FACE_POOL_TIMEOUT,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        self.start()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise FacePoolBusy("Face recognition queue is full")
+            self._pending += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            future.cancel()
+            raise FacePoolTimeout("Face recognition timed out")
+
+    async def encode(self, data: bytes) -> Optional[np.ndarray]:
+        """Encode the first face in encoded image bytes without blocking the loop."""
+        return decode_embedding(await self._run(_encode_photo, data))
+
+    async def analyze_frames(self, frames: List[bytes]) -> List[Dict[str, Any]]:
+        """Face count / gaze results for a batch of encoded frames."""
+        return await self._run(analyze_frames, frames)
+
+    def encode_blocking(self, data: bytes) -> Optional[np.ndarray]:
+        """Same as ``encode`` for sync handlers (blocks the calling thread)."""
+        future = self._submit(_encode_photo, data)
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._timeouts += 1
+            future.cancel()
+            raise FacePoolTimeout("Face recognition timed out")
+        return decode_embedding(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._executor is not None,
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "timeout_s": self.timeout,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts,
+        }
+
+
+face_pool = FacePool()
@@ -0,0 +1,100 @@
+# app/services/frame_analysis.py
+"""Face count and head-pose heuristics for sampled webcam frames.
+
+Runs inside face pool worker processes; keep imports light at module level.
+"""
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+# Frames are downscaled so the longest side is at most this many pixels
+FRAME_MAX_SIDE = int(os.getenv("FRAME_MAX_SIDE", "320"))
+# Horizontal nose offset from the eye midpoint, in inter-ocular distances
+GAZE_YAW_LIMIT = float(os.getenv("GAZE_YAW_LIMIT", "0.35"))
+# Eye-line to nose-tip drop, in inter-ocular distances (outside = looking up/down)
+GAZE_PITCH_MIN = float(os.getenv("GAZE_PITCH_MIN", "0.25"))
+GAZE_PITCH_MAX = float(os.getenv("GAZE_PITCH_MAX", "1.0"))
+# Encode single faces so the roster index can spot substitutions
+FRAME_IDENTITY_CHECK = os.getenv("FRAME_IDENTITY_CHECK", "1") == "1"
+
+
+def _decode(data: bytes) -> Optional[np.ndarray]:
+    import cv2
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    height, width = image.shape[:2]
+    scale = FRAME_MAX_SIDE / max(height, width)
+    if scale < 1:
+        image = cv2.resize(
+            image, (max(1, int(width * scale)), max(1, int(height * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def head_pose(landmarks: Dict[str, List[tuple]]) -> Optional[Dict[str, float]]:
+    """Rough yaw/pitch ratios from 68-point landmarks.
+
+    Returns None when the needed landmark groups are missing.
+    """
+    try:
+        left = np.mean(landmarks["left_eye"], axis=0)
+        right = np.mean(landmarks["right_eye"], axis=0)
+        nose = np.mean(landmarks["nose_tip"], axis=0)
+    except (KeyError, ValueError):
+        return None
+    eye_distance = float(np.linalg.norm(right - left))
+    if eye_distance < 1:
+        return None
+    mid = (left + right) / 2
+    return {
+        "yaw": float((nose[0] - mid[0]) / eye_distance),
+        "pitch": float((nose[1] - mid[1]) / eye_distance),
+    }
+
+
+def analyze_frame(data: bytes) -> Dict[str, Any]:
+    """Face count, gaze flag and (for a single face) its embedding for one frame."""
+    import face_recognition
+
+    image = _decode(data)
+    if image is None:
+        return {"error": "decode"}
+    locations = face_recognition.face_locations(image, model="hog")
+    result: Dict[str, Any] = {"faces": len(locations), "gaze_away": False}
+    if len(locations) != 1:
+        return result
+
+    if FRAME_IDENTITY_CHECK:
+        encodings = face_recognition.face_encodings(image, known_face_locations=locations)
+        if encodings:
+            result["embedding"] = np.asarray(encodings[0], dtype=np.float32).tobytes()
+
+    landmarks = face_recognition.face_landmarks(image, face_locations=locations, model="large")
+    pose = head_pose(landmarks[0]) if landmarks else None
+    if pose is not None:
+        result.update(pose)
+        result["gaze_away"] = (
+            abs(pose["yaw"]) > GAZE_YAW_LIMIT
+            or not GAZE_PITCH_MIN <= pose["pitch"] <= GAZE_PITCH_MAX
+        )
+    return result
+
+
+def analyze_frames(frames: List[bytes]) -> List[Dict[str, Any]]:
+    """Analyze a batch of frames in one worker call.
+
+    Batching amortizes the inter-process round-trip; a frame that fails to
+    decode or analyze yields an ``error`` entry instead of failing the batch.
+    """
+    results = []
+    for data in frames:
+        try:
+            results.append(analyze_frame(data))
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
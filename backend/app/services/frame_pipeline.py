@@ -0,0 +1,241 @@
+# app/services/frame_pipeline.py
+"""Batched server-side analysis of sampled webcam frames."""
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from app.services.face_embeddings import decode_embedding
+from app.services.face_index import FACE_SUBSTITUTION_THRESHOLD, FaceIndex, face_index
+from app.services.face_pool import FacePool, FacePoolBusy, FacePoolTimeout, face_pool
+from app.services.violation_writer import violation_writer
+from app.services.violations import calculate_severity
+
+
+FRAME_BATCH_SIZE = int(os.getenv("FRAME_BATCH_SIZE", "16"))
+# Frames waiting longer than this are skipped; a newer one will follow
+FRAME_MAX_AGE = float(os.getenv("FRAME_MAX_AGE", "3"))
+FRAME_MAX_BYTES = int(os.getenv("FRAME_MAX_BYTES", str(512 * 1024)))
+# Batches in flight on the shared face pool; by default one worker is left
+# free so identity checks at exam start are not queued behind frame batches
+FRAME_MAX_BATCHES = int(os.getenv("FRAME_MAX_BATCHES", "0"))
+# Minimum seconds between two violations of the same type for one session
+FRAME_VIOLATION_COOLDOWN = float(os.getenv("FRAME_VIOLATION_COOLDOWN", "10"))
+
+_CONFIDENCE = {"face_missing": 0.9, "multiple_faces": 0.9, "gaze_away": 0.7}
+
+Frame = Tuple[int, int, bytes, datetime]  # session_id, student_id, data, captured_at
+
+
+def frame_violations(result: Dict[str, Any]) -> List[str]:
+    """Violation types implied by one frame's analysis result."""
+    if "error" in result:
+        return []
+    if result["faces"] == 0:
+        return ["face_missing"]
+    if result["faces"] > 1:
+        return ["multiple_faces"]
+    return ["gaze_away"] if result.get("gaze_away") else []
+
+
+def _substitution_confidence(distance: float) -> float:
+    return round(max(0.5, min(1.0, 1 - distance / FACE_SUBSTITUTION_THRESHOLD / 2)), 3)
+
+
+class FramePipeline:
+    """Collects frames from all sessions and analyzes them in batches.
+
+    Only the latest frame per session is kept: a new frame replaces one that
+    has not been picked up yet, and frames older than ``FRAME_MAX_AGE`` are
+    skipped at dispatch. Batches mix sessions and run on the face pool, with
+    at most ``max_batches`` in flight (fewer than the pool's workers), so
+    under load the pipeline sheds stale frames instead of building a
+    backlog or starving photo verification.
+    """
+
+    def __init__(
+        self,
+        pool: FacePool = face_pool,
+        index: FaceIndex = face_index,
+        batch_size: int = FRAME_BATCH_SIZE,
+        max_age: float = FRAME_MAX_AGE,
+        cooldown: float = FRAME_VIOLATION_COOLDOWN,
+        max_batches: int = FRAME_MAX_BATCHES,
+    ):
+        self.pool = pool
+        self.max_batches = max_batches or max(1, pool.workers - 1)
+        self.index = index
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.cooldown = cooldown
+        self._pending: Dict[int, Tuple[int, bytes, float, datetime]] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+        self._last_emitted: Dict[Tuple[int, str], float] = {}
+        self._received = 0
+        self._analyzed = 0
+        self._superseded = 0
+        self._stale = 0
+        self._rejected = 0
+        self._emitted = 0
+        self._write_errors = 0
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        self._pending.clear()
+
+    def submit(
+        self,
+        session_id: int,
+        student_id: int,
+        data: bytes,
+        captured_at: Optional[datetime] = None,
+    ) -> bool:
+        """Queue a frame; returns False when the pipeline is not running."""
+        if self._task is None:
+            return False
+        self._received += 1
+        if session_id in self._pending:
+            self._superseded += 1
+        self._pending[session_id] = (student_id, data, time.monotonic(), captured_at or datetime.now())
+        self._wake.set()
+        return True
+
+    def _take_batch(self) -> List[Frame]:
+        now = time.monotonic()
+        batch = []
+        for session_id in list(self._pending):
+            student_id, data, received, captured_at = self._pending.pop(session_id)
+            if now - received > self.max_age:
+                self._stale += 1
+                continue
+            batch.append((session_id, student_id, data, captured_at))
+            if len(batch) >= self.batch_size:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._pending and len(self._batches) < self.max_batches:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                task = asyncio.create_task(self._process(batch))
+                self._batches.add(task)
+                task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task: asyncio.Task) -> None:
+        self._batches.discard(task)
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _substitutions(
+        self, batch: List[Frame], results: List[Dict[str, Any]]
+    ) -> Dict[int, Tuple[int, float]]:
+        """Batch positions whose face matches a different enrolled student."""
+        positions = [i for i, result in enumerate(results) if result.get("embedding")]
+        if not positions:
+            return {}
+        student_ids = [batch[i][1] for i in positions]
+        embeddings = np.stack([decode_embedding(results[i]["embedding"]) for i in positions])
+        # One matrix product against the whole roster for the entire batch
+        matches = await run_in_threadpool(self.index.find_substitutions, student_ids, embeddings)
+        return {i: match for i, match in zip(positions, matches) if match is not None}
+
+    async def _process(self, batch: List[Frame]) -> None:
+        try:
+            results = await self.pool.analyze_frames([frame[2] for frame in batch])
+        except (FacePoolBusy, FacePoolTimeout):
+            # Newer frames for these sessions will arrive shortly
+            self._rejected += len(batch)
+            return
+        except Exception as e:
+            print(f"Frame analysis failed: {e}")
+            self._rejected += len(batch)
+            return
+
+        self._analyzed += len(batch)
+        try:
+            substitutions = await self._substitutions(batch, results)
+        except Exception as e:
+            print(f"Face index search failed: {e}")
+            substitutions = {}
+
+        rows = []
+        now = time.monotonic()
+        for i, ((session_id, _, _, captured_at), result) in enumerate(zip(batch, results)):
+            violations = frame_violations(result)
+            if i in substitutions:
+                violations.append("face_substitution")
+            for violation_type in violations:
+                key = (session_id, violation_type)
+                if now - self._last_emitted.get(key, float("-inf")) < self.cooldown:
+                    continue
+                self._last_emitted[key] = now
+                rows.append({
+                    "session_id": session_id,
+                    "type": violation_type,
+                    "timestamp": captured_at,
+                    "confidence": (
+                        _substitution_confidence(substitutions[i][1])
+                        if violation_type == "face_substitution"
+                        else _CONFIDENCE[violation_type]
+                    ),
+                    "severity_score": calculate_severity(violation_type),
+                })
+        if len(self._last_emitted) > 10_000:
+            self._last_emitted = {
+                key: at for key, at in self._last_emitted.items() if now - at < self.cooldown
+            }
+        if rows:
+            outcomes = await asyncio.gather(
+                *(violation_writer.submit(row) for row in rows), return_exceptions=True
+            )
+            failed = [o for o in outcomes if isinstance(o, BaseException)]
+            if failed:
+                self._write_errors += len(failed)
+                print(f"Frame violations not stored ({len(failed)} of {len(rows)}): {failed[0]}")
+                # Lift the cooldown so the next frame can report them again
+                for row, outcome in zip(rows, outcomes):
+                    key = (row["session_id"], row["type"])
+                    if isinstance(outcome, BaseException) and self._last_emitted.get(key) == now:
+                        del self._last_emitted[key]
+            self._emitted += len(rows) - len(failed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "pending": len(self._pending),
+            "batches_in_flight": len(self._batches),
+            "max_batches": self.max_batches,
+            "received": self._received,
+            "analyzed": self._analyzed,
+            "superseded": self._superseded,
+            "stale": self._stale,
+            "rejected": self._rejected,
+            "violations": self._emitted,
+            "write_errors": self._write_errors,
+        }
+
+
+frame_pipeline = FramePipeline()
@@ -0,0 +1,117 @@
+# app/services/live_feed.py
+"""Push feed of new violations and verdict changes for proctor dashboards."""
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import WebSocket
+from sqlalchemy.orm import Session
+
+from app.models.models import ExamSession
+from app.services.signaling import SignalingHub, create_broker
+
+
+LIVE_FEED_CHANNEL_PREFIX = os.getenv("LIVE_FEED_CHANNEL_PREFIX", "feed:")
+ALL_EXAMS = "all"
+# Sender id for server events; never matches a subscriber's peer id
+_SERVER = "server"
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _room(exam_id: Any) -> str:
+    return f"exam:{exam_id}"
+
+
+class LiveFeed:
+    """Per-exam fan-out built on the signaling hub and broker.
+
+    Subscribers join room ``exam:<id>`` (or ``exam:all``) as receive-only
+    peers, so they get the same bounded queues, pings and eviction as
+    signaling sockets, and events cross workers through the same broker.
+    Producers call ``publish`` from any thread after their transaction has
+    committed; events are dropped when the feed is not running (e.g. in CLI
+    processes).
+    """
+
+    def __init__(self, hub: SignalingHub):
+        self.hub = hub
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._events = 0
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        await self.hub.start()
+
+    async def stop(self) -> None:
+        self._loop = None
+        await self.hub.stop()
+
+    async def serve(self, websocket: WebSocket, exam_id: Optional[int] = None) -> None:
+        await self.hub.serve(_room(ALL_EXAMS if exam_id is None else exam_id), websocket, relay=False)
+
+    def publish(self, exam_id: Optional[int], event: Dict[str, Any]) -> None:
+        """Queue an event for the exam's room and the all-exams room."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        data = json.dumps(event)
+        rooms = [_room(ALL_EXAMS)] if exam_id is None else [_room(exam_id), _room(ALL_EXAMS)]
+        self._events += 1
+        for room in rooms:
+            asyncio.run_coroutine_threadsafe(self.hub.publish(room, _SERVER, data), loop)
+
+    def violations_committed(self, db: Session, rows: List[Dict[str, Any]], ids: List[int]) -> None:
+        """Publish freshly committed violation rows, one event per exam."""
+        if self._loop is None or not rows:
+            return
+        session_ids = {row["session_id"] for row in rows}
+        sessions = {
+            sid: (exam_id, student_id)
+            for sid, exam_id, student_id in db.query(
+                ExamSession.id, ExamSession.exam_id, ExamSession.student_id
+            ).filter(ExamSession.id.in_(session_ids)).all()
+        }
+        by_exam: Dict[Any, List[Dict[str, Any]]] = {}
+        for row, violation_id in zip(rows, ids):
+            exam_id, student_id = sessions.get(row["session_id"], (None, None))
+            by_exam.setdefault(exam_id, []).append({
+                "id": violation_id,
+                "session_id": row["session_id"],
+                "student_id": student_id,
+                "type": row["type"],
+                "timestamp": _iso(row.get("timestamp")),
+                "severity_score": row.get("severity_score"),
+                "confidence": row.get("confidence"),
+                "video_proof_url": row.get("video_proof_url"),
+                "video_duration": row.get("video_duration"),
+            })
+        for exam_id, items in by_exam.items():
+            self.publish(exam_id, {"type": "violations", "exam_id": exam_id, "items": items})
+
+    def session_updated(self, session: ExamSession, summary: Optional[Dict[str, Any]] = None) -> None:
+        """Publish a session's status/verdict after it changed."""
+        event = {
+            "type": "session",
+            "exam_id": session.exam_id,
+            "session_id": session.id,
+            "student_id": session.student_id,
+            "status": session.status,
+            "verdict": session.verdict,
+            "start_time": _iso(session.start_time),
+            "end_time": _iso(session.end_time),
+        }
+        if summary:
+            event["violations_count"] = summary.get("total_violations")
+            event["total_severity"] = summary.get("total_severity")
+        self.publish(session.exam_id, event)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"running": self._loop is not None, "events": self._events, **self.hub.stats()}
+
+
+live_feed = LiveFeed(SignalingHub(create_broker(prefix=LIVE_FEED_CHANNEL_PREFIX)))
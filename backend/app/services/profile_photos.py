@@ -0,0 +1,192 @@
+# app/services/profile_photos.py
+"""Student profile photo storage in MinIO with pre-generated thumbnails."""
+import base64
+import io
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
+
+import cv2
+import numpy as np
+from minio import Minio
+from sqlalchemy.orm import Session, undefer
+
+from app.core.config import settings
+from app.models.models import StudentProfile
+from app.services.face_embeddings import (
+    bytes_to_image, photo_fingerprint, profile_photo_ref,
+)
+from app.services.storage import build_public_url
+
+
+PHOTO_PREFIX = "profiles"
+THUMBNAIL_MAX_SIDE = 160
+THUMBNAIL_JPEG_QUALITY = 85
+
+
+def decode_photo(photo: str) -> bytes:
+    """Decode a base64 photo (optionally a data URL) to raw image bytes."""
+    if "," in photo:
+        photo = photo.split(",")[1]
+    return base64.b64decode(photo)
+
+
+def detect_image_type(data: bytes) -> Tuple[str, str]:
+    """Best-effort (MIME type, extension) detection for common image types."""
+    if data.startswith(b"\x89PNG"):
+        return "image/png", "png"
+    if data.startswith(b"GIF8"):
+        return "image/gif", "gif"
+    if data[8:12] == b"WEBP":
+        return "image/webp", "webp"
+    return "image/jpeg", "jpg"
+
+
+def make_thumbnail(image: np.ndarray) -> bytes:
+    """JPEG thumbnail of an RGB image, longest side THUMBNAIL_MAX_SIDE."""
+    height, width = image.shape[:2]
+    scale = THUMBNAIL_MAX_SIDE / max(height, width)
+    if scale < 1:
+        image = cv2.resize(
+            image, (max(1, int(width * scale)), max(1, int(height * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+    ok, encoded = cv2.imencode(
+        ".jpg",
+        cv2.cvtColor(image, cv2.COLOR_RGB2BGR),
+        [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_JPEG_QUALITY],
+    )
+    if not ok:
+        raise ValueError("Could not encode thumbnail")
+    return encoded.tobytes()
+
+
+def store_profile_photo(
+    client: Minio, student_id: int, data: bytes, image: np.ndarray
+) -> Tuple[str, str]:
+    """Upload the original photo and its thumbnail.
+
+    Returns:
+        (photo_path, thumbnail_path) object names.
+    """
+    content_type, ext = detect_image_type(data)
+    key = uuid4().hex
+    photo_path = f"{PHOTO_PREFIX}/{student_id}/{key}.{ext}"
+    thumbnail_path = f"{PHOTO_PREFIX}/{student_id}/{key}_thumb.jpg"
+    thumbnail = make_thumbnail(image)
+
+    client.put_object(
+        settings.MINIO_BUCKET, photo_path, io.BytesIO(data),
+        length=len(data), content_type=content_type,
+    )
+    client.put_object(
+        settings.MINIO_BUCKET, thumbnail_path, io.BytesIO(thumbnail),
+        length=len(thumbnail), content_type="image/jpeg",
+    )
+    return photo_path, thumbnail_path
+
+
+def remove_profile_photo(client: Minio, photo_path: Optional[str], thumbnail_path: Optional[str]) -> None:
+    """Best-effort removal of replaced photo objects."""
+    for object_name in (photo_path, thumbnail_path):
+        if not object_name:
+            continue
+        try:
+            client.remove_object(settings.MINIO_BUCKET, object_name)
+        except Exception as e:
+            print(f"Error removing {object_name}: {e}")
+
+
+def load_profile_photo(client: Minio, profile: StudentProfile) -> bytes:
+    """Raw bytes of the profile's current photo from MinIO or the legacy column."""
+    if profile.photo_path:
+        response = client.get_object(settings.MINIO_BUCKET, profile.photo_path)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+    return decode_photo(profile.photo_base64)
+
+
+def inline_data_url(photo: str) -> str:
+    """Data URL for a legacy inline base64 photo."""
+    if photo.startswith("data:"):
+        return photo
+    # Best-effort MIME detection for common image types
+    mime = "image/jpeg"
+    if photo.startswith("iVBOR"):
+        mime = "image/png"
+    elif photo.startswith("R0lG"):
+        mime = "image/gif"
+    return f"data:{mime};base64,{photo}"
+
+
+def photo_urls(profile: Optional[StudentProfile]) -> Dict[str, Optional[str]]:
+    """URLs for the profile photo and thumbnail.
+
+    Rows not yet migrated by ``migrate_inline_photos`` still return a data URL.
+    """
+    if profile is None:
+        return {"photo_url": None, "thumbnail_url": None}
+    if profile.photo_path:
+        return {
+            "photo_url": build_public_url(profile.photo_path),
+            "thumbnail_url": build_public_url(profile.thumbnail_path or profile.photo_path),
+        }
+    if isinstance(profile.photo_base64, str) and profile.photo_base64:
+        url = inline_data_url(profile.photo_base64)
+        return {"photo_url": url, "thumbnail_url": url}
+    return {"photo_url": None, "thumbnail_url": None}
+
+
+def migrate_inline_photos(db: Session, client: Minio, batch_size: int = 100) -> Dict[str, Any]:
+    """Move base64 photos from student_profiles into MinIO in batches.
+
+    Each batch is committed on its own, so the command can be interrupted and
+    re-run. Embeddings computed from the inline photo are kept.
+    """
+    migrated = 0
+    failed = 0
+    last_id = 0
+    while True:
+        profiles = (
+            db.query(StudentProfile)
+            .options(undefer(StudentProfile.photo_base64))
+            .filter(
+                StudentProfile.id > last_id,
+                StudentProfile.photo_base64.isnot(None),
+                StudentProfile.photo_path.is_(None),
+            )
+            .order_by(StudentProfile.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not profiles:
+            break
+
+        for profile in profiles:
+            last_id = profile.id
+            raw = profile.photo_base64
+            if not isinstance(raw, str) or not raw:
+                continue
+            try:
+                data = decode_photo(raw)
+                image = bytes_to_image(data)
+                photo_path, thumbnail_path = store_profile_photo(client, profile.student_id, data, image)
+            except Exception as e:
+                print(f"Error migrating photo for profile {profile.id}: {e}")
+                failed += 1
+                continue
+
+            embedding_current = profile.face_embedding_photo_hash == photo_fingerprint(raw)
+            profile.photo_path = photo_path
+            profile.thumbnail_path = thumbnail_path
+            profile.photo_base64 = None
+            if embedding_current:
+                profile.face_embedding_photo_hash = photo_fingerprint(profile_photo_ref(profile))
+            migrated += 1
+
+        db.commit()
+        db.expunge_all()
+
+    return {"migrated": migrated, "failed": failed}
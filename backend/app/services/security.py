@@ -0,0 +1,233 @@
+# app/services/security.py
+"""Password hashing and signed access tokens."""
+import asyncio
+import hmac
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import bcrypt
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+
+
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL_MINUTES", "30")) * 60
+# Tokens can be refreshed without a password until this long after login
+SESSION_MAX_AGE = int(os.getenv("AUTH_SESSION_MAX_HOURS", "12")) * 3600
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+# Hash/verify calls allowed to wait for a worker before logins are shed
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "64"))
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+# Seconds clients are told to wait when the pool sheds a request
+PASSWORD_RETRY_AFTER = int(os.getenv("PASSWORD_RETRY_AFTER", "1"))
+
+# bcrypt only looks at the first 72 bytes; newer releases reject longer input
+_BCRYPT_MAX_BYTES = 72
+
+if not JWT_SECRET_KEY:
+    print("JWT_SECRET_KEY is not set; using a random key (tokens won't survive restarts or cross workers)")
+    JWT_SECRET_KEY = secrets.token_urlsafe(32)
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+def password_pool_busy(detail: Any) -> HTTPException:
+    """503 for a request shed by ``password_pool``; clients retry after a pause."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": str(PASSWORD_RETRY_AFTER)},
+    )
+
+
+def _secret(password: str) -> bytes:
+    return password.encode("utf-8")[:_BCRYPT_MAX_BYTES]
+
+
+def is_password_hash(value: Optional[str]) -> bool:
+    return bool(value) and value.startswith(("$2a$", "$2b$", "$2y$"))
+
+
+def hash_password(password: str) -> str:
+    """bcrypt hash of ``password``. CPU-bound; async callers use ``password_pool``."""
+    return bcrypt.hashpw(_secret(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("ascii")
+
+
+def verify_password(password: str, stored: Optional[str]) -> bool:
+    """Check ``password`` against a bcrypt hash or a legacy plaintext value."""
+    if not stored:
+        return False
+    if not is_password_hash(stored):
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    try:
+        return bcrypt.checkpw(_secret(password), stored.encode("ascii"))
+    except ValueError:
+        return False
+
+
+def needs_rehash(stored: Optional[str]) -> bool:
+    """Whether a stored password should be replaced after a successful login."""
+    if not is_password_hash(stored):
+        return True
+    try:
+        return int(stored.split("$")[2]) < BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+# Verified against when the email is unknown, so both paths cost one bcrypt check
+_DUMMY_HASH = "$2b$12$s/9qU0P/YM/gxC8plcD0a.rB8Z6Spd3fwXLv/z2neV.NTrPNh4YFK"
+
+
+class PasswordPool:
+    """Bounded thread pool for bcrypt work.
+
+    bcrypt releases the GIL, so a few threads keep hashing off the event
+    loop and off the request threadpool. Calls beyond ``max_pending``
+    fail fast with ``PasswordPoolBusy`` instead of queueing without limit
+    during a login burst.
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_QUEUE,
+        timeout: float = PASSWORD_HASH_TIMEOUT,
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._max_pending = max_pending
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _submit(self, fn: Callable[..., Any], *args: Any, wait: bool = False) -> Future:
+        acquired = self._slots.acquire(timeout=self.timeout) if wait else self._slots.acquire(blocking=False)
+        if not acquired:
+            self._rejected += 1
+            raise PasswordPoolBusy("Too many concurrent password checks")
+        self._pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future) -> None:
+        self._pending -= 1
+        self._completed += 1
+        self._slots.release()
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wait_for(asyncio.wrap_future(self._submit(fn, *args)), self.timeout)
+
+    async def verify(self, password: str, stored: Optional[str]) -> bool:
+        return await self._run(verify_password, password, stored or _DUMMY_HASH)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    def hash_blocking(self, password: str) -> str:
+        """Hash from synchronous code (request threads, imports), waiting for a slot.
+
+        Raises ``PasswordPoolBusy`` when no slot frees up or the hash does not
+        finish within the timeout.
+        """
+        try:
+            return self._submit(hash_password, password, wait=True).result(self.timeout)
+        except FutureTimeoutError:
+            self._rejected += 1
+            raise PasswordPoolBusy("Password hashing timed out")
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self._max_pending,
+            "in_flight": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+
+password_pool = PasswordPool()
+
+
+def create_access_token(user_id: int, role: str, auth_time: Optional[int] = None) -> Dict[str, Any]:
+    """Signed token carrying the user id and role; ``auth_time`` is the login time."""
+    now = int(time.time())
+    claims = {
+        "sub": str(user_id),
+        "role": role,
+        "iat": now,
+        "exp": now + ACCESS_TOKEN_TTL,
+        "auth_time": auth_time or now,
+    }
+    return {
+        "access_token": jwt.encode(claims, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_TTL,
+    }
+
+
+@dataclass(frozen=True)
+class TokenUser:
+    """Identity taken from a verified token; no database row is loaded."""
+    id: int
+    role: str
+    auth_time: int
+
+
+def decode_access_token(token: str) -> TokenUser:
+    try:
+        claims = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        return TokenUser(
+            id=int(claims["sub"]),
+            role=str(claims["role"]),
+            auth_time=int(claims.get("auth_time") or claims["iat"]),
+        )
+    except (JWTError, KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> TokenUser:
+    """FastAPI dependency: the caller's identity, validated purely in memory."""
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return decode_access_token(credentials.credentials)
+
+
+def require_role(*roles: str) -> Callable[..., TokenUser]:
+    """Dependency factory allowing only the given roles, e.g. ``require_role("teacher", "admin")``."""
+    def dependency(user: TokenUser = Depends(get_current_user)) -> TokenUser:
+        if user.role not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
+        return user
+    return dependency
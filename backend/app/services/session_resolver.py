@@ -0,0 +1,161 @@
+# app/services/session_resolver.py
+"""Cached (student, exam) -> current exam session resolution."""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, case
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.models import Exam, ExamSession, User
+from app.services.live_feed import live_feed
+
+
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+# Bounds staleness when another worker starts a session for the same student
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "60"))
+_LOCK_STRIPES = 64
+
+Key = Tuple[int, Optional[int]]
+
+
+class SessionResolver:
+    """TTL/LRU map of (student_id, exam_id) to the student's current session.
+
+    Reports that carry only a student id resolve from memory. On a miss one
+    caller per key does the lookup (and, if needed, creates the session)
+    while concurrent callers for the same key wait and reuse its result.
+    Creation runs in its own transaction and locks the student's ``users``
+    row, so separate worker processes cannot create duplicate sessions
+    either. All of this blocks; async handlers call it via the threadpool.
+    """
+
+    def __init__(self, maxsize: int = SESSION_CACHE_SIZE, ttl: float = SESSION_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Key, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        self._hits = 0
+        self._misses = 0
+        self._created = 0
+
+    def _get(self, key: Key) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            session_id, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return session_id
+
+    def _put(self, key: Key, session_id: int) -> None:
+        with self._lock:
+            self._entries[key] = (session_id, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def resolve(self, db: Session, student_id: int, exam_id: Optional[int] = None) -> Optional[int]:
+        """Current session id for the student, creating one if none exists.
+
+        The active session wins; failing that, the most recent one, so reports
+        arriving after the exam was finished still land on it.
+        """
+        key = (student_id, exam_id)
+        session_id = self._get(key)
+        if session_id is not None:
+            self._hits += 1
+            return session_id
+
+        with self._stripes[hash(key) % _LOCK_STRIPES]:
+            # Another caller may have resolved it while we waited
+            session_id = self._get(key)
+            if session_id is not None:
+                self._hits += 1
+                return session_id
+            self._misses += 1
+            session_id = self._current(db, student_id, exam_id)
+            if session_id is None:
+                session_id = self._create(student_id, exam_id)
+            if session_id is not None:
+                self._put(key, session_id)
+            return session_id
+
+    def _current(self, db: Session, student_id: int, exam_id: Optional[int]) -> Optional[int]:
+        # Prefer the active session; otherwise a late report (one that arrives
+        # after the exam was finished) belongs to the latest session rather
+        # than to a new, never-finished one
+        query = db.query(ExamSession.id).filter(ExamSession.student_id == student_id)
+        if exam_id is not None:
+            query = query.filter(ExamSession.exam_id == exam_id)
+        row = (
+            query.order_by(
+                case((and_(ExamSession.status == "active", ExamSession.end_time.is_(None)), 0), else_=1),
+                ExamSession.start_time.desc(),
+                ExamSession.id.desc(),
+            )
+            .first()
+        )
+        return row[0] if row else None
+
+    def _create(self, student_id: int, exam_id: Optional[int]) -> Optional[int]:
+        # A separate session keeps the caller's pending work out of this
+        # commit. The users row lock serializes creation across processes;
+        # re-check under it in case another worker created the session first.
+        db = SessionLocal()
+        try:
+            db.query(User.id).filter(User.id == student_id).with_for_update().first()
+            session_id = self._current(db, student_id, exam_id)
+            if session_id is not None:
+                db.commit()
+                return session_id
+
+            exam = None
+            if exam_id is not None:
+                exam = db.query(Exam.id).filter(Exam.id == exam_id).first()
+            if not exam:
+                exam = db.query(Exam.id).order_by(Exam.id).first()
+            session = ExamSession(exam_id=exam.id if exam else None, student_id=student_id, status="active")
+            db.add(session)
+            db.commit()
+            # Load server defaults (start_time) while still attached; the
+            # live feed reads them after this session is closed
+            db.refresh(session)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        self._created += 1
+        live_feed.session_updated(session)
+        return session.id
+
+    def remember(self, student_id: int, exam_id: Optional[int], session_id: int) -> None:
+        """Record a newly started session as the student's current one."""
+        self._put((student_id, exam_id), session_id)
+        self._put((student_id, None), session_id)
+
+    def invalidate(self, student_id: int, exam_id: Optional[int] = None) -> None:
+        with self._lock:
+            self._entries.pop((student_id, exam_id), None)
+            self._entries.pop((student_id, None), None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "created": self._created,
+        }
+
+
+session_resolver = SessionResolver()
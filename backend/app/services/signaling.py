@@ -0,0 +1,372 @@
+# app/services/signaling.py
+"""WebRTC signaling fan-out across workers via a pluggable broker."""
+import asyncio
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.core.config import settings
+
+
+# "memory" keeps rooms inside one process; "redis" fans out across workers/nodes
+SIGNALING_BROKER = os.getenv("SIGNALING_BROKER", "memory")
+SIGNALING_CHANNEL_PREFIX = os.getenv("SIGNALING_CHANNEL_PREFIX", "signal:")
+# Outbound messages buffered per socket before it is treated as stuck
+SIGNALING_SEND_QUEUE = int(os.getenv("SIGNALING_SEND_QUEUE", "64"))
+SIGNALING_SEND_TIMEOUT = float(os.getenv("SIGNALING_SEND_TIMEOUT", "5"))
+SIGNALING_PING_INTERVAL = float(os.getenv("SIGNALING_PING_INTERVAL", "20"))
+SIGNALING_IDLE_TIMEOUT = float(os.getenv("SIGNALING_IDLE_TIMEOUT", "60"))
+# SDP offers are a few KB; anything far larger is not signaling
+SIGNALING_MAX_MESSAGE_BYTES = int(os.getenv("SIGNALING_MAX_MESSAGE_BYTES", str(64 * 1024)))
+
+PING_MESSAGE = '{"type":"ping"}'
+PONG_MESSAGE = '{"type":"pong"}'
+
+CLOSE_NORMAL = 1000
+CLOSE_GOING_AWAY = 1001
+CLOSE_POLICY_VIOLATION = 1008
+CLOSE_MESSAGE_TOO_BIG = 1009
+
+Handler = Callable[[str], Awaitable[None]]
+
+
+class Broker:
+    """Room-level publish/subscribe used by ``SignalingHub``.
+
+    Each process subscribes at most once per room; the hub fans messages
+    out to its local sockets.
+    """
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def subscribe(self, room_id: str, handler: Handler) -> None:
+        raise NotImplementedError
+
+    async def unsubscribe(self, room_id: str, handler: Handler) -> None:
+        raise NotImplementedError
+
+    async def publish(self, room_id: str, message: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryBroker(Broker):
+    """Single-process broker.
+
+    Several hubs may share one instance, which stands in for a pub/sub
+    server when exercising multi-worker fan-out locally.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: Dict[str, List[Handler]] = {}
+
+    async def subscribe(self, room_id: str, handler: Handler) -> None:
+        self._handlers.setdefault(room_id, []).append(handler)
+
+    async def unsubscribe(self, room_id: str, handler: Handler) -> None:
+        handlers = self._handlers.get(room_id, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if not handlers:
+            self._handlers.pop(room_id, None)
+
+    async def publish(self, room_id: str, message: str) -> None:
+        for handler in list(self._handlers.get(room_id, [])):
+            await handler(message)
+
+
+class RedisBroker(Broker):
+    """Redis pub/sub broker: one channel per room, one reader task per process."""
+
+    def __init__(self, url: str, prefix: str = SIGNALING_CHANNEL_PREFIX):
+        self.url = url
+        self.prefix = prefix
+        self._redis = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._handlers: Dict[str, Handler] = {}
+        self._closing = False
+
+    async def start(self) -> None:
+        import redis.asyncio as redis
+
+        if self._redis is not None:
+            return
+        self._closing = False
+        self._redis = redis.from_url(self.url, decode_responses=True)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._reader = asyncio.create_task(self._read())
+
+    async def stop(self) -> None:
+        reader, self._reader = self._reader, None
+        if reader is not None:
+            self._closing = True
+            reader.cancel()
+            try:
+                await reader
+            except asyncio.CancelledError:
+                pass
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        self._handlers.clear()
+
+    async def subscribe(self, room_id: str, handler: Handler) -> None:
+        channel = self.prefix + room_id
+        self._handlers[channel] = handler
+        await self._pubsub.subscribe(channel)
+
+    async def unsubscribe(self, room_id: str, handler: Handler) -> None:
+        channel = self.prefix + room_id
+        if self._handlers.get(channel) is handler:
+            del self._handlers[channel]
+            await self._pubsub.unsubscribe(channel)
+
+    async def publish(self, room_id: str, message: str) -> None:
+        await self._redis.publish(self.prefix + room_id, message)
+
+    async def _read(self) -> None:
+        # redis-py may surface a cancelled read as a connection error, so the
+        # loop also checks the closing flag rather than relying on CancelledError
+        while not self._closing:
+            try:
+                if not self._pubsub.subscribed:
+                    await asyncio.sleep(0.05)
+                    continue
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message is None or message.get("type") != "message":
+                    continue
+                handler = self._handlers.get(message["channel"])
+                if handler is not None:
+                    await handler(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self._closing:
+                    break
+                print(f"Signaling broker read error: {e}")
+                await asyncio.sleep(1)
+
+
+class Peer:
+    """One signaling socket with a bounded outbound queue and sender task.
+
+    Fan-out only enqueues, so a slow browser can never stall the room; when
+    its queue overflows or a send exceeds ``SIGNALING_SEND_TIMEOUT`` the
+    peer is evicted. The sender also emits a ping every
+    ``SIGNALING_PING_INTERVAL``, whatever else it is sending.
+    """
+
+    def __init__(self, hub: "SignalingHub", websocket: WebSocket):
+        self.id = uuid4().hex
+        self.hub = hub
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SIGNALING_SEND_QUEUE)
+        self.closed = asyncio.Event()
+        self._sender = asyncio.create_task(self._send_loop())
+        self._closer: Optional[asyncio.Task] = None
+        self.close_code: Optional[int] = None
+
+    def offer(self, data: str) -> bool:
+        """Queue a message without waiting; evicts the peer when full."""
+        if self.closed.is_set():
+            return False
+        try:
+            self.queue.put_nowait(data)
+            return True
+        except asyncio.QueueFull:
+            self.hub._dropped += 1
+            self.evict("slow", CLOSE_POLICY_VIOLATION)
+            return False
+
+    def evict(self, reason: str, code: int) -> None:
+        if self.closed.is_set():
+            return
+        self.hub._evicted[reason] = self.hub._evicted.get(reason, 0) + 1
+        self.hub._dropped += self.queue.qsize()
+        self.close_code = code
+        self._closer = asyncio.create_task(self.close())
+
+    async def close(self, code: Optional[int] = None) -> None:
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        code = code or self.close_code or CLOSE_NORMAL
+        if self._sender is not asyncio.current_task():
+            self._sender.cancel()
+        try:
+            await asyncio.wait_for(self.websocket.close(code), SIGNALING_SEND_TIMEOUT)
+        except Exception:
+            pass
+
+    async def _send_loop(self) -> None:
+        # Pings run on a wall-clock schedule, not only when the queue is idle:
+        # a peer that only receives answers them with the pong that keeps it
+        # inside SIGNALING_IDLE_TIMEOUT, however busy its outbound traffic is.
+        loop = asyncio.get_running_loop()
+        next_ping = loop.time() + SIGNALING_PING_INTERVAL
+        while not self.closed.is_set():
+            ping = False
+            delay = next_ping - loop.time()
+            if delay <= 0:
+                data, ping = PING_MESSAGE, True
+                next_ping = loop.time() + SIGNALING_PING_INTERVAL
+            else:
+                try:
+                    data = await asyncio.wait_for(self.queue.get(), delay)
+                except asyncio.TimeoutError:
+                    continue
+            try:
+                await asyncio.wait_for(self.websocket.send_text(data), SIGNALING_SEND_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                self.evict("send_timeout", CLOSE_POLICY_VIOLATION)
+                return
+            except Exception:
+                self.evict("send_error", CLOSE_NORMAL)
+                return
+            if not ping:
+                self.hub._delivered += 1
+
+
+class SignalingHub:
+    """Local WebSocket membership per room, relayed through a ``Broker``.
+
+    Every message is published to the broker tagged with the sender's
+    connection id; each process delivers it to its own sockets in the room
+    except the sender, so peers connected to different workers see each
+    other exactly as if they shared one process.
+    """
+
+    def __init__(self, broker: Broker):
+        self.broker = broker
+        self._rooms: Dict[str, Dict[str, Peer]] = {}
+        self._handlers: Dict[str, Handler] = {}
+        self._lock = asyncio.Lock()
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._evicted: Dict[str, int] = {}
+
+    async def start(self) -> None:
+        await self.broker.start()
+
+    async def stop(self) -> None:
+        peers = [peer for room in self._rooms.values() for peer in room.values()]
+        await asyncio.gather(*(peer.close(CLOSE_GOING_AWAY) for peer in peers))
+        await self.broker.stop()
+        self._rooms.clear()
+        self._handlers.clear()
+
+    async def serve(self, room_id: str, websocket: WebSocket, relay: bool = True) -> None:
+        """Relay one accepted socket until it disconnects or is evicted.
+
+        Peers that stay silent for ``SIGNALING_IDLE_TIMEOUT`` (clients answer
+        pings with a pong) or send frames over ``SIGNALING_MAX_MESSAGE_BYTES``
+        are closed. With ``relay=False`` the socket only receives.
+        """
+        peer = await self.join(room_id, websocket)
+        closed = asyncio.create_task(peer.closed.wait())
+        try:
+            while True:
+                receive = asyncio.create_task(websocket.receive_text())
+                done, _ = await asyncio.wait(
+                    {receive, closed},
+                    timeout=SIGNALING_IDLE_TIMEOUT,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if receive not in done:
+                    receive.cancel()
+                    if closed not in done:
+                        peer.evict("idle", CLOSE_POLICY_VIOLATION)
+                    break
+                data = receive.result()
+                if len(data) > SIGNALING_MAX_MESSAGE_BYTES:
+                    peer.evict("oversize", CLOSE_MESSAGE_TOO_BIG)
+                    break
+                if data == PONG_MESSAGE or not relay:
+                    continue
+                await self.publish(room_id, peer.id, data)
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            print(f"Signaling connection error in room {room_id}: {e}")
+        finally:
+            closed.cancel()
+            await self.leave(room_id, peer)
+            await peer.close()
+
+    async def join(self, room_id: str, websocket: WebSocket) -> Peer:
+        peer = Peer(self, websocket)
+        async with self._lock:
+            room = self._rooms.get(room_id)
+            if room is None:
+                room = self._rooms[room_id] = {}
+                handler = self._make_handler(room_id)
+                self._handlers[room_id] = handler
+                await self.broker.subscribe(room_id, handler)
+            room[peer.id] = peer
+        return peer
+
+    async def leave(self, room_id: str, peer: Peer) -> None:
+        async with self._lock:
+            room = self._rooms.get(room_id)
+            if room is None:
+                return
+            room.pop(peer.id, None)
+            if not room:
+                del self._rooms[room_id]
+                await self.broker.unsubscribe(room_id, self._handlers.pop(room_id))
+
+    async def publish(self, room_id: str, conn_id: str, data: str) -> None:
+        self._published += 1
+        await self.broker.publish(room_id, json.dumps({"from": conn_id, "data": data}))
+
+    def _make_handler(self, room_id: str) -> Handler:
+        async def handle(message: str) -> None:
+            self._deliver(room_id, message)
+        return handle
+
+    def _deliver(self, room_id: str, message: str) -> None:
+        try:
+            envelope = json.loads(message)
+            sender, data = envelope["from"], envelope["data"]
+        except (ValueError, KeyError, TypeError):
+            return
+        for conn_id, peer in list(self._rooms.get(room_id, {}).items()):
+            if conn_id != sender:
+                peer.offer(data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rooms": len(self._rooms),
+            "connections": sum(len(room) for room in self._rooms.values()),
+            "queued": sum(peer.queue.qsize() for room in self._rooms.values() for peer in room.values()),
+            "published": self._published,
+            "delivered": self._delivered,
+            "dropped": self._dropped,
+            "evicted": dict(self._evicted),
+        }
+
+
+def create_broker(kind: str = SIGNALING_BROKER, prefix: str = SIGNALING_CHANNEL_PREFIX) -> Broker:
+    if kind == "redis":
+        return RedisBroker(settings.REDIS_URL, prefix=prefix)
+    if kind == "memory":
+        return InMemoryBroker()
+    raise ValueError(f"Unknown signaling broker: {kind}")
+
+
+signaling_hub = SignalingHub(create_broker())
@@ -0,0 +1,121 @@
+# app/services/storage.py
+"""MinIO object storage helpers."""
+import os
+import threading
+from datetime import timedelta
+from typing import Optional, Set
+from urllib.parse import urlparse
+
+import urllib3
+from minio import Minio
+
+from app.core.config import settings
+
+
+# Connections kept per MinIO host; sized for concurrent uploads across the threadpool
+MINIO_POOL_SIZE = int(os.getenv("MINIO_POOL_SIZE", "32"))
+MINIO_CONNECT_TIMEOUT = float(os.getenv("MINIO_CONNECT_TIMEOUT", "5"))
+MINIO_READ_TIMEOUT = float(os.getenv("MINIO_READ_TIMEOUT", "60"))
+MINIO_REGION = os.getenv("MINIO_REGION", "us-east-1")
+
+_client: Optional[Minio] = None
+_http_client: Optional[urllib3.PoolManager] = None
+_client_lock = threading.Lock()
+_known_buckets: Set[str] = set()
+_public_client: Optional[Minio] = None
+
+
+def _create_client() -> Minio:
+    global _http_client
+    _http_client = urllib3.PoolManager(
+        maxsize=MINIO_POOL_SIZE,
+        block=False,
+        timeout=urllib3.Timeout(connect=MINIO_CONNECT_TIMEOUT, read=MINIO_READ_TIMEOUT),
+        retries=urllib3.Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+        ),
+    )
+    return Minio(
+        settings.MINIO_ENDPOINT,
+        access_key=settings.MINIO_ACCESS_KEY,
+        secret_key=settings.MINIO_SECRET_KEY,
+        secure=settings.MINIO_SECURE,
+        http_client=_http_client,
+    )
+
+
+def get_minio_client() -> Minio:
+    """Process-wide MinIO client sharing one urllib3 connection pool.
+
+    The client is blocking; call it from sync handlers or via
+    ``run_in_threadpool`` from async ones.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _create_client()
+    return _client
+
+
+def ensure_bucket(client: Minio, bucket: str) -> None:
+    """Create ``bucket`` if missing; checked once per process."""
+    if bucket in _known_buckets:
+        return
+    found = client.bucket_exists(bucket)
+    if not found:
+        client.make_bucket(bucket)
+    _known_buckets.add(bucket)
+
+
+def init_storage() -> None:
+    """Create the shared client and verify the bucket at startup.
+
+    Failures are logged rather than raised so the API can start while MinIO
+    is unavailable; the bucket check is then retried on first use.
+    """
+    try:
+        ensure_bucket(get_minio_client(), settings.MINIO_BUCKET)
+    except Exception as e:
+        print(f"MinIO bucket check failed at startup: {e}")
+
+
+def presigned_get_url(object_name: str, expires: timedelta = timedelta(hours=1)) -> str:
+    """Presigned GET URL that browsers can fetch directly.
+
+    Signed against MINIO_PUBLIC_URL when set, since the signature covers the
+    host the browser will use. The region is fixed so signing needs no
+    network round-trip.
+    """
+    global _public_client
+    if _public_client is None:
+        if settings.MINIO_PUBLIC_URL:
+            public = urlparse(settings.MINIO_PUBLIC_URL)
+            endpoint, secure = public.netloc, public.scheme == "https"
+        else:
+            endpoint, secure = settings.MINIO_ENDPOINT, settings.MINIO_SECURE
+        _public_client = Minio(
+            endpoint,
+            access_key=settings.MINIO_ACCESS_KEY,
+            secret_key=settings.MINIO_SECRET_KEY,
+            secure=secure,
+            region=MINIO_REGION,
+        )
+    return _public_client.presigned_get_object(settings.MINIO_BUCKET, object_name, expires=expires)
+
+
+def close_storage() -> None:
+    global _client, _http_client, _public_client
+    with _client_lock:
+        http_client, _client, _http_client = _http_client, None, None
+        _public_client = None
+    _known_buckets.clear()
+    if http_client is not None:
+        http_client.clear()
+
+
+def build_public_url(object_name: str) -> str:
+    if settings.MINIO_PUBLIC_URL:
+        return f"{settings.MINIO_PUBLIC_URL.rstrip('/')}/{settings.MINIO_BUCKET}/{object_name}"
+    scheme = "https" if settings.MINIO_SECURE else "http"
+    return f"{scheme}://{settings.MINIO_ENDPOINT}/{settings.MINIO_BUCKET}/{object_name}"
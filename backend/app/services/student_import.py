@@ -0,0 +1,222 @@
+# app/services/student_import.py
+"""Chunked bulk import of student accounts from JSON, CSV or NDJSON."""
+import codecs
+import csv
+import json
+import os
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.models import User, UserRole
+from app.services.security import PASSWORD_RETRY_AFTER, PasswordPoolBusy, password_pool
+
+
+STUDENT_IMPORT_CHUNK = int(os.getenv("STUDENT_IMPORT_CHUNK", "1000"))
+DEFAULT_PASSWORD = "demo_password"
+_EMAIL_MAX = User.__table__.c.email.type.length
+_MAX_ERROR_SAMPLES = 50
+
+# (line number, parsed record or None, parse error or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def read_csv(stream: BinaryIO) -> Iterator[Record]:
+    """Records from a CSV upload with a header row (email, full_name|name, password)."""
+    reader = csv.DictReader(codecs.getreader("utf-8-sig")(stream))
+    for record in reader:
+        yield reader.line_num, record, None
+
+
+def read_ndjson(stream: BinaryIO) -> Iterator[Record]:
+    """Records from a newline-delimited JSON upload, one object per line."""
+    for line_num, raw in enumerate(codecs.getreader("utf-8-sig")(stream), start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            yield line_num, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_num, None, "expected a JSON object"
+            continue
+        yield line_num, record, None
+
+
+READERS: Dict[str, Callable[[BinaryIO], Iterator[Record]]] = {
+    "csv": read_csv,
+    "ndjson": read_ndjson,
+}
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    name = (filename or "").lower()
+    kind = (content_type or "").lower()
+    if name.endswith(".csv") or "csv" in kind:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in kind or "jsonlines" in kind:
+        return "ndjson"
+    return None
+
+
+def _email(record: Dict[str, Any]) -> str:
+    return str(record.get("email") or "").strip()
+
+
+def _student_row(record: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    email = _email(record)
+    if not email:
+        return None, "missing email"
+    if "@" not in email or len(email) > _EMAIL_MAX:
+        return None, "invalid email"
+    return {
+        "email": email,
+        "full_name": (record.get("full_name") or record.get("name") or None),
+        "password": str(record.get("password") or DEFAULT_PASSWORD),
+        "role": UserRole.STUDENT,
+        "is_active": True,
+    }, None
+
+
+def insert_students(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Multi-row INSERT that leaves rows with an existing email untouched."""
+    table = User.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as upsert
+
+        # No-op update: a concurrent import that won the race keeps its row
+        stmt = upsert(table).values(rows).on_duplicate_key_update(id=table.c.id)
+    elif dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+
+        stmt = upsert(table).values(rows).on_conflict_do_nothing(index_elements=[table.c.email])
+    else:
+        stmt = table.insert().values(rows)
+    db.execute(stmt)
+
+
+class StudentImport:
+    """Running totals for one import, fed one chunk at a time.
+
+    Each chunk costs one ``IN`` query for existing emails, one multi-row
+    INSERT and one commit, so a failure only loses the current chunk and
+    the transaction never spans the whole registry. Passwords are bcrypt
+    hashed only for new accounts, once per distinct password per import
+    (registries mostly share a default password).
+    """
+
+    def __init__(self, db: Session, hash_password: Callable[[str], str] = password_pool.hash_blocking):
+        self.db = db
+        self.hash_password = hash_password
+        self._hashes: Dict[str, str] = {}
+        self.processed = 0
+        self.created = 0
+        self.skipped = 0
+        self.errors = 0
+        self.error_samples: List[Dict[str, Any]] = []
+
+    def _error(self, line: int, message: str) -> None:
+        self.errors += 1
+        if len(self.error_samples) < _MAX_ERROR_SAMPLES:
+            self.error_samples.append({"line": line, "error": message})
+
+    def add_chunk(self, records: List[Record]) -> None:
+        self.processed += len(records)
+        rows: Dict[str, Dict[str, Any]] = {}
+        # Lines of valid records; counted as created/skipped only once the chunk commits
+        accepted: List[int] = []
+        for line, record, error in records:
+            if record is not None:
+                row, error = _student_row(record)
+            if error:
+                self._error(line, error)
+                continue
+            accepted.append(line)
+            rows.setdefault(row["email"], row)
+        if not rows:
+            return
+
+        try:
+            existing = {
+                email for (email,) in
+                self.db.query(User.email).filter(User.email.in_(list(rows))).all()
+            }
+            new_rows = [row for email, row in rows.items() if email not in existing]
+            for row in new_rows:
+                password = row.pop("password")
+                if password not in self._hashes:
+                    self._hashes[password] = self.hash_password(password)
+                row["hashed_password"] = self._hashes[password]
+            if new_rows:
+                insert_students(self.db, new_rows)
+            self.db.commit()
+        except PasswordPoolBusy:
+            # Nothing wrong with these rows; the caller stops and retries later
+            self.db.rollback()
+            self.processed -= len(records)
+            raise
+        except Exception as e:
+            self.db.rollback()
+            for line in accepted:
+                self._error(line, f"chunk failed: {e}")
+            return
+        self.created += len(new_rows)
+        # Existing accounts and repeats of an email within the chunk
+        self.skipped += len(accepted) - len(new_rows)
+
+    def progress(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "skipped": self.skipped,
+            "errors": self.errors,
+        }
+
+    def result(self) -> Dict[str, Any]:
+        return {**self.progress(), "error_samples": self.error_samples}
+
+
+def _chunks(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    chunk: List[Record] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_records(
+    db: Session, records: Iterable[Record], chunk_size: int = STUDENT_IMPORT_CHUNK
+) -> Iterator[Dict[str, Any]]:
+    """Import records chunk by chunk, yielding progress after each commit.
+
+    The last event has ``"type": "done"`` and carries the final counts, or
+    ``"type": "error"`` when the import stopped early; with ``retry_after``
+    set the password pool was saturated and the whole import can be re-sent.
+    """
+    state = StudentImport(db)
+    try:
+        for chunk in _chunks(records, chunk_size):
+            state.add_chunk(chunk)
+            yield {"type": "progress", **state.progress()}
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Chunks committed so far stay imported
+        yield {"type": "error", "error": f"unreadable upload: {e}", **state.result()}
+        return
+    except PasswordPoolBusy as e:
+        # Re-running the same import is safe: committed rows are skipped as existing
+        yield {
+            "type": "error",
+            "error": f"password hashing is busy: {e}",
+            "retry_after": PASSWORD_RETRY_AFTER,
+            **state.result(),
+        }
+        return
+    yield {"type": "done", **state.result()}
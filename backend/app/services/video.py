@@ -0,0 +1,221 @@
+# app/services/video.py
+"""Streaming helpers for violation evidence clips."""
+import io
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+from typing import BinaryIO, Optional, Tuple
+
+
+# MinIO multipart part size (5 MiB is the S3 minimum); bounds upload memory
+EVIDENCE_PART_SIZE = 5 * 1024 * 1024
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Matroska / WebM element ids (marker bits included)
+_SEGMENT = 0x18538067
+_INFO = 0x1549A966
+_CLUSTER = 0x1F43B675
+_BLOCK_GROUP = 0xA0
+_TIMECODE_SCALE = 0x2AD7B1
+_DURATION = 0x4489
+_CLUSTER_TIMECODE = 0xE7
+_SIMPLE_BLOCK = 0xA3
+_BLOCK = 0xA1
+
+_MASTERS = {_SEGMENT, _INFO, _CLUSTER, _BLOCK_GROUP}
+_BLOCKS = {_SIMPLE_BLOCK, _BLOCK}
+# Track number (up to 8 bytes) plus the 16-bit relative timecode
+_BLOCK_HEADER_BYTES = 10
+
+
+def _read_vint(buf: bytearray, pos: int, keep_marker: bool) -> Optional[Tuple[int, int, bool]]:
+    """Decode an EBML variable-length integer.
+
+    Returns (value, length, all_ones) or None if ``buf`` is too short.
+    """
+    if pos >= len(buf):
+        return None
+    first = buf[pos]
+    if first == 0:
+        raise ValueError("Invalid EBML vint")
+    length = 8 - first.bit_length() + 1
+    if pos + length > len(buf):
+        return None
+    value = first if keep_marker else first & (0xFF >> length)
+    for b in buf[pos + 1:pos + length]:
+        value = (value << 8) | b
+    all_ones = not keep_marker and value == (1 << (7 * length)) - 1
+    return value, length, all_ones
+
+
+class WebmDurationProbe:
+    """Incremental Matroska/WebM parser that extracts the clip duration.
+
+    Bytes are fed as they stream past, and only element headers and a few
+    bytes per block are kept. The Segment Info Duration is used when
+    present. MediaRecorder output usually omits it, so the fallback is the
+    span between the first and last block timestamps.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._skip = 0
+        self.failed = False
+        self.timecode_scale = 1_000_000  # ns per tick (Matroska default)
+        self.header_duration: Optional[float] = None
+        self._cluster_timecode = 0
+        self._first_ts: Optional[int] = None
+        self._last_ts: Optional[int] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds, or None if it could not be determined."""
+        if self.header_duration:
+            return self.header_duration * self.timecode_scale / 1e9
+        if self._first_ts is None or self._last_ts == self._first_ts:
+            return None
+        return (self._last_ts - self._first_ts) * self.timecode_scale / 1e9
+
+    def feed(self, chunk: bytes) -> None:
+        if self.failed or not chunk:
+            return
+        self._buf += chunk
+        try:
+            self._parse()
+        except (ValueError, struct.error):
+            self.failed = True
+            self._buf = bytearray()
+
+    def _parse(self) -> None:
+        buf = self._buf
+        pos = 0
+        while True:
+            if self._skip:
+                n = min(self._skip, len(buf) - pos)
+                pos += n
+                self._skip -= n
+                if self._skip:
+                    break
+
+            element_id = _read_vint(buf, pos, keep_marker=True)
+            if element_id is None:
+                break
+            element_id, id_len, _ = element_id
+            size = _read_vint(buf, pos + id_len, keep_marker=False)
+            if size is None:
+                break
+            size, size_len, unknown = size
+            header_len = id_len + size_len
+
+            if element_id in _MASTERS:
+                # Descend; children follow directly (live streams use unknown sizes)
+                pos += header_len
+                continue
+            if unknown:
+                raise ValueError("Unknown-size leaf element")
+
+            if element_id in _BLOCKS:
+                want = min(size, _BLOCK_HEADER_BYTES)
+            elif element_id in (_TIMECODE_SCALE, _DURATION, _CLUSTER_TIMECODE):
+                if size > 8:
+                    raise ValueError("Oversized numeric element")
+                want = size
+            else:
+                pos += header_len
+                self._skip = size
+                continue
+
+            if len(buf) - pos - header_len < want:
+                break
+            data = bytes(buf[pos + header_len:pos + header_len + want])
+            self._handle(element_id, data)
+            pos += header_len + want
+            self._skip = size - want
+
+        del buf[:pos]
+
+    def _handle(self, element_id: int, data: bytes) -> None:
+        if element_id == _TIMECODE_SCALE:
+            self.timecode_scale = int.from_bytes(data, "big") or self.timecode_scale
+        elif element_id == _DURATION:
+            if len(data) == 4:
+                self.header_duration = struct.unpack(">f", data)[0]
+            elif len(data) == 8:
+                self.header_duration = struct.unpack(">d", data)[0]
+        elif element_id == _CLUSTER_TIMECODE:
+            self._cluster_timecode = int.from_bytes(data, "big")
+        else:
+            track = _read_vint(bytearray(data), 0, keep_marker=False)
+            if track is None or len(data) < track[1] + 2:
+                return
+            relative = struct.unpack(">h", data[track[1]:track[1] + 2])[0]
+            ts = self._cluster_timecode + relative
+            self._first_ts = ts if self._first_ts is None else min(self._first_ts, ts)
+            self._last_ts = ts if self._last_ts is None else max(self._last_ts, ts)
+
+
+class ProbingReader:
+    """File-like wrapper that feeds every chunk read through a duration probe."""
+
+    def __init__(self, raw: BinaryIO, probe: WebmDurationProbe):
+        self.raw = raw
+        self.probe = probe
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.probe.feed(data)
+        return data
+
+
+def stream_size(fileobj: BinaryIO) -> int:
+    """Length of a seekable stream; leaves the position at the start."""
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
+def _ffprobe_duration(path: str, pass_fds: Tuple[int, ...] = ()) -> Optional[float]:
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+         '-of', 'default=noprint_wrappers=1:nokey=1', path],
+        capture_output=True, text=True, timeout=10, pass_fds=pass_fds,
+    )
+    if result.returncode == 0 and result.stdout.strip():
+        return float(result.stdout.strip())
+    return None
+
+
+def _disk_fileno(fileobj: BinaryIO) -> Optional[int]:
+    """Descriptor of the on-disk file behind a stream, without forcing a rollover."""
+    # SpooledTemporaryFile.fileno() would first copy an in-memory spool to disk
+    raw = getattr(fileobj, "_file", fileobj)
+    try:
+        return raw.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def get_video_duration(fileobj: BinaryIO) -> Optional[float]:
+    """Get video duration using ffprobe on a seekable stream.
+
+    Only used when the in-process WebM probe cannot determine the duration.
+    An upload spooled to disk is probed in place through ``/proc/self/fd``;
+    only an in-memory spool (at most the spool threshold) is written out.
+    """
+    try:
+        fd = _disk_fileno(fileobj)
+        if fd is not None and os.path.isdir("/proc/self/fd"):
+            fileobj.flush()
+            # pass_fds keeps the number, so the child's /proc/self/fd/N is this file
+            return _ffprobe_duration(f"/proc/self/fd/{fd}", pass_fds=(fd,))
+        fileobj.seek(0)
+        with tempfile.NamedTemporaryFile(suffix='.webm', delete=True) as tmp:
+            shutil.copyfileobj(fileobj, tmp, COPY_CHUNK_SIZE)
+            tmp.flush()
+            return _ffprobe_duration(tmp.name)
+    except Exception as e:
+        print(f"Error getting video duration: {e}")
+    return None
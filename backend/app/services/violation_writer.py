@@ -0,0 +1,178 @@
+# app/services/violation_writer.py
+"""Write-behind buffer that persists violations in group commits."""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.services.live_feed import live_feed
+from app.services.violations import bulk_insert_violations
+
+logger = logging.getLogger(__name__)
+
+
+# Flush when this many rows are buffered or the oldest row waited this long
+FLUSH_MAX_ROWS = int(os.getenv("VIOLATION_FLUSH_MAX_ROWS", "200"))
+FLUSH_MAX_DELAY = float(os.getenv("VIOLATION_FLUSH_MAX_DELAY_MS", "50")) / 1000
+# Write every row inline with its own commit (tests, scripts)
+SYNCHRONOUS = os.getenv("VIOLATION_WRITER_SYNC", "").lower() in ("1", "true", "yes")
+
+_COLUMNS = (
+    "session_id", "type", "timestamp", "confidence",
+    "severity_score", "video_proof_url", "video_duration",
+)
+
+
+class ViolationWriter:
+    """Buffer violation rows in memory and write them with one commit per batch.
+
+    ``submit`` returns once the row's batch is committed, so callers still get
+    a durable id, but concurrent requests share a single INSERT and fsync.
+    When the writer is not running (or ``synchronous`` is set) each row is
+    written on its own, still in the executor so the event loop never blocks
+    on the insert.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_rows: int = FLUSH_MAX_ROWS,
+        max_delay: float = FLUSH_MAX_DELAY,
+        synchronous: bool = SYNCHRONOUS,
+    ):
+        self.session_factory = session_factory
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.synchronous = synchronous
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flushes = 0
+        self._rows_written = 0
+        self._errors = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background flusher on the running event loop."""
+        if self.synchronous or self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything still buffered and stop the flusher."""
+        if not self.running:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+    async def submit(self, row: Dict[str, Any]) -> int:
+        """Queue one violation row and return its id once committed."""
+        row = _normalize(row)
+        if not self.running:
+            ids = await asyncio.get_running_loop().run_in_executor(None, self._write, [row])
+            return ids[0]
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, future))
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and flush latency figures for tuning."""
+        return {
+            "running": self.running,
+            "synchronous": self.synchronous,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_rows": self.max_rows,
+            "max_delay_ms": self.max_delay * 1000,
+            "flushes": self._flushes,
+            "rows_written": self._rows_written,
+            "errors": self._errors,
+            "last_flush_ms": round(self._last_flush_ms, 2),
+            "max_flush_ms": round(self._max_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self._flushes, 2) if self._flushes else 0.0,
+            "avg_batch_size": round(self._rows_written / self._flushes, 2) if self._flushes else 0.0,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            ids = await loop.run_in_executor(None, self._write, [row for row, _ in batch])
+        except Exception as e:
+            self._errors += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), violation_id in zip(batch, ids):
+                if not future.done():
+                    future.set_result(violation_id)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, rows: List[Dict[str, Any]]) -> List[int]:
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            ids = bulk_insert_violations(db, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        else:
+            try:
+                live_feed.violations_committed(db, rows, ids)
+            except Exception:
+                logger.exception("Live feed publish failed")
+        finally:
+            db.close()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._flushes += 1
+        self._rows_written += len(rows)
+        self._last_flush_ms = elapsed_ms
+        self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        return ids
+
+
+def _normalize(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Give every row the same keys so batches fit one multi-row INSERT."""
+    out = {column: row.get(column) for column in _COLUMNS}
+    if out["timestamp"] is None:
+        out["timestamp"] = datetime.now()
+    return out
+
+
+violation_writer = ViolationWriter()
@@ -0,0 +1,299 @@
+# app/services/violations.py
+"""Bulk persistence helpers for proctoring violations."""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import exists, func, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.models import ExamSession, SessionViolationCount, Violation
+
+
+def calculate_severity(v_type: str) -> int:
+    mapping = {
+        "gaze_away": 1,
+        "tab_switch": 2,
+        "voice_detected": 3,
+        "face_missing": 4,
+        "multiple_faces": 5,
+        "face_substitution": 5,
+        "phone_detected": 4,
+        "book_detected": 3,
+        "laptop_detected": 3,
+    }
+    return mapping.get(v_type, 1)
+
+
+# Engine id -> whether a multi-row INSERT gets consecutive auto-increment ids
+_consecutive_ids: Dict[int, bool] = {}
+
+
+def check_autoinc_lock_mode(bind: Union[Session, Connection]) -> bool:
+    """Whether ids of one multi-row INSERT can be derived from LAST_INSERT_ID().
+
+    Only MySQL needs this (no RETURNING). InnoDB guarantees consecutive ids
+    per statement with ``innodb_autoinc_lock_mode`` 0 or 1; the MySQL 8
+    default of 2 interleaves concurrent inserts, so ids are then read back
+    row by row instead. Checked once per engine; the app checks at startup.
+    """
+    engine = bind.get_bind() if isinstance(bind, Session) else bind.engine
+    key = id(engine)
+    if key not in _consecutive_ids:
+        consecutive = False
+        if engine.dialect.name == "mysql":
+            mode = bind.execute(text("SELECT @@innodb_autoinc_lock_mode")).scalar()
+            consecutive = mode is not None and int(mode) <= 1
+            if not consecutive:
+                print(
+                    f"innodb_autoinc_lock_mode={mode}: violation batches fall back to "
+                    "one INSERT per row; set it to 1 for multi-row inserts"
+                )
+        _consecutive_ids[key] = consecutive
+    return _consecutive_ids[key]
+
+
+def bulk_insert_violations(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """Insert many violation rows with a single multi-row INSERT.
+
+    All rows must share the same keys. Per-session aggregates are updated in
+    the same transaction. The caller owns the transaction and is responsible
+    for committing.
+
+    Returns:
+        Primary keys of the inserted rows, in the same order as ``rows``.
+    """
+    if not rows:
+        return []
+
+    if db.get_bind().dialect.insert_returning:
+        result = db.execute(
+            insert(Violation).returning(Violation.id, sort_by_parameter_order=True),
+            rows,
+        )
+        ids = list(result.scalars())
+    elif check_autoinc_lock_mode(db):
+        # No RETURNING; LAST_INSERT_ID() is the first row's id and the lock
+        # mode guarantees the statement's ids are consecutive
+        result = db.execute(insert(Violation).values(rows))
+        first_id = result.lastrowid
+        ids = list(range(first_id, first_id + len(rows)))
+    else:
+        ids = [db.execute(insert(Violation).values(row)).lastrowid for row in rows]
+
+    increment_aggregates(db, rows)
+    return ids
+
+
+def _group_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Collapse violation rows into one aggregate delta per (session, type)."""
+    groups: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    for row in rows:
+        key = (row["session_id"], row["type"])
+        ts = row.get("timestamp") or datetime.now()
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {
+                "session_id": key[0],
+                "type": key[1],
+                "count": 1,
+                "total_severity": row.get("severity_score") or 0,
+                "first_at": ts,
+                "last_at": ts,
+            }
+            continue
+        group["count"] += 1
+        group["total_severity"] += row.get("severity_score") or 0
+        group["first_at"] = min(group["first_at"], ts)
+        group["last_at"] = max(group["last_at"], ts)
+    # Fixed key order keeps concurrent upserts from deadlocking on row locks
+    return [groups[key] for key in sorted(groups)]
+
+
+def increment_aggregates(db: Session, rows: Iterable[Dict[str, Any]]) -> None:
+    """Add inserted violation rows to ``session_violation_counts``.
+
+    Uses a single atomic upsert so concurrent writers never lose increments.
+    """
+    deltas = _group_rows(rows)
+    if not deltas:
+        return
+
+    table = SessionViolationCount.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as upsert
+
+        stmt = upsert(table).values(deltas)
+        stmt = stmt.on_duplicate_key_update(
+            count=table.c.count + stmt.inserted.count,
+            total_severity=table.c.total_severity + stmt.inserted.total_severity,
+            first_at=func.least(table.c.first_at, stmt.inserted.first_at),
+            last_at=func.greatest(table.c.last_at, stmt.inserted.last_at),
+        )
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+            least, greatest = func.least, func.greatest
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+            # SQLite's multi-argument min()/max() are scalar functions
+            least, greatest = func.min, func.max
+
+        stmt = upsert(table).values(deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.session_id, table.c.type],
+            set_={
+                "count": table.c.count + stmt.excluded.count,
+                "total_severity": table.c.total_severity + stmt.excluded.total_severity,
+                "first_at": least(table.c.first_at, stmt.excluded.first_at),
+                "last_at": greatest(table.c.last_at, stmt.excluded.last_at),
+            },
+        )
+    db.execute(stmt)
+
+
+def session_aggregates(db: Session, session_id: int) -> Dict[str, Any]:
+    """Current running totals for one session.
+
+    Reads one row per violation type, independent of how many violations
+    were reported.
+    """
+    counts = (
+        db.query(SessionViolationCount)
+        .filter(SessionViolationCount.session_id == session_id)
+        .all()
+    )
+    return summarize_counts(counts)
+
+
+def summarize_counts(counts: Iterable[SessionViolationCount]) -> Dict[str, Any]:
+    counts = list(counts)
+    return {
+        "total_violations": sum(c.count for c in counts),
+        "total_severity": sum(c.total_severity for c in counts),
+        "type_counts": {c.type: c.count for c in counts},
+        "first_violation_at": min((c.first_at for c in counts if c.first_at), default=None),
+        "last_violation_at": max((c.last_at for c in counts if c.last_at), default=None),
+    }
+
+
+def _recompute(db: Session, session_ids: List[int]) -> Dict[Tuple[int, str], Tuple[int, int, Any, Any]]:
+    rows = (
+        db.query(
+            Violation.session_id,
+            Violation.type,
+            func.count(Violation.id),
+            func.coalesce(func.sum(Violation.severity_score), 0),
+            func.min(Violation.timestamp),
+            func.max(Violation.timestamp),
+        )
+        .filter(Violation.session_id.in_(session_ids))
+        .group_by(Violation.session_id, Violation.type)
+        .all()
+    )
+    return {(sid, vtype): (count, int(sev), first, last) for sid, vtype, count, sev, first, last in rows}
+
+
+def backfill_missing_aggregates(bind: Union[Session, Connection]) -> int:
+    """Build aggregates for sessions whose violations predate them.
+
+    One ``INSERT ... SELECT ... GROUP BY``; sessions that already have any
+    aggregate row are left alone (``reconcile_aggregates`` checks those).
+    Returns the number of aggregate rows written.
+    """
+    has_counts = exists().where(SessionViolationCount.session_id == Violation.session_id)
+    source = (
+        select(
+            Violation.session_id,
+            Violation.type,
+            func.count(Violation.id),
+            func.coalesce(func.sum(Violation.severity_score), 0),
+            func.min(Violation.timestamp),
+            func.max(Violation.timestamp),
+        )
+        .where(~has_counts)
+        .group_by(Violation.session_id, Violation.type)
+    )
+    result = bind.execute(
+        insert(SessionViolationCount).from_select(
+            ["session_id", "type", "count", "total_severity", "first_at", "last_at"], source
+        )
+    )
+    return max(result.rowcount or 0, 0)
+
+
+def reconcile_aggregates(
+    db: Session,
+    session_ids: Optional[List[int]] = None,
+    fix: bool = False,
+    batch_size: int = 500,
+) -> Dict[str, Any]:
+    """Recompute aggregates from raw violation rows and compare.
+
+    Sessions are processed in id batches. With ``fix``, mismatching sessions
+    have their aggregate rows replaced by the recomputed values. Run fixes
+    while the affected sessions are idle; a report landing between the
+    recompute and the replace would be dropped from the totals.
+    """
+    checked = 0
+    mismatched: List[int] = []
+    last_id = 0
+    while True:
+        if session_ids is not None:
+            batch = sorted(session_ids)[checked:checked + batch_size]
+        else:
+            batch = [
+                sid for (sid,) in db.query(ExamSession.id)
+                .filter(ExamSession.id > last_id)
+                .order_by(ExamSession.id)
+                .limit(batch_size)
+                .all()
+            ]
+        if not batch:
+            break
+        last_id = batch[-1]
+        checked += len(batch)
+
+        expected = _recompute(db, batch)
+        stored = {
+            (c.session_id, c.type): (c.count, c.total_severity, c.first_at, c.last_at)
+            for c in db.query(SessionViolationCount)
+            .filter(SessionViolationCount.session_id.in_(batch))
+            .all()
+        }
+
+        bad = set()
+        for key in set(expected) | set(stored):
+            exp, got = expected.get(key), stored.get(key)
+            # Timestamps are compared loosely: the database may drop tzinfo or
+            # sub-second precision differently from the Python-side values.
+            if exp is None or got is None or exp[:2] != got[:2] or not (
+                _same_time(exp[2], got[2]) and _same_time(exp[3], got[3])
+            ):
+                bad.add(key[0])
+        batch_bad = sorted(bad)
+        mismatched.extend(batch_bad)
+
+        if fix and batch_bad:
+            db.query(SessionViolationCount).filter(
+                SessionViolationCount.session_id.in_(batch_bad)
+            ).delete(synchronize_session=False)
+            db.add_all(
+                SessionViolationCount(
+                    session_id=sid, type=vtype, count=count,
+                    total_severity=sev, first_at=first, last_at=last,
+                )
+                for (sid, vtype), (count, sev, first, last) in expected.items()
+                if sid in bad
+            )
+            db.commit()
+        db.expunge_all()
+
+    return {"checked": checked, "mismatched": len(mismatched), "session_ids": mismatched, "fixed": fix}
+
+
+def _same_time(a: Any, b: Any) -> bool:
+    if a is None or b is None:
+        return a is b
+    return abs(a.replace(tzinfo=None) - b.replace(tzinfo=None)).total_seconds() < 1
@@ -0,0 +1,190 @@
+"""Initial schema.
+
+Databases created by the old startup ``create_all`` are adopted by
+``python -m app.cli migrate``, which fills in what they lack and stamps
+this revision instead of running it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=True),
+    sa.Column('role', sa.Enum('STUDENT', 'TEACHER', 'PROCTOR', 'ADMIN', name='userrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('face_embedding_path', sa.String(length=512), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index('ix_users_email_role', 'users', ['email', 'role'], unique=False)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_table('audit_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=255), nullable=False),
+    sa.Column('details', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_audit_logs_action'), 'audit_logs', ['action'], unique=False)
+    op.create_index(op.f('ix_audit_logs_created_at'), 'audit_logs', ['created_at'], unique=False)
+    op.create_index(op.f('ix_audit_logs_user_id'), 'audit_logs', ['user_id'], unique=False)
+    op.create_table('exams',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('created_by_id', sa.Integer(), nullable=True),
+    sa.Column('duration_minutes', sa.Integer(), nullable=True),
+    sa.Column('config', sa.JSON(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exams_id'), 'exams', ['id'], unique=False)
+    op.create_table('student_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('photo_path', sa.String(length=512), nullable=True),
+    sa.Column('thumbnail_path', sa.String(length=512), nullable=True),
+    sa.Column('photo_base64', sa.JSON(none_as_null=True), nullable=True),
+    sa.Column('face_embedding', sa.LargeBinary(), nullable=True),
+    sa.Column('face_embedding_photo_hash', sa.String(length=64), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_student_profiles_id'), 'student_profiles', ['id'], unique=False)
+    op.create_index(op.f('ix_student_profiles_student_id'), 'student_profiles', ['student_id'], unique=True)
+    op.create_table('exam_assignments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('exam_id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('assigned_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('due_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['exam_id'], ['exams.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_assignments_exam_student', 'exam_assignments', ['exam_id', 'student_id'], unique=True)
+    op.create_index(op.f('ix_exam_assignments_exam_id'), 'exam_assignments', ['exam_id'], unique=False)
+    op.create_index(op.f('ix_exam_assignments_id'), 'exam_assignments', ['id'], unique=False)
+    op.create_index(op.f('ix_exam_assignments_student_id'), 'exam_assignments', ['student_id'], unique=False)
+    op.create_table('exam_sessions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('exam_id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('end_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('verdict', sa.String(length=50), nullable=False),
+    sa.Column('ai_summary', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['exam_id'], ['exams.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exam_sessions_exam_id'), 'exam_sessions', ['exam_id'], unique=False)
+    op.create_index('ix_exam_sessions_exam_start', 'exam_sessions', ['exam_id', 'start_time'], unique=False)
+    op.create_index(op.f('ix_exam_sessions_id'), 'exam_sessions', ['id'], unique=False)
+    op.create_index('ix_exam_sessions_start_id', 'exam_sessions', ['start_time', 'id'], unique=False)
+    op.create_index('ix_exam_sessions_status_start', 'exam_sessions', ['status', 'start_time'], unique=False)
+    op.create_index(op.f('ix_exam_sessions_student_id'), 'exam_sessions', ['student_id'], unique=False)
+    op.create_table('analysis_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('locked_by', sa.String(length=100), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['exam_sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_id')
+    )
+    op.create_index('ix_analysis_jobs_status_run_after', 'analysis_jobs', ['status', 'run_after'], unique=False)
+    op.create_table('session_violation_counts',
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total_severity', sa.Integer(), nullable=False),
+    sa.Column('first_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['exam_sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('session_id', 'type')
+    )
+    op.create_table('violations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('severity_score', sa.Integer(), nullable=True),
+    sa.Column('confidence', sa.Float(), nullable=True),
+    sa.Column('video_proof_url', sa.String(length=512), nullable=True),
+    sa.Column('video_duration', sa.Float(), nullable=True),
+    sa.Column('snapshot_url', sa.String(length=512), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['exam_sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_violations_id'), 'violations', ['id'], unique=False)
+    op.create_index(op.f('ix_violations_session_id'), 'violations', ['session_id'], unique=False)
+    op.create_index('ix_violations_session_type', 'violations', ['session_id', 'type'], unique=False)
+    op.create_index(op.f('ix_violations_type'), 'violations', ['type'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_violations_type'), table_name='violations')
+    op.drop_index('ix_violations_session_type', table_name='violations')
+    op.drop_index(op.f('ix_violations_session_id'), table_name='violations')
+    op.drop_index(op.f('ix_violations_id'), table_name='violations')
+    op.drop_table('violations')
+    op.drop_table('session_violation_counts')
+    op.drop_index('ix_analysis_jobs_status_run_after', table_name='analysis_jobs')
+    op.drop_table('analysis_jobs')
+    op.drop_index(op.f('ix_exam_sessions_student_id'), table_name='exam_sessions')
+    op.drop_index('ix_exam_sessions_status_start', table_name='exam_sessions')
+    op.drop_index('ix_exam_sessions_start_id', table_name='exam_sessions')
+    op.drop_index(op.f('ix_exam_sessions_id'), table_name='exam_sessions')
+    op.drop_index('ix_exam_sessions_exam_start', table_name='exam_sessions')
+    op.drop_index(op.f('ix_exam_sessions_exam_id'), table_name='exam_sessions')
+    op.drop_table('exam_sessions')
+    op.drop_index(op.f('ix_exam_assignments_student_id'), table_name='exam_assignments')
+    op.drop_index(op.f('ix_exam_assignments_id'), table_name='exam_assignments')
+    op.drop_index(op.f('ix_exam_assignments_exam_id'), table_name='exam_assignments')
+    op.drop_index('ix_assignments_exam_student', table_name='exam_assignments')
+    op.drop_table('exam_assignments')
+    op.drop_index(op.f('ix_student_profiles_student_id'), table_name='student_profiles')
+    op.drop_index(op.f('ix_student_profiles_id'), table_name='student_profiles')
+    op.drop_table('student_profiles')
+    op.drop_index(op.f('ix_exams_id'), table_name='exams')
+    op.drop_table('exams')
+    op.drop_index(op.f('ix_audit_logs_user_id'), table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_created_at'), table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_action'), table_name='audit_logs')
+    op.drop_table('audit_logs')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index('ix_users_email_role', table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,162 @@
+# tests/test_assignments.py
+"""Assignment listing: constant query count, keyset paging and filters.
+
+Run from backend/: ``python -m pytest tests``.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.endpoints import exam
+from app.db.database import get_db
+from app.models.models import Base, Exam, ExamAssignment, User, UserRole
+
+DUE = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine, db):
+    app = FastAPI()
+    app.include_router(exam.router)
+    app.dependency_overrides[get_db] = lambda: db
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements executed while the test runs (reset before each request)."""
+    seen = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield seen
+    event.remove(engine, "before_cursor_execute", count)
+
+
+def _assign(db, count, exam_title="Midterm"):
+    """``count`` assignments on one exam, due one day apart, every third completed."""
+    teacher = User(email=f"teacher-{exam_title}@example.edu", hashed_password="x", role=UserRole.TEACHER)
+    db.add(teacher)
+    db.flush()
+    new_exam = Exam(title=exam_title, created_by_id=teacher.id, config={})
+    db.add(new_exam)
+    db.flush()
+    students = [
+        User(email=f"s{i}-{exam_title}@example.edu", hashed_password="x", role=UserRole.STUDENT)
+        for i in range(count)
+    ]
+    db.add_all(students)
+    db.flush()
+    db.add_all(
+        ExamAssignment(
+            exam_id=new_exam.id,
+            student_id=student.id,
+            due_date=DUE + timedelta(days=i),
+            status="completed" if i % 3 == 0 else "assigned",
+        )
+        for i, student in enumerate(students)
+    )
+    db.commit()
+    db.expunge_all()
+    return new_exam.id
+
+
+def _request_statements(client, statements, url):
+    statements.clear()
+    response = client.get(url)
+    assert response.status_code == 200
+    return response, len(statements)
+
+
+def test_query_count_is_constant(client, db, statements):
+    first_exam = _assign(db, 1, "Quiz")
+    _, one_row = _request_statements(client, statements, "/exams/assignments")
+    _, one_row_exam = _request_statements(client, statements, f"/exams/{first_exam}/assignments")
+
+    second_exam = _assign(db, 200, "Final")
+    response, many_rows = _request_statements(client, statements, "/exams/assignments")
+    assert len(response.json()) == 201
+    _, many_rows_exam = _request_statements(client, statements, f"/exams/{second_exam}/assignments")
+
+    assert one_row == many_rows == 1
+    assert one_row_exam == many_rows_exam == 1
+
+
+def test_rows_carry_joined_columns(client, db):
+    exam_id = _assign(db, 2)
+    rows = client.get(f"/exams/{exam_id}/assignments").json()
+    assert [row["exam_title"] for row in rows] == ["Midterm", "Midterm"]
+    assert rows[0]["student_email"] == "s0-Midterm@example.edu"
+    assert rows[0]["due_date"].startswith("2026-01-01")
+
+
+def test_keyset_paging(client, db):
+    _assign(db, 25)
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        url = "/exams/assignments?limit=10" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url)
+        seen.extend(row["id"] for row in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        assert int(cursor) == seen[-1]
+
+    assert pages == 3
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen)) == 25
+
+
+def test_exact_page_has_no_next_cursor(client, db):
+    _assign(db, 10)
+    response = client.get("/exams/assignments?limit=10")
+    assert len(response.json()) == 10
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_status_and_due_filters(client, db):
+    exam_id = _assign(db, 9)
+
+    completed = client.get(f"/exams/{exam_id}/assignments?status=completed").json()
+    assert len(completed) == 3
+    assert {row["status"] for row in completed} == {"completed"}
+
+    due_from = (DUE + timedelta(days=2)).isoformat()
+    due_to = (DUE + timedelta(days=5)).isoformat()
+    window = client.get(
+        "/exams/assignments", params={"due_from": due_from, "due_to": due_to}
+    ).json()
+    assert [row["due_date"][:10] for row in window] == ["2026-01-03", "2026-01-04", "2026-01-05"]
+
+    both = client.get(
+        "/exams/assignments", params={"status": "completed", "due_from": due_from, "due_to": due_to}
+    ).json()
+    assert [row["due_date"][:10] for row in both] == ["2026-01-04"]
@@ -0,0 +1,71 @@
+# tests/test_signaling.py
+"""Signaling peers: keepalive pings and idle eviction.
+
+Run from backend/: ``python -m pytest tests``.
+"""
+import time
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from app.services import signaling
+from app.services.signaling import PING_MESSAGE, PONG_MESSAGE, InMemoryBroker, SignalingHub
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    monkeypatch.setattr(signaling, "SIGNALING_PING_INTERVAL", 0.05)
+    monkeypatch.setattr(signaling, "SIGNALING_IDLE_TIMEOUT", 0.3)
+    return SignalingHub(InMemoryBroker())
+
+
+@pytest.fixture
+def client(hub):
+    app = FastAPI()
+
+    @app.websocket("/rooms/{room_id}")
+    async def room(websocket: WebSocket, room_id: str, relay: bool = True):
+        await websocket.accept()
+        await hub.serve(room_id, websocket, relay=relay)
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_busy_receive_only_peer_is_pinged_and_kept(client, hub):
+    """A peer whose queue never drains still gets pings and survives by answering them."""
+    with client.websocket_connect("/rooms/r1?relay=false") as receiver, \
+            client.websocket_connect("/rooms/r1") as sender:
+        pings = delivered = 0
+        deadline = time.monotonic() + 4 * signaling.SIGNALING_IDLE_TIMEOUT
+        i = 0
+        while time.monotonic() < deadline:
+            sender.send_text(f"offer-{i}")
+            i += 1
+            message = receiver.receive_text()
+            if message == PING_MESSAGE:
+                pings += 1
+                receiver.send_text(PONG_MESSAGE)
+            else:
+                delivered += 1
+
+        assert pings > 0
+        assert delivered > 0
+        assert hub.stats()["evicted"] == {}
+        assert hub.stats()["connections"] == 2
+
+
+def test_silent_peer_is_evicted_as_idle(client, hub):
+    with client.websocket_connect("/rooms/r2?relay=false") as receiver:
+        deadline = time.monotonic() + 4 * signaling.SIGNALING_IDLE_TIMEOUT
+        while time.monotonic() < deadline and not hub.stats()["evicted"]:
+            time.sleep(0.02)
+
+        assert hub.stats()["evicted"] == {"idle": 1}
+        # the server closes the socket after any pings already queued
+        while True:
+            message = receiver.receive()
+            if message["type"] == "websocket.close":
+                assert message["code"] == signaling.CLOSE_POLICY_VIOLATION
+                break
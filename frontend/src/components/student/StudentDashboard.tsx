@@ -400,8 +400,8 @@ const ProfileView = ({ onStart, notify, onLogout, studentId, profileData, onProf
             <div className="absolute top-0 left-0 w-full h-1.5 bg-gradient-to-r from-orange-500 to-orange-400" />
             <div className="relative inline-block mb-6 mt-4">
               <div className="w-32 h-32 rounded-full bg-slate-50 border-4 border-white shadow-md mx-auto overflow-hidden flex items-center justify-center ring-1 ring-slate-100">
-                {profileData?.photo_base64 ? (
-                  <img src={profileData.photo_base64} alt="Profile" className="w-full h-full object-cover" />
+                {profileData?.thumbnail_url ? (
+                  <img src={profileData.thumbnail_url} alt="Profile" className="w-full h-full object-cover" />
                 ) : (
                   <User size={64} className="text-slate-300" />
                 )}
@@ -802,7 +802,8 @@ export const StudentDashboard: React.FC<StudentDashboardProps> = ({ onLogout })
     email?: string;
     group?: string;
     is_active?: boolean;
-    photo_base64?: string;
+    photo_url?: string;
+    thumbnail_url?: string;
     is_verified?: boolean;
   } | null>(null);
 
@@ -874,12 +875,10 @@ export const StudentDashboard: React.FC<StudentDashboardProps> = ({ onLogout })
       if (pendingViolationsRef.current.length === 0) return;
       const queue = [...pendingViolationsRef.current];
       pendingViolationsRef.current = [];
-      for (const payload of queue) {
-        try {
-          await api.reportViolation(activeSessionId || undefined, payload);
-        } catch {
-          pendingViolationsRef.current.push(payload);
-        }
+      try {
+        await api.reportViolations(activeSessionId || undefined, queue);
+      } catch {
+        pendingViolationsRef.current.push(...queue);
       }
     }, 5000);
     return () => clearInterval(interval);
@@ -1104,7 +1103,8 @@ export const StudentDashboard: React.FC<StudentDashboardProps> = ({ onLogout })
         email: data.email,
         group: data.group,
         is_active: data.is_active,
-        photo_base64: data.photo_base64,
+        photo_url: data.photo_url,
+        thumbnail_url: data.thumbnail_url,
         is_verified: data.is_verified,
       });
     } catch {
@@ -1139,13 +1139,14 @@ export const StudentDashboard: React.FC<StudentDashboardProps> = ({ onLogout })
 
   useEffect(() => {
     const buildDescriptor = async () => {
-      if (!modelsReady || !profileData?.photo_base64) return;
+      if (!modelsReady || !profileData?.photo_url) return;
       try {
         const img = await new Promise<HTMLImageElement>((resolve, reject) => {
           const image = new Image();
           image.onload = () => resolve(image);
           image.onerror = () => reject(new Error('Image load failed'));
-          image.src = profileData.photo_base64 as string;
+          image.crossOrigin = 'anonymous';
+          image.src = profileData.photo_url as string;
         });
         const detection = await faceapi
           .detectSingleFace(img, new faceapi.TinyFaceDetectorOptions({ inputSize: 160, scoreThreshold: 0.5 }))
@@ -1157,7 +1158,7 @@ export const StudentDashboard: React.FC<StudentDashboardProps> = ({ onLogout })
       }
     };
     buildDescriptor();
-  }, [modelsReady, profileData?.photo_base64]);
+  }, [modelsReady, profileData?.photo_url]);
 
   const startCameraStream = useCallback(async () => {
     try {
@@ -1553,6 +1554,10 @@ export const StudentDashboard: React.FC<StudentDashboardProps> = ({ onLogout })
 
       socket.onmessage = async (event) => {
         const msg = JSON.parse(event.data);
+        if (msg?.type === 'ping') {
+          socket.send(JSON.stringify({ type: 'pong' }));
+          return;
+        }
         if (msg?.to && msg.to !== selfId) return;
 
         if (msg.type === 'ready' && msg.from) {
@@ -1630,10 +1635,10 @@ export const StudentDashboard: React.FC<StudentDashboardProps> = ({ onLogout })
       }
 
       // Load profile data if needed for client-side verification
-      if (!profileData?.photo_base64) {
+      if (!profileData?.photo_url) {
         try {
           const data = await api.getStudentProfile(effectiveStudentId) as any;
-          if (data?.photo_base64) {
+          if (data?.photo_url) {
             setProfileData(prev => ({ ...prev, ...data }));
           }
         } catch {
@@ -3,6 +3,10 @@ import React, { useState, useMemo, useRef, useEffect } from 'react';
 import api from '../../services/api';
 
 const API_BASE_URL = '/api/v1';
+// Live feed reconnect backoff and the coalescing window for full reloads
+const LIVE_RECONNECT_BASE_MS = 1000;
+const LIVE_RECONNECT_MAX_MS = 30000;
+const LIVE_REFRESH_DEBOUNCE_MS = 2000;
 import {
   Activity,
   AlertTriangle,
@@ -246,7 +250,7 @@ export const TeacherDashboard: React.FC<TeacherDashboardProps> = ({ onLogout: _o
       setSessions(studentSessions || []);
       return;
     }
-    const sessionsData = await api.getDashboardSessions().catch(() => []);
+    const sessionsData = await api.getAllDashboardSessions().catch(() => []);
     setSessions(sessionsData || []);
   };
 
@@ -254,7 +258,7 @@ export const TeacherDashboard: React.FC<TeacherDashboardProps> = ({ onLogout: _o
     try {
       const [studentsData, sessionsData] = await Promise.all([
         api.getDashboardStudents().catch(() => []),
-        api.getDashboardSessions().catch(() => [])
+        api.getAllDashboardSessions().catch(() => [])
       ]);
       setStudents(studentsData || []);
       setSessions(sessionsData || []);
@@ -285,6 +289,106 @@ export const TeacherDashboard: React.FC<TeacherDashboardProps> = ({ onLogout: _o
     load();
   }, []);
 
+  const sessionsRef = useRef<any[]>([]);
+  useEffect(() => {
+    sessionsRef.current = sessions;
+  }, [sessions]);
+
+  const studentsRef = useRef<any[]>([]);
+  useEffect(() => {
+    studentsRef.current = students;
+  }, [students]);
+
+  // Full reload for events the feed cannot apply in place; bursts (a
+  // reanalysis, a reconnect) collapse into one request
+  const refreshTimerRef = useRef<number | undefined>(undefined);
+  const scheduleRefresh = () => {
+    window.clearTimeout(refreshTimerRef.current);
+    refreshTimerRef.current = window.setTimeout(() => refreshSessions(), LIVE_REFRESH_DEBOUNCE_MS);
+  };
+
+  // Dashboard row for a session first seen on the live feed
+  const sessionFromEvent = (msg: any) => {
+    const { type: _type, session_id: _sessionId, ...fields } = msg;
+    const student = studentsRef.current.find((s: any) => s.id === msg.student_id);
+    const sameExam = sessionsRef.current.find((s: any) => s.exam_id === msg.exam_id);
+    return {
+      violations_count: 0,
+      total_severity: 0,
+      violations: [],
+      ...fields,
+      id: msg.session_id,
+      exam_title: sameExam?.exam_title || `Exam ${msg.exam_id}`,
+      student_name: student?.full_name || `Student ${msg.student_id}`,
+      student_email: student?.email || '',
+    };
+  };
+
+  // Live push of new violations and verdict changes (replaces re-polling)
+  useEffect(() => {
+    let socket: WebSocket | null = null;
+    let retryTimer: number | undefined;
+    let attempt = 0;
+    let stopped = false;
+
+    const connect = () => {
+      socket = new WebSocket(api.liveFeedUrl());
+      socket.onopen = () => {
+        // Events published while disconnected are gone; reload once
+        if (attempt > 0) scheduleRefresh();
+        attempt = 0;
+      };
+      socket.onmessage = (event) => {
+        const msg = JSON.parse(event.data);
+        if (msg?.type === 'ping') {
+          socket?.send(JSON.stringify({ type: 'pong' }));
+          return;
+        }
+        if (msg?.type === 'violations') {
+          setSessions((prev) => prev.map((session: any) => {
+            const items = msg.items.filter((v: any) => v.session_id === session.id);
+            if (!items.length) return session;
+            const known = new Set((session.violations || []).map((v: any) => v.id));
+            const fresh = items.filter((v: any) => !known.has(v.id));
+            return {
+              ...session,
+              violations: [...(session.violations || []), ...fresh],
+              violations_count: (session.violations_count || 0) + fresh.length,
+              total_severity: (session.total_severity || 0)
+                + fresh.reduce((sum: number, v: any) => sum + (v.severity_score || 0), 0),
+            };
+          }));
+        } else if (msg?.type === 'session') {
+          const { type: _type, ...update } = msg;
+          setSessions((prev) => (
+            prev.some((session: any) => session.id === msg.session_id)
+              ? prev.map((session: any) => (
+                session.id === msg.session_id ? { ...session, ...update, id: session.id } : session
+              ))
+              : [sessionFromEvent(msg), ...prev]
+          ));
+        } else if (msg?.type === 'exam_reanalyzed') {
+          scheduleRefresh();
+        }
+      };
+      socket.onclose = () => {
+        if (stopped) return;
+        const delay = Math.min(LIVE_RECONNECT_MAX_MS, LIVE_RECONNECT_BASE_MS * 2 ** attempt);
+        attempt += 1;
+        // Jitter keeps dashboards from reconnecting in lockstep after a restart
+        retryTimer = window.setTimeout(connect, delay * (0.5 + Math.random() / 2));
+      };
+    };
+
+    connect();
+    return () => {
+      stopped = true;
+      window.clearTimeout(retryTimer);
+      window.clearTimeout(refreshTimerRef.current);
+      socket?.close();
+    };
+  }, []);
+
   const notify = (msg: string) => {
     const id = Date.now();
     setNotifications(prev => [...prev, { id, msg }]);
@@ -590,6 +694,10 @@ function GridLiveStream({ studentId, kind }: { studentId: number; kind: StreamKi
 
     socket.onmessage = async (event) => {
       const msg = JSON.parse(event.data);
+      if (msg?.type === 'ping') {
+        socket.send(JSON.stringify({ type: 'pong' }));
+        return;
+      }
       if (msg?.to && msg.to !== viewerId) return;
 
       if (msg.type === 'offer' && msg.sdp) {
@@ -1722,23 +1830,28 @@ function QuestionsBankView({ questions, setQuestions, notify, onLogout, lang, th
                   <div className="space-y-1">
                     <p className={`text-sm font-black tracking-tight ${theme === 'dark' ? 'text-white' : 'text-slate-800'}`}>{exam.title}</p>
                     <p className="text-[10px] text-slate-400 font-bold uppercase tracking-widest">
-                      {exam.duration_minutes} мин • {exam.questions?.length || 0} вопросов
+                      {exam.duration_minutes} мин • {exam.question_count ?? 0} вопросов
                     </p>
                     {exam.description && (
                       <p className={`text-xs font-semibold ${theme === 'dark' ? 'text-slate-400' : 'text-slate-500'}`}>{exam.description}</p>
                     )}
                   </div>
                   <button
-                    onClick={() => {
+                    onClick={async () => {
                       setExamMeta({
                         title: exam.title || '',
                         description: exam.description || '',
                         duration: exam.duration_minutes || 60,
                       });
-                      if (Array.isArray(exam.questions)) {
-                        setBuilderQuestions(exam.questions);
+                      try {
+                        const detail = await api.getExam(exam.id);
+                        if (Array.isArray(detail.questions)) {
+                          setBuilderQuestions(detail.questions);
+                        }
+                        notify('Тест загружен в конструктор');
+                      } catch {
+                        notify('Не удалось загрузить вопросы теста');
                       }
-                      notify('Тест загружен в конструктор');
                     }}
                     className="text-[10px] font-black uppercase tracking-widest text-orange-500"
                   >
@@ -1,5 +1,6 @@
 // src/hooks/useAuth.ts
 import { useState, useEffect, useCallback, useMemo } from 'react';
+import { TOKEN_STORAGE_KEY } from '../services/api';
 
 export type UserRole = 'teacher' | 'student' | 'admin';
 
@@ -41,6 +42,7 @@ export const useAuth = () => {
       }
     } catch {
       localStorage.removeItem(USER_STORAGE_KEY);
+      localStorage.removeItem(TOKEN_STORAGE_KEY);
       setState({ user: null, loading: false, error: null });
     }
   }, []);
@@ -70,6 +72,7 @@ export const useAuth = () => {
         };
 
         localStorage.setItem(USER_STORAGE_KEY, JSON.stringify(loggedUser));
+        localStorage.setItem(TOKEN_STORAGE_KEY, data.access_token);
         setState({ user: loggedUser, loading: false, error: null });
         return loggedUser;
       } catch (err) {
@@ -83,6 +86,7 @@ export const useAuth = () => {
 
   const logout = useCallback(() => {
     localStorage.removeItem(USER_STORAGE_KEY);
+    localStorage.removeItem(TOKEN_STORAGE_KEY);
     setState({ user: null, loading: false, error: null });
   }, []);
 
@@ -2,6 +2,7 @@
 
 const API_BASE_URL = '/api/v1';
 const DEBUG = import.meta.env.DEV;
+export const TOKEN_STORAGE_KEY = 'token';
 
 // Types
 export interface ExamSession {
@@ -25,6 +26,15 @@ export interface Exam {
   questions: Question[];
 }
 
+export interface ExamSummary extends Omit<Exam, 'questions'> {
+  question_count: number;
+}
+
+export interface ExamDetail extends Exam {
+  question_count: number;
+  offset: number;
+}
+
 export interface Question {
   id: string;
   text: string;
@@ -44,6 +54,54 @@ export interface Violation {
   video_url?: string;
 }
 
+export interface ReportViolationsResponse {
+  status: string;
+  received: number;
+  inserted: number;
+  results: Array<{ index: number; violation_id?: number; error?: string }>;
+}
+
+export type QueryParams = Record<string, string | number | boolean | undefined>;
+
+const toQueryString = (params: QueryParams): string => {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== '') query.set(key, String(value));
+  });
+  const qs = query.toString();
+  return qs ? `?${qs}` : '';
+};
+
+export interface Page<T> {
+  items: T[];
+  /** Value for the next request's `cursor`; null on the last page */
+  nextCursor: string | null;
+}
+
+export interface DashboardSessionParams extends QueryParams {
+  limit?: number;
+  cursor?: string;
+  exam_id?: number;
+  status?: string;
+  verdict?: string;
+  date_from?: string;
+  date_to?: string;
+  /** Counts only; fetch details per session with getSessionViolations */
+  summary?: boolean;
+}
+
+export interface StudentImportEvent {
+  type: 'progress' | 'done' | 'error';
+  processed: number;
+  created: number;
+  skipped: number;
+  errors: number;
+  error?: string;
+  /** Set when password hashing was saturated; re-send the whole import */
+  retry_after?: number;
+  error_samples?: Array<{ line: number; error: string }>;
+}
+
 // Error class for API errors
 export class ApiError extends Error {
   constructor(
@@ -68,6 +126,11 @@ class ApiService {
     return ApiService.instance;
   }
 
+  private headers(extra: Record<string, string> = {}): Record<string, string> {
+    const token = localStorage.getItem(TOKEN_STORAGE_KEY);
+    return token ? { ...extra, Authorization: `Bearer ${token}` } : extra;
+  }
+
   private log(message: string, data?: unknown): void {
     if (DEBUG) {
       console.log(`[API] ${message}`, data ?? '');
@@ -95,7 +158,7 @@ class ApiService {
     
     const response = await fetch(url, {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      headers: this.headers({ 'Content-Type': 'application/json' }),
       body: JSON.stringify(data),
     });
     
@@ -106,17 +169,26 @@ class ApiService {
     const url = `${API_BASE_URL}${endpoint}`;
     this.log('GET', url);
     
-    const response = await fetch(url);
+    const response = await fetch(url, { headers: this.headers() });
     return this.handleResponse<T>(response);
   }
 
+  async getPage<T>(endpoint: string): Promise<Page<T>> {
+    const url = `${API_BASE_URL}${endpoint}`;
+    this.log('GET page', url);
+
+    const response = await fetch(url, { headers: this.headers() });
+    const items = await this.handleResponse<T[]>(response);
+    return { items, nextCursor: response.headers.get('X-Next-Cursor') };
+  }
+
   async put<T>(endpoint: string, data: unknown): Promise<T> {
     const url = `${API_BASE_URL}${endpoint}`;
     this.log('PUT', { url, data });
     
     const response = await fetch(url, {
       method: 'PUT',
-      headers: { 'Content-Type': 'application/json' },
+      headers: this.headers({ 'Content-Type': 'application/json' }),
       body: JSON.stringify(data),
     });
     
@@ -129,7 +201,7 @@ class ApiService {
     
     const response = await fetch(url, {
       method: 'PATCH',
-      headers: data ? { 'Content-Type': 'application/json' } : {},
+      headers: this.headers(data ? { 'Content-Type': 'application/json' } : {}),
       body: data ? JSON.stringify(data) : undefined,
     });
     
@@ -140,7 +212,7 @@ class ApiService {
     const url = `${API_BASE_URL}${endpoint}`;
     this.log('DELETE', url);
     
-    const response = await fetch(url, { method: 'DELETE' });
+    const response = await fetch(url, { method: 'DELETE', headers: this.headers() });
     return this.handleResponse<T>(response);
   }
 
@@ -150,6 +222,7 @@ class ApiService {
     
     const response = await fetch(url, {
       method: 'POST',
+      headers: this.headers(),
       body: formData,
     });
     
@@ -158,7 +231,12 @@ class ApiService {
 
   // === Exam endpoints ===
   
-  getExams = (): Promise<Exam[]> => this.get('/exams');
+  getExams = (): Promise<ExamSummary[]> => this.get('/exams');
+
+  getExam = (
+    examId: number | string,
+    params: { offset?: number; limit?: number } = {}
+  ): Promise<ExamDetail> => this.get(`/exams/${examId}${toQueryString(params)}`);
   
   createExam = (exam: Partial<Exam>): Promise<Exam> => this.post('/exams', exam);
   
@@ -178,9 +256,25 @@ class ApiService {
     return this.post('/proctoring/report-violation', payload);
   };
 
+  reportViolations = (
+    sessionId: string | number | undefined,
+    violations: Array<Record<string, unknown>>
+  ): Promise<ReportViolationsResponse> => {
+    const items = violations.map((v) => (sessionId ? { ...v, session_id: sessionId } : v));
+    return this.post('/proctoring/report-violations', { violations: items });
+  };
+
   reportViolationEvidence = (form: FormData): Promise<unknown> =>
     this.postFormData('/proctoring/report-violation-evidence', form);
 
+  submitFrame = (sessionId: string | number, frame: Blob): Promise<{ status: 'queued' | 'dropped' }> => {
+    const form = new FormData();
+    form.append('file', frame, 'frame.jpg');
+    form.append('session_id', String(sessionId));
+    form.append('timestamp', new Date().toISOString());
+    return this.postFormData('/proctoring/frames', form);
+  };
+
   // === Assignment endpoints ===
   
   assignExam = (
@@ -188,10 +282,11 @@ class ApiService {
     payload: { student_id?: number; student_email?: string; due_date?: string }
   ): Promise<unknown> => this.post(`/exams/${examId}/assign`, payload);
 
-  getAssignments = (): Promise<unknown[]> => this.get('/exams/assignments');
+  getAssignments = (params: QueryParams = {}): Promise<unknown[]> =>
+    this.get(`/exams/assignments${toQueryString(params)}`);
 
-  getExamAssignments = (examId: number | string): Promise<unknown[]> =>
-    this.get(`/exams/${examId}/assignments`);
+  getExamAssignments = (examId: number | string, params: QueryParams = {}): Promise<unknown[]> =>
+    this.get(`/exams/${examId}/assignments${toQueryString(params)}`);
 
   deleteAssignment = (assignmentId: number | string): Promise<unknown> =>
     this.delete(`/exams/assignments/${assignmentId}`);
@@ -262,7 +357,64 @@ class ApiService {
     }>
   ): Promise<unknown> => this.post('/exams/dashboard/students/import', { students });
 
-  getDashboardSessions = (): Promise<unknown[]> => this.get('/exams/dashboard/sessions');
+  /** Upload a CSV/NDJSON registry; `onProgress` receives each per-chunk progress line. */
+  importDashboardStudentsFile = async (
+    file: File,
+    onProgress?: (event: StudentImportEvent) => void
+  ): Promise<StudentImportEvent> => {
+    const form = new FormData();
+    form.append('file', file);
+    const url = `${API_BASE_URL}/exams/dashboard/students/import/stream`;
+    this.log('POST FormData', url);
+
+    const response = await fetch(url, { method: 'POST', headers: this.headers(), body: form });
+    if (!response.ok || !response.body) {
+      return this.handleResponse<StudentImportEvent>(response);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let last: StudentImportEvent | null = null;
+    for (;;) {
+      const { done, value } = await reader.read();
+      buffer += decoder.decode(value, { stream: !done });
+      const lines = buffer.split('\n');
+      buffer = done ? '' : lines.pop() ?? '';
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        last = JSON.parse(line) as StudentImportEvent;
+        onProgress?.(last);
+      }
+      if (done) break;
+    }
+    if (!last) throw new ApiError('Empty import response', response.status);
+    return last;
+  };
+
+  getDashboardSessions = (params: DashboardSessionParams = {}): Promise<Page<any>> =>
+    this.getPage(`/exams/dashboard/sessions${toQueryString(params)}`);
+
+  /** Every matching session, following `X-Next-Cursor` page by page. */
+  getAllDashboardSessions = async (params: DashboardSessionParams = {}): Promise<any[]> => {
+    const sessions: any[] = [];
+    let cursor: string | undefined;
+    do {
+      const page = await this.getDashboardSessions({ ...params, cursor });
+      sessions.push(...page.items);
+      cursor = page.nextCursor ?? undefined;
+    } while (cursor);
+    return sessions;
+  };
+
+  liveFeedUrl = (examId?: number | string): string => {
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const query = examId !== undefined ? `?exam_id=${examId}` : '';
+    return `${protocol}://${window.location.host}${API_BASE_URL}/proctoring/ws/feed${query}`;
+  };
+
+  getSessionViolations = (sessionId: number | string): Promise<unknown[]> =>
+    this.get(`/exams/dashboard/sessions/${sessionId}/violations`);
 
   getStudentSessions = (studentId: number): Promise<unknown[]> =>
     this.get(`/exams/dashboard/sessions/${studentId}`);